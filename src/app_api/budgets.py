@@ -0,0 +1,93 @@
+import asyncio
+from typing import Annotated
+
+from fastapi import APIRouter, Header, Query, Request, Response, status
+
+from app_api.http import DomainErrorRoute, UserId, expected_version, json_with_etag, precondition, version_etag
+from app_api.schemas import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    BudgetBatchIn,
+    BudgetBatchOut,
+    BudgetIn,
+    BudgetOut,
+    BudgetPageOut,
+    BudgetPatch,
+)
+from domain.errors import BudgetNotFoundError
+from domain.models.budget import Budget
+from domain.use_cases.budget import CreateBudget, DeleteBudget, GetBudget, ListBudgets, UpdateBudget
+
+
+def build_budgets_router(
+    create_budget: CreateBudget,
+    get_budget: GetBudget,
+    list_budgets: ListBudgets,
+    update_budget: UpdateBudget,
+    delete_budget: DeleteBudget,
+) -> APIRouter:
+    router = APIRouter(prefix="/budgets", tags=["budgets"], route_class=DomainErrorRoute)
+
+    async def get_own(budget_id: str, user_id: str) -> Budget:
+        # Someone else's budget is as good as missing
+        budget = await get_budget.execute(budget_id)
+        if budget.user_id != user_id:
+            raise BudgetNotFoundError(budget_id)
+        return budget
+
+    @router.get("", response_model=BudgetPageOut)
+    async def list_page(
+        request: Request,
+        user_id: UserId,
+        limit: Annotated[int, Query(gt=0, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> Response:
+        page = await list_budgets.execute_page(user_id, limit, cursor)
+        return json_with_etag(request, BudgetPageOut.model_validate(page))
+
+    @router.post("", status_code=status.HTTP_201_CREATED)
+    async def create(body: BudgetIn, user_id: UserId, response: Response) -> BudgetOut:
+        budget = await create_budget.execute(body.name, body.balance, user_id, body.description)
+        response.headers["ETag"] = version_etag(budget.version)
+        return BudgetOut.model_validate(budget)
+
+    @router.post("/batch")
+    async def batch(body: BudgetBatchIn, user_id: UserId) -> BudgetBatchOut:
+        """Create and delete many budgets at once; nothing changes if any of it fails."""
+        await asyncio.gather(*(get_own(budget_id, user_id) for budget_id in dict.fromkeys(body.delete)))
+        created = await create_budget.execute_many([budget.to_draft() for budget in body.create], user_id)
+        try:
+            await delete_budget.execute_many(body.delete)
+        except Exception:
+            await delete_budget.execute_many([budget.id for budget in created])
+            raise
+        return BudgetBatchOut(created=[BudgetOut.model_validate(budget) for budget in created], deleted=body.delete)
+
+    @router.get("/{budget_id}", response_model=BudgetOut)
+    async def get(request: Request, budget_id: str, user_id: UserId) -> Response:
+        budget = await get_own(budget_id, user_id)
+        return json_with_etag(request, BudgetOut.model_validate(budget), version_etag(budget.version))
+
+    @router.patch("/{budget_id}")
+    async def update(
+        budget_id: str,
+        body: BudgetPatch,
+        user_id: UserId,
+        response: Response,
+        if_match: Annotated[str | None, Header()] = None,
+    ) -> BudgetOut:
+        await get_own(budget_id, user_id)
+        version = expected_version(if_match)
+        with precondition(version):
+            budget = await update_budget.execute(budget_id, **body.changes(), expected_version=version)
+        response.headers["ETag"] = version_etag(budget.version)
+        return BudgetOut.model_validate(budget)
+
+    @router.delete("/{budget_id}", status_code=status.HTTP_204_NO_CONTENT)
+    async def delete(budget_id: str, user_id: UserId, if_match: Annotated[str | None, Header()] = None) -> None:
+        await get_own(budget_id, user_id)
+        version = expected_version(if_match)
+        with precondition(version):
+            await delete_budget.execute(budget_id, version)
+
+    return router
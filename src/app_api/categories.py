@@ -0,0 +1,97 @@
+import asyncio
+from typing import Annotated
+
+from fastapi import APIRouter, Header, Query, Request, Response, status
+
+from app_api.http import DomainErrorRoute, UserId, expected_version, json_with_etag, precondition, version_etag
+from app_api.schemas import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    CategoryBatchIn,
+    CategoryBatchOut,
+    CategoryIn,
+    CategoryOut,
+    CategoryPageOut,
+    CategoryPatch,
+)
+from domain.errors import CategoryNotFoundError
+from domain.models.category import Category
+from domain.models.transaction import TransactionType
+from domain.use_cases.category import CreateCategory, DeleteCategory, GetCategory, ListCategories, UpdateCategory
+
+
+def build_categories_router(
+    create_category: CreateCategory,
+    get_category: GetCategory,
+    list_categories: ListCategories,
+    update_category: UpdateCategory,
+    delete_category: DeleteCategory,
+) -> APIRouter:
+    router = APIRouter(prefix="/categories", tags=["categories"], route_class=DomainErrorRoute)
+
+    async def get_own(category_id: str, user_id: str) -> Category:
+        # Someone else's category is as good as missing
+        category = await get_category.execute(category_id)
+        if category.user_id != user_id:
+            raise CategoryNotFoundError(category_id)
+        return category
+
+    @router.get("", response_model=CategoryPageOut)
+    async def list_page(
+        request: Request,
+        user_id: UserId,
+        limit: Annotated[int, Query(gt=0, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        transaction_type: TransactionType | None = None,
+    ) -> Response:
+        page = await list_categories.execute_page(user_id, limit, cursor, transaction_type)
+        return json_with_etag(request, CategoryPageOut.model_validate(page))
+
+    @router.post("", status_code=status.HTTP_201_CREATED)
+    async def create(body: CategoryIn, user_id: UserId, response: Response) -> CategoryOut:
+        category = await create_category.execute(body.name, user_id, body.transaction_type, body.description)
+        response.headers["ETag"] = version_etag(category.version)
+        return CategoryOut.model_validate(category)
+
+    @router.post("/batch")
+    async def batch(body: CategoryBatchIn, user_id: UserId) -> CategoryBatchOut:
+        """Create and delete many categories at once; nothing changes if any of it fails."""
+        await asyncio.gather(*(get_own(category_id, user_id) for category_id in dict.fromkeys(body.delete)))
+        created = await create_category.execute_many([category.to_draft() for category in body.create], user_id)
+        try:
+            await delete_category.execute_many(body.delete)
+        except Exception:
+            await delete_category.execute_many([category.id for category in created])
+            raise
+        return CategoryBatchOut(
+            created=[CategoryOut.model_validate(category) for category in created], deleted=body.delete
+        )
+
+    @router.get("/{category_id}", response_model=CategoryOut)
+    async def get(request: Request, category_id: str, user_id: UserId) -> Response:
+        category = await get_own(category_id, user_id)
+        return json_with_etag(request, CategoryOut.model_validate(category), version_etag(category.version))
+
+    @router.patch("/{category_id}")
+    async def update(
+        category_id: str,
+        body: CategoryPatch,
+        user_id: UserId,
+        response: Response,
+        if_match: Annotated[str | None, Header()] = None,
+    ) -> CategoryOut:
+        await get_own(category_id, user_id)
+        version = expected_version(if_match)
+        with precondition(version):
+            category = await update_category.execute(category_id, **body.changes(), expected_version=version)
+        response.headers["ETag"] = version_etag(category.version)
+        return CategoryOut.model_validate(category)
+
+    @router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
+    async def delete(category_id: str, user_id: UserId, if_match: Annotated[str | None, Header()] = None) -> None:
+        await get_own(category_id, user_id)
+        version = expected_version(if_match)
+        with precondition(version):
+            await delete_category.execute(category_id, version)
+
+    return router
@@ -0,0 +1,106 @@
+import hashlib
+from collections.abc import Callable, Coroutine, Iterator
+from contextlib import contextmanager
+from typing import Annotated, Any
+
+from fastapi import Header, HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+from domain.errors import (
+    BudgetNotFoundError,
+    CategoryNotFoundError,
+    ConcurrentUpdateError,
+    DomainError,
+    EmptyNameError,
+    InvalidPageLimitError,
+    NegativeBalanceError,
+)
+from infra.repos.file.paths import UnsafePathError
+
+# Until there are accounts, clients name their user themselves with a UUID, as the browser pages do with their session
+# cookie. User ids end up in file names, so anything but a lowercase UUID is refused before it reaches a repo.
+UserId = Annotated[
+    str, Header(alias="X-User-Id", pattern=r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+]
+
+_STATUS_BY_ERROR: dict[type[DomainError], int] = {
+    BudgetNotFoundError: status.HTTP_404_NOT_FOUND,
+    CategoryNotFoundError: status.HTTP_404_NOT_FOUND,
+    ConcurrentUpdateError: status.HTTP_409_CONFLICT,
+    EmptyNameError: status.HTTP_422_UNPROCESSABLE_CONTENT,
+    NegativeBalanceError: status.HTTP_422_UNPROCESSABLE_CONTENT,
+    InvalidPageLimitError: status.HTTP_422_UNPROCESSABLE_CONTENT,
+}
+
+
+class DomainErrorRoute(APIRoute):
+    """
+    Route answering domain errors with a fitting status and their message as `detail`, instead of a 500.
+
+    Ids the file backend cannot use as file names are answered like ids that do not exist.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def handle(request: Request) -> Response:
+            try:
+                return await handler(request)
+            except DomainError as exc:
+                status_code = next(
+                    (code for error_type, code in _STATUS_BY_ERROR.items() if isinstance(exc, error_type)),
+                    status.HTTP_400_BAD_REQUEST,
+                )
+                return JSONResponse({"detail": str(exc)}, status_code=status_code)
+            except UnsafePathError:
+                # An id no file can be named after, e.g. holding a NUL, names nothing that exists
+                return JSONResponse({"detail": "Not Found"}, status_code=status.HTTP_404_NOT_FOUND)
+
+        return handle
+
+
+def version_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def json_with_etag(request: Request, payload: BaseModel, etag: str | None = None) -> Response:
+    """
+    Serialize `payload` with an `ETag`, or answer 304 with no body if the client's `If-None-Match` already has it.
+
+    Without an explicit `etag`, the hash of the body is used, so any list that has not changed revalidates.
+    """
+    body = payload.model_dump_json().encode()
+    etag = etag or f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+def expected_version(if_match: str | None) -> int | None:
+    """Version the client's `If-Match` asks for; none for a missing header or `*`, which any version satisfies."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip().removeprefix("W/").strip('"')
+    if not tag.isdigit():
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, f"If-Match must be a version ETag, got {if_match}")
+    return int(tag)
+
+
+@contextmanager
+def precondition(version: int | None) -> Iterator[None]:
+    """Report a lost compare-and-swap as 412 when the client set the version with `If-Match`, as 409 otherwise."""
+    try:
+        yield
+    except ConcurrentUpdateError as exc:
+        if version is None:
+            raise
+        raise HTTPException(status.HTTP_412_PRECONDITION_FAILED, str(exc)) from exc
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison, as RFC 9110 asks for with If-None-Match
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
@@ -0,0 +1,47 @@
+from fastapi import APIRouter
+
+from app_api.budgets import build_budgets_router
+from app_api.categories import build_categories_router
+from domain.models.budget import Budget
+from domain.repos.budget import BudgetRepo
+from domain.repos.category import CategoryRepo
+from domain.use_cases.budget import CreateBudget, DeleteBudget, GetBudget, ListBudgets, UpdateBudget
+from domain.use_cases.category import CreateCategory, DeleteCategory, GetCategory, ListCategories, UpdateCategory
+from domain.use_cases.feed import ChangeFeed, RemoteChanges
+
+API_PREFIX = "/api"
+
+
+def build_api_router(
+    budget_repo: BudgetRepo,
+    category_repo: CategoryRepo,
+    budget_feed: ChangeFeed[Budget],
+    remote_changes: RemoteChanges | None = None,
+) -> APIRouter:
+    """
+    Build the JSON API over the same repos as the pages.
+
+    Writes go out on `budget_feed` too, so open pages show them at once, and lists see other workers' writes
+    through `remote_changes`. Responses are compressed by the GZip
+    middleware `ui.run` puts in front of the whole app.
+    """
+    router = APIRouter(prefix=API_PREFIX)
+    router.include_router(
+        build_budgets_router(
+            create_budget=CreateBudget(budget_repo, budget_feed),
+            get_budget=GetBudget(budget_repo),
+            list_budgets=ListBudgets(budget_repo, budget_feed, remote_changes),
+            update_budget=UpdateBudget(budget_repo, budget_feed),
+            delete_budget=DeleteBudget(budget_repo, budget_feed),
+        )
+    )
+    router.include_router(
+        build_categories_router(
+            create_category=CreateCategory(category_repo),
+            get_category=GetCategory(category_repo),
+            list_categories=ListCategories(category_repo),
+            update_category=UpdateCategory(category_repo),
+            delete_category=DeleteCategory(category_repo),
+        )
+    )
+    return router
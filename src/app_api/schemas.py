@@ -0,0 +1,121 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from domain.models.budget import BudgetDraft
+from domain.models.category import CategoryDraft
+from domain.models.transaction import TransactionType
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_BATCH_SIZE = 500
+
+
+def _not_null(value: Any) -> Any:
+    # Validators do not run on defaults, so this only rejects an explicit null
+    if value is None:
+        msg = "may be left out but not null"
+        raise ValueError(msg)
+    return value
+
+
+class BudgetIn(BaseModel):
+    name: str
+    balance: Decimal
+    description: str | None = None
+
+    def to_draft(self) -> BudgetDraft:
+        return BudgetDraft(name=self.name, balance=self.balance, description=self.description)
+
+
+class BudgetPatch(BaseModel):
+    name: str | None = None
+    balance: Decimal | None = None
+    description: str | None = None
+
+    _check_required = field_validator("name", "balance")(_not_null)
+
+    def changes(self) -> dict[str, Any]:
+        """Return the fields the client sent, as `UpdateBudget` keyword arguments; the rest stay unset."""
+        return self.model_dump(exclude_unset=True)
+
+
+class BudgetOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    name: str
+    balance: Decimal
+    description: str | None
+    created_at: datetime
+    updated_at: datetime
+    version: int
+
+
+class BudgetPageOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    items: list[BudgetOut]
+    next_cursor: str | None
+
+
+class BudgetBatchIn(BaseModel):
+    create: list[BudgetIn] = Field(default_factory=list, max_length=MAX_BATCH_SIZE)
+    delete: list[str] = Field(default_factory=list, max_length=MAX_BATCH_SIZE)
+
+
+class BudgetBatchOut(BaseModel):
+    created: list[BudgetOut]
+    deleted: list[str]
+
+
+class CategoryIn(BaseModel):
+    name: str
+    transaction_type: TransactionType | None = None
+    description: str | None = None
+
+    def to_draft(self) -> CategoryDraft:
+        return CategoryDraft(name=self.name, transaction_type=self.transaction_type, description=self.description)
+
+
+class CategoryPatch(BaseModel):
+    name: str | None = None
+    transaction_type: TransactionType | None = None
+    description: str | None = None
+
+    _check_required = field_validator("name")(_not_null)
+
+    def changes(self) -> dict[str, Any]:
+        """Return the fields the client sent, as `UpdateCategory` keyword arguments; the rest stay unset."""
+        return self.model_dump(exclude_unset=True)
+
+
+class CategoryOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    name: str
+    transaction_type: TransactionType | None
+    description: str | None
+    created_at: datetime
+    updated_at: datetime
+    version: int
+
+
+class CategoryPageOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    items: list[CategoryOut]
+    next_cursor: str | None
+
+
+class CategoryBatchIn(BaseModel):
+    create: list[CategoryIn] = Field(default_factory=list, max_length=MAX_BATCH_SIZE)
+    delete: list[str] = Field(default_factory=list, max_length=MAX_BATCH_SIZE)
+
+
+class CategoryBatchOut(BaseModel):
+    created: list[CategoryOut]
+    deleted: list[str]
@@ -0,0 +1,229 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from nicegui import ui
+from nicegui.events import GenericEventArguments
+
+from domain.repos.page import Page
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VIEWPORT_HEIGHT = 600
+DEFAULT_OVERSCAN = 5
+SCROLL_THROTTLE_SECONDS = 0.05
+
+
+def visible_range(position: float, viewport_height: float, item_height: int, overscan: int, total: int) -> range:
+    """Indexes of the items overlapping the viewport scrolled down by `position` pixels, plus `overscan` each side."""
+    first = int(position // item_height) - overscan
+    last = int((position + viewport_height) // item_height) + 1 + overscan
+    return range(max(first, 0), min(last, total))
+
+
+def _height_class(pixels: float) -> str:
+    return f"h-[{pixels}px]"
+
+
+class LoadedItems[T]:
+    """
+    The items a `VirtualList` has loaded so far, sorted by `order` (descending if asked) and found by `key`.
+
+    Items sorting past the last loaded one belong to pages not fetched yet, so they are only taken once the last
+    page is in, i.e. `is_complete`.
+    """
+
+    def __init__(self, key: Callable[[T], str], order: Callable[[T], Any], *, descending: bool = False) -> None:
+        self._key = key
+        self._order = order
+        self._descending = descending
+        self._items: list[T] = []
+        self._orders: list[Any] = []
+        self._orders_by_key: dict[str, Any] = {}
+        self.is_complete = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def window(self, indexes: range) -> list[tuple[str, T]]:
+        return [(self._key(item), item) for item in self._items[indexes.start : indexes.stop]]
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._orders.clear()
+        self._orders_by_key.clear()
+        self.is_complete = False
+
+    def extend(self, items: list[T]) -> None:
+        """Append the items of the next page."""
+        for item in items:
+            order = self._order(item)
+            # A pushed change may have brought the item already
+            if not self._orders or self._precedes(self._orders[-1], order):
+                self._insert(len(self._items), item, order)
+
+    def upsert(self, item: T) -> None:
+        key, order = self._key(item), self._order(item)
+        index = self._index_of(key)
+        if index is not None and self._orders[index] == order:
+            self._items[index] = item
+            return
+        if index is not None:
+            self._delete(index)
+        index = self._position(order)
+        if index < len(self._items) or self.is_complete:
+            self._insert(index, item, order)
+
+    def remove(self, key: str) -> bool:
+        """Drop the item with `key` and return whether it was loaded."""
+        index = self._index_of(key)
+        if index is None:
+            return False
+        self._delete(index)
+        return True
+
+    def _index_of(self, key: str) -> int | None:
+        order = self._orders_by_key.get(key)
+        return None if order is None else self._position(order)
+
+    def _position(self, order: Any) -> int:
+        """Index of the first item that does not precede `order`."""
+        low, high = 0, len(self._orders)
+        while low < high:
+            middle = (low + high) // 2
+            if self._precedes(self._orders[middle], order):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _precedes(self, first: Any, second: Any) -> bool:
+        return first > second if self._descending else first < second
+
+    def _insert(self, index: int, item: T, order: Any) -> None:
+        self._items.insert(index, item)
+        self._orders.insert(index, order)
+        self._orders_by_key[self._key(item)] = order
+
+    def _delete(self, index: int) -> None:
+        del self._orders_by_key[self._key(self._items[index])]
+        del self._items[index]
+        del self._orders[index]
+
+
+class VirtualList[T]:
+    """
+    Scrollable list that keeps only the rows around the viewport in the page, whatever the number of items.
+
+    Items come from `fetch_page`, a paginated repo call sorted like `order`, such as a newest-first
+    `ListBudgets.execute_page`; the next page is fetched once the viewport nears the end of the loaded ones. Every
+    row is `item_height` pixels high, so `render_item` must draw items that fit it; the rows out of view are
+    replaced by two spacers and scrolling merely swaps the rows at the window's edges. `upsert` and `remove`
+    apply single changes, e.g. from a change feed, touching at most one row.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        fetch_page: Callable[[str | None], Awaitable[Page[T]]],
+        render_item: Callable[[T], None],
+        key: Callable[[T], str],
+        *,
+        order: Callable[[T], Any],
+        descending: bool = False,
+        item_height: int,
+        viewport_height: int = DEFAULT_VIEWPORT_HEIGHT,
+        overscan: int = DEFAULT_OVERSCAN,
+    ) -> None:
+        self._fetch_page = fetch_page
+        self._render_item = render_item
+        self._key = key
+        self._item_height = item_height
+        self._viewport_height = viewport_height
+        self._overscan = overscan
+        self._items = LoadedItems(key, order, descending=descending)
+        self._cursor: str | None = None
+        self._fetch_lock = asyncio.Lock()
+        self._position = 0.0
+        self._rows: dict[str, ui.element] = {}
+
+        with ui.scroll_area().classes(f"w-full {_height_class(viewport_height)}") as self._area:
+            self._top_spacer = ui.element("div")
+            self._column = ui.column().classes("w-full")
+            self._bottom_spacer = ui.element("div")
+        self._area.on(
+            "scroll",
+            self._on_scroll,
+            args=["verticalPosition", "verticalContainerSize"],
+            throttle=SCROLL_THROTTLE_SECONDS,
+        )
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def reload(self) -> None:
+        """Drop everything and start over from the first page."""
+        async with self._fetch_lock:
+            self._items.clear()
+            self._cursor = None
+            self._column.clear()
+            self._rows.clear()
+            self._area.scroll_to(pixels=0)
+            self._position = 0.0
+        await self._fill()
+
+    def upsert(self, item: T) -> None:
+        """Show the new state of `item`; one past the loaded pages is left for its page to bring."""
+        self._delete_row(self._key(item))
+        self._items.upsert(item)
+        self._render_window()
+
+    def remove(self, key: str) -> None:
+        if self._items.remove(key):
+            self._delete_row(key)
+            self._render_window()
+
+    async def _on_scroll(self, event: GenericEventArguments) -> None:
+        self._position = event.args["verticalPosition"]
+        self._viewport_height = event.args["verticalContainerSize"] or self._viewport_height
+        await self._fill()
+
+    async def _fill(self) -> None:
+        # Fetch until the window plus its overscan is covered, as a fast scroll can jump past several pages
+        async with self._fetch_lock:
+            while not self._items.is_complete and self._window().stop + self._overscan >= len(self._items):
+                page = await self._fetch_page(self._cursor)
+                self._items.extend(page.items)
+                self._cursor = page.next_cursor
+                self._items.is_complete = page.next_cursor is None
+                logger.debug("Loaded %d items, %d in total", len(page.items), len(self._items))
+        self._render_window()
+
+    def _window(self) -> range:
+        return visible_range(self._position, self._viewport_height, self._item_height, self._overscan, len(self))
+
+    def _delete_row(self, key: str) -> None:
+        row = self._rows.pop(key, None)
+        if row is not None:
+            row.delete()
+
+    def _render_window(self) -> None:
+        window = self._window()
+        shown = self._items.window(window)
+        shown_keys = {key for key, _ in shown}
+        for key in [key for key in self._rows if key not in shown_keys]:
+            self._delete_row(key)
+
+        for key, item in shown:
+            if key not in self._rows:
+                with self._column, ui.element("div").classes(f"w-full {_height_class(self._item_height)}") as row:
+                    self._render_item(item)
+                self._rows[key] = row
+        # Rows added above the old window were appended, so put them in place; rows already in order stay put
+        children = self._column.default_slot.children
+        for index, (key, _) in enumerate(shown):
+            if children[index] is not self._rows[key]:
+                self._rows[key].move(target_index=index)
+
+        self._top_spacer.classes(replace=_height_class(window.start * self._item_height))
+        self._bottom_spacer.classes(replace=_height_class((len(self) - window.stop) * self._item_height))
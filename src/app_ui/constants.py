@@ -1 +1,3 @@
-DEFAULT_USER_ID = "demo-user"
\ No newline at end of file
+# The one user of every browser before each got its own; the first browser to arrive since takes over its data
+LEGACY_USER_ID = "demo-user"
+PAGE_SIZE = 50
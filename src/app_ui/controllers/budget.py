@@ -1,9 +1,14 @@
-from dataclasses import dataclass
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from decimal import Decimal
 
-from app_ui.constants import DEFAULT_USER_ID
+from app_ui.constants import PAGE_SIZE
 from domain.models.budget import Budget
+from domain.models.change import Change
+from domain.repos.ordering import Ordering
+from domain.repos.page import Page
 from domain.use_cases.budget import CreateBudget, DeleteBudget, ListBudgets, UpdateBudget
+from domain.use_cases.feed import ChangeFeed, ChangeSubscriber
 
 
 @dataclass(slots=True)
@@ -12,11 +17,14 @@ class BudgetCrudController:
     list_budgets_use_case: ListBudgets
     update_budget_use_case: UpdateBudget
     delete_budget_use_case: DeleteBudget
-    user_id: str = DEFAULT_USER_ID
+    user_id: str
+    budget_feed: ChangeFeed[Budget] = field(default_factory=ChangeFeed)
 
-    async def list_budgets(self) -> list[Budget]:
-        budgets = await self.list_budgets_use_case.execute(self.user_id)
-        return sorted(budgets, key=lambda budget: budget.created_at, reverse=True)
+    async def list_budgets(self, limit: int | None = None) -> list[Budget]:
+        return await self.list_budgets_use_case.execute(self.user_id, Ordering.NEWEST_FIRST, limit)
+
+    async def list_budgets_page(self, cursor: str | None = None) -> Page[Budget]:
+        return await self.list_budgets_use_case.execute_page(self.user_id, PAGE_SIZE, cursor, Ordering.NEWEST_FIRST)
 
     async def create_budget(self, name: str, balance: Decimal, description: str | None) -> Budget:
         return await self.create_budget_use_case.execute(
@@ -26,20 +34,37 @@ class BudgetCrudController:
             description=self._normalize_description(description),
         )
 
-    async def update_budget(self, budget_id: str, name: str, balance: Decimal, description: str | None) -> Budget:
+    async def update_budget(
+        self,
+        budget_id: str,
+        name: str,
+        balance: Decimal,
+        description: str | None,
+        expected_version: int | None = None,
+    ) -> Budget:
         return await self.update_budget_use_case.execute(
             budget_id=budget_id,
             name=name,
             balance=balance,
             description=self._normalize_description(description),
+            expected_version=expected_version,
         )
 
-    async def delete_budget(self, budget_id: str) -> None:
-        await self.delete_budget_use_case.execute(budget_id)
+    async def delete_budget(self, budget_id: str, expected_version: int | None = None) -> None:
+        await self.delete_budget_use_case.execute(budget_id, expected_version)
+
+    def subscribe(self, subscriber: ChangeSubscriber[Budget]) -> Callable[[], None]:
+        """Push the user's budget changes to `subscriber`; deletions carry no owner, so they all go through."""
+
+        def forward(change: Change[Budget]) -> None:
+            if change.entity is None or change.entity.user_id == self.user_id:
+                subscriber(change)
+
+        return self.budget_feed.subscribe(forward)
 
     @staticmethod
     def _normalize_description(description: str | None) -> str | None:
         if description is None:
             return None
         stripped = description.strip()
-        return stripped or None
\ No newline at end of file
+        return stripped or None
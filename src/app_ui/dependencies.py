@@ -1,15 +1,132 @@
+import os
+import secrets
+from enum import StrEnum
 from pathlib import Path
 
 from app_ui.controllers.budget import BudgetCrudController
+from app_ui.sessions import UserSessions
+from domain.models.budget import Budget
+from domain.repos.budget import BudgetRepo
+from domain.repos.category import CategoryRepo
 from domain.use_cases.budget import CreateBudget, DeleteBudget, ListBudgets, UpdateBudget
+from domain.use_cases.feed import ChangeFeed
+from infra.repos.cached.budget import CachedBudgetRepo
+from infra.repos.cached.category import CachedCategoryRepo
+from infra.repos.cached.channel import ChangeChannel
 from infra.repos.file.budget import BudgetFileRepo
+from infra.repos.file.category import CategoryFileRepo
+from infra.repos.file.commit import Durability
+from infra.repos.file.serializers import Codec
+from infra.repos.log.budget import BudgetLogRepo
+from infra.repos.log.category import CategoryLogRepo
+from infra.repos.sqlite.budget import BudgetSqliteRepo
+from infra.repos.sqlite.category import CategorySqliteRepo
+from infra.repos.sqlite.database import SqliteDatabase
 
+STORAGE_SECRET_FILE = ".storage_secret"  # noqa: S105 - a file name, not the secret
+LEGACY_USER_CLAIM_FILE = ".legacy_user_claimed"
 
-def build_budget_controller(base_dir: Path | None = None) -> BudgetCrudController:
-    repo = BudgetFileRepo(base_dir=base_dir or Path("data/budgets"))
-    return BudgetCrudController(
-        create_budget_use_case=CreateBudget(repo),
-        list_budgets_use_case=ListBudgets(repo),
-        update_budget_use_case=UpdateBudget(repo),
-        delete_budget_use_case=DeleteBudget(repo),
-    )
\ No newline at end of file
+
+class StorageBackend(StrEnum):
+    FILE = "file"
+    LOG = "log"
+    SQLITE = "sqlite"
+
+
+class UnsharedBackendError(ValueError):
+    def __init__(self, backend: StorageBackend) -> None:
+        super().__init__(f"The {backend} backend cannot be shared between workers")
+
+
+def build_budget_repo(data_dir: Path, backend: StorageBackend, channel: ChangeChannel | None = None) -> BudgetRepo:
+    """
+    Build the budget repo of one worker; workers sharing `data_dir` must share a `channel` too.
+
+    The channel carries cache invalidations between them. The log backend keeps its index in memory, so it cannot be
+    shared, and SQLite needs nothing extra.
+    """
+    if backend is StorageBackend.LOG:
+        if channel is not None:
+            raise UnsharedBackendError(backend)
+        return CachedBudgetRepo(BudgetLogRepo(path=data_dir / "budgets.log"))
+    if backend is StorageBackend.SQLITE:
+        return BudgetSqliteRepo(SqliteDatabase(data_dir / "rashodomer.sqlite3"))
+    base_dir = data_dir / "budgets"
+    repo = BudgetFileRepo(
+        base_dir=base_dir,
+        durability=Durability.GROUP_COMMIT,
+        codec=Codec.COMPACT_JSON,
+        inter_process_locks=channel is not None,
+    )
+    if channel is not None:
+        return CachedBudgetRepo(repo, channel=channel)
+    return CachedBudgetRepo(repo, watch_dir=base_dir)
+
+
+def build_category_repo(data_dir: Path, backend: StorageBackend, channel: ChangeChannel | None = None) -> CategoryRepo:
+    """Build the category repo of one worker, on the same terms as `build_budget_repo`."""
+    if backend is StorageBackend.LOG:
+        if channel is not None:
+            raise UnsharedBackendError(backend)
+        return CachedCategoryRepo(CategoryLogRepo(path=data_dir / "categories.log"))
+    if backend is StorageBackend.SQLITE:
+        return CategorySqliteRepo(SqliteDatabase(data_dir / "rashodomer.sqlite3"))
+    base_dir = data_dir / "categories"
+    repo = CategoryFileRepo(
+        base_dir=base_dir,
+        durability=Durability.GROUP_COMMIT,
+        codec=Codec.COMPACT_JSON,
+        inter_process_locks=channel is not None,
+    )
+    if channel is not None:
+        return CachedCategoryRepo(repo, channel=channel)
+    return CachedCategoryRepo(repo, watch_dir=base_dir)
+
+
+def build_user_sessions(
+    repo: BudgetRepo, feed: ChangeFeed[Budget], channel: ChangeChannel | None = None
+) -> UserSessions:
+    """Build the per-user budget controllers of one worker; they all share `repo` and one set of use cases."""
+    create_budget, list_budgets = CreateBudget(repo, feed), ListBudgets(repo, feed, channel)
+    update_budget, delete_budget = UpdateBudget(repo, feed), DeleteBudget(repo, feed)
+
+    def build_controller(user_id: str) -> BudgetCrudController:
+        return BudgetCrudController(
+            create_budget_use_case=create_budget,
+            list_budgets_use_case=list_budgets,
+            update_budget_use_case=update_budget,
+            delete_budget_use_case=delete_budget,
+            user_id=user_id,
+            budget_feed=feed,
+        )
+
+    return UserSessions(build_controller, on_evict=repo.evict_user if isinstance(repo, CachedBudgetRepo) else None)
+
+
+def load_storage_secret(data_dir: Path) -> str:
+    """Secret signing the session cookies: created on the first start and shared by every worker over `data_dir`."""
+    path = data_dir / STORAGE_SECRET_FILE
+    if path.exists():
+        return path.read_text().strip()
+    data_dir.mkdir(parents=True, exist_ok=True)
+    # Link a complete file into place, so a worker starting at the same time never reads a half-written secret
+    draft = path.with_name(f"{STORAGE_SECRET_FILE}.{os.getpid()}")
+    draft.write_text(secrets.token_urlsafe(32))
+    draft.chmod(0o600)
+    try:
+        os.link(draft, path)
+    except FileExistsError:
+        pass
+    finally:
+        draft.unlink()
+    return path.read_text().strip()
+
+
+def claim_legacy_user(data_dir: Path) -> bool:
+    """Whether this call is the first to claim `LEGACY_USER_ID`, across every worker over `data_dir`."""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        (data_dir / LEGACY_USER_CLAIM_FILE).open("x").close()
+    except FileExistsError:
+        return False
+    return True
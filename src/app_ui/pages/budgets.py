@@ -1,19 +1,34 @@
 import logging
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from decimal import Decimal, InvalidOperation
 
 from nicegui import ui
 
+from app_ui.components.virtual_list import VirtualList
 from app_ui.controllers.budget import BudgetCrudController
-from domain.errors import BudgetNotFoundError, DomainError, EmptyNameError, NegativeBalanceError
+from domain.errors import BudgetNotFoundError, ConcurrentUpdateError, DomainError, EmptyNameError, NegativeBalanceError
 from domain.models.budget import Budget
+from domain.models.change import Change
 
 logger = logging.getLogger(__name__)
 
+# Fits a card of three single-line labels and a row of buttons
+BUDGET_CARD_HEIGHT = 200
+
 
 @dataclass(slots=True)
 class BudgetPageState:
     editing_budget_id: str | None = None
+    editing_version: int | None = None
+
+
+@dataclass(slots=True)
+class BudgetForm:
+    dialog: ui.dialog
+    name_input: ui.input
+    balance_input: ui.input
+    description_input: ui.textarea
 
 
 def _parse_balance(raw_value: str | None) -> Decimal:
@@ -23,119 +38,145 @@ def _parse_balance(raw_value: str | None) -> Decimal:
     return Decimal(normalized_value)
 
 
-async def render_budgets_page(controller: BudgetCrudController) -> None:
-    state = BudgetPageState()
-
-    async def refresh_budgets() -> None:
-        budgets_container.clear()
-        budgets = await controller.list_budgets()
-
-        with budgets_container:
-            if not budgets:
-                ui.label("Бюджетов пока нет.")
-                return
-
-            for budget in budgets:
-                render_budget_card(budget)
-
-    def open_create_dialog() -> None:
-        state.editing_budget_id = None
-        name_input.value = ""
-        balance_input.value = "0"
-        description_input.value = ""
-        form_dialog.open()
-
-    def open_edit_dialog(budget: Budget) -> None:
-        state.editing_budget_id = budget.id
-        name_input.value = budget.name
-        balance_input.value = str(budget.balance)
-        description_input.value = budget.description or ""
-        form_dialog.open()
-
-    async def save_budget() -> None:
-        name = (name_input.value or "").strip()
-        description = description_input.value or None
-
-        try:
-            balance = _parse_balance(balance_input.value)
-        except InvalidOperation:
-            ui.notify("Введите корректный баланс.", type="negative")
-            return
-
-        try:
-            if state.editing_budget_id is None:
-                await controller.create_budget(name=name, balance=balance, description=description)
-                ui.notify("Бюджет создан.", type="positive")
-            else:
-                await controller.update_budget(
-                    budget_id=state.editing_budget_id,
-                    name=name,
-                    balance=balance,
-                    description=description,
-                )
-                ui.notify("Бюджет обновлён.", type="positive")
-        except EmptyNameError:
-            ui.notify("Укажите название бюджета.", type="negative")
-            return
-        except NegativeBalanceError:
-            ui.notify("Баланс не может быть отрицательным.", type="negative")
-            return
-        except BudgetNotFoundError:
-            ui.notify("Бюджет не найден.", type="negative")
-            return
-        except DomainError:
-            logger.exception("Failed to save budget")
-            ui.notify("Не удалось сохранить бюджет.", type="negative")
-            return
-
-        form_dialog.close()
-        await refresh_budgets()
-
-    async def delete_budget(budget_id: str) -> None:
-        try:
-            await controller.delete_budget(budget_id)
-        except BudgetNotFoundError:
-            ui.notify("Бюджет не найден.", type="negative")
-            return
-        except DomainError:
-            logger.exception("Failed to delete budget %s", budget_id)
-            ui.notify("Не удалось удалить бюджет.", type="negative")
-            return
-
-        ui.notify("Бюджет удалён.", type="positive")
-        await refresh_budgets()
-
-    def render_budget_card(budget: Budget) -> None:
-        with ui.card():
-            ui.label(budget.name)
-            ui.label(f"Баланс: {budget.balance}")
-            ui.label(budget.description or "Без описания")
-
-            with ui.row():
-                ui.button("Изменить", on_click=lambda budget=budget: open_edit_dialog(budget))
-
-                async def on_delete() -> None:
-                    await delete_budget(budget.id)
-
-                ui.button("Удалить", on_click=on_delete)
-
-    with ui.column():
-        ui.label("Бюджеты")
+def open_budget_form(form: BudgetForm, state: BudgetPageState, budget: Budget | None = None) -> None:
+    state.editing_budget_id = None if budget is None else budget.id
+    state.editing_version = None if budget is None else budget.version
+    form.name_input.value = "" if budget is None else budget.name
+    form.balance_input.value = "0" if budget is None else str(budget.balance)
+    form.description_input.value = "" if budget is None else budget.description or ""
+    form.dialog.open()
+
+
+async def submit_budget_form(controller: BudgetCrudController, form: BudgetForm, state: BudgetPageState) -> None:
+    name = (form.name_input.value or "").strip()
+    description = form.description_input.value or None
+
+    try:
+        balance = _parse_balance(form.balance_input.value)
+    except InvalidOperation:
+        ui.notify("Введите корректный баланс.", type="negative")
+        return
+
+    try:
+        if state.editing_budget_id is None:
+            await controller.create_budget(name=name, balance=balance, description=description)
+            ui.notify("Бюджет создан.", type="positive")
+        else:
+            await controller.update_budget(
+                budget_id=state.editing_budget_id,
+                name=name,
+                balance=balance,
+                description=description,
+                expected_version=state.editing_version,
+            )
+            ui.notify("Бюджет обновлён.", type="positive")
+    except EmptyNameError:
+        ui.notify("Укажите название бюджета.", type="negative")
+        return
+    except NegativeBalanceError:
+        ui.notify("Баланс не может быть отрицательным.", type="negative")
+        return
+    except BudgetNotFoundError:
+        ui.notify("Бюджет не найден.", type="negative")
+        return
+    except ConcurrentUpdateError:
+        ui.notify("Бюджет изменён в другом окне. Обновите список.", type="warning")
+        form.dialog.close()
+        return
+    except DomainError:
+        logger.exception("Failed to save budget")
+        ui.notify("Не удалось сохранить бюджет.", type="negative")
+        return
+
+    form.dialog.close()
+
+
+async def delete_budget(controller: BudgetCrudController, budget: Budget) -> None:
+    try:
+        await controller.delete_budget(budget.id, expected_version=budget.version)
+    except BudgetNotFoundError:
+        ui.notify("Бюджет не найден.", type="negative")
+        return
+    except ConcurrentUpdateError:
+        ui.notify("Бюджет изменён в другом окне. Обновите список.", type="warning")
+        return
+    except DomainError:
+        logger.exception("Failed to delete budget %s", budget.id)
+        ui.notify("Не удалось удалить бюджет.", type="negative")
+        return
+
+    ui.notify("Бюджет удалён.", type="positive")
+
+
+def render_budget_card(
+    budget: Budget, on_edit: Callable[[Budget], None], on_delete: Callable[[Budget], Awaitable[None]]
+) -> None:
+    # Long names and descriptions are cut to one line, so the card always fits its `BUDGET_CARD_HEIGHT` row
+    with ui.card().classes("w-full"):
+        ui.label(budget.name).classes("w-full truncate")
+        ui.label(f"Баланс: {budget.balance}")
+        ui.label(budget.description or "Без описания").classes("w-full truncate")
 
         with ui.row():
-            ui.button("Добавить бюджет", on_click=open_create_dialog)
-            ui.button("Обновить список", on_click=refresh_budgets)
+            ui.button("Изменить", on_click=lambda: on_edit(budget))
+            ui.button("Удалить", on_click=lambda: on_delete(budget))
 
-        budgets_container = ui.column()
 
-    with ui.dialog() as form_dialog, ui.card():
+def render_budget_form(on_save: Callable[[], Awaitable[None]]) -> BudgetForm:
+    with ui.dialog() as dialog, ui.card():
         ui.label("Бюджет")
         name_input = ui.input("Название")
         balance_input = ui.input("Баланс", value="0")
         description_input = ui.textarea("Описание")
 
         with ui.row():
-            ui.button("Отмена", on_click=form_dialog.close)
-            ui.button("Сохранить", on_click=save_budget)
+            ui.button("Отмена", on_click=dialog.close)
+            ui.button("Сохранить", on_click=on_save)
+    return BudgetForm(dialog, name_input, balance_input, description_input)
+
+
+async def render_budgets_page(controller: BudgetCrudController) -> None:
+    state = BudgetPageState()
+
+    async def refresh_budgets() -> None:
+        # Full reload, only on open and on request: after that, changes arrive one by one through `apply_change`
+        await budget_list.reload()
+        empty_label.set_visibility(not budget_list)
+
+    def apply_change(change: Change[Budget]) -> None:
+        if change.entity is None:
+            budget_list.remove(change.entity_id)
+        else:
+            budget_list.upsert(change.entity)
+        empty_label.set_visibility(not budget_list)
+
+    def render_card(budget: Budget) -> None:
+        render_budget_card(
+            budget,
+            on_edit=lambda budget: open_budget_form(form, state, budget),
+            on_delete=lambda budget: delete_budget(controller, budget),
+        )
+
+    with ui.column().classes("w-full"):
+        ui.label("Бюджеты")
+
+        with ui.row():
+            ui.button("Добавить бюджет", on_click=lambda: open_budget_form(form, state))
+            ui.button("Обновить список", on_click=refresh_budgets)
 
-    await refresh_budgets()
\ No newline at end of file
+        empty_label = ui.label("Бюджетов пока нет.")
+        budget_list = VirtualList(
+            fetch_page=controller.list_budgets_page,
+            render_item=render_card,
+            key=lambda budget: budget.id,
+            order=lambda budget: (budget.created_at, budget.id),
+            descending=True,
+            item_height=BUDGET_CARD_HEIGHT,
+        )
+
+    form = render_budget_form(lambda: submit_budget_form(controller, form, state))
+
+    # Every page open in this process gets the changes made from any of them
+    unsubscribe = controller.subscribe(apply_change)
+    ui.context.client.on_delete(unsubscribe)
+    await refresh_budgets()
@@ -0,0 +1,69 @@
+import logging
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Callable
+
+from app_ui.controllers.budget import BudgetCrudController
+
+logger = logging.getLogger(__name__)
+
+IDLE_EVICTION_SECONDS = 15 * 60
+
+
+class UserSessions:
+    """
+    Per-user controllers of the users with a page open, created on their first page and shared by their tabs.
+
+    A controller only pairs the shared use cases with a user id, so the per-user memory is what the repos cache
+    for that user, warmed by the user's own reads. Once a user has had no page open for `idle_seconds`, the
+    controller is dropped and `on_evict` lets the repos forget the user too. Idle users are swept whenever a page
+    opens or closes, so there is no background task.
+    """
+
+    def __init__(
+        self,
+        controller_factory: Callable[[str], BudgetCrudController],
+        on_evict: Callable[[str], None] | None = None,
+        idle_seconds: float = IDLE_EVICTION_SECONDS,
+    ) -> None:
+        self._controller_factory = controller_factory
+        self._on_evict = on_evict
+        self._idle_seconds = idle_seconds
+        self._controllers: dict[str, BudgetCrudController] = {}
+        self._open_pages: Counter[str] = Counter()
+        self._idle_since: OrderedDict[str, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._controllers)
+
+    def open(self, user_id: str) -> BudgetCrudController:
+        """Get the controller for a page the user just opened; pair every call with a `close` once the page is gone."""
+        self._evict_idle()
+        self._open_pages[user_id] += 1
+        self._idle_since.pop(user_id, None)
+        controller = self._controllers.get(user_id)
+        if controller is None:
+            controller = self._controller_factory(user_id)
+            self._controllers[user_id] = controller
+            logger.info("Started session of user %s", user_id)
+        return controller
+
+    def close(self, user_id: str) -> None:
+        self._open_pages[user_id] -= 1
+        if self._open_pages[user_id] <= 0:
+            del self._open_pages[user_id]
+            self._idle_since[user_id] = time.monotonic()
+        self._evict_idle()
+
+    def _evict_idle(self) -> None:
+        # Users go idle in order, so the ones idle for long enough are all at the front
+        deadline = time.monotonic() - self._idle_seconds
+        while self._idle_since:
+            user_id, idle_since = next(iter(self._idle_since.items()))
+            if idle_since > deadline:
+                return
+            del self._idle_since[user_id]
+            del self._controllers[user_id]
+            if self._on_evict is not None:
+                self._on_evict(user_id)
+            logger.info("Ended session of idle user %s", user_id)
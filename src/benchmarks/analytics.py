@@ -0,0 +1,79 @@
+import logging
+import random
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+from domain.analytics import columnar
+from domain.analytics.report import GroupBy, Period
+from domain.models.transaction import Transaction, TransactionType
+from tests.integration.domain.analytics import reference
+
+logger = logging.getLogger(__name__)
+
+TRANSACTION_COUNT = 200_000
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _transactions() -> list[Transaction]:
+    rng = random.Random(0)  # noqa: S311 - deterministic benchmark data
+    return [
+        Transaction(
+            id=f"t_{number}",
+            budget_id=f"b_{rng.randrange(4)}",
+            category_id=f"c_{rng.randrange(30)}",
+            amount=Decimal(rng.randrange(100, 1_000_000)).scaleb(-2),
+            type=rng.choice([TransactionType.INCOME, TransactionType.EXPENSE]),
+            user_id="demo-user",
+            date=START + timedelta(minutes=rng.randrange(365 * 24 * 60)),
+        )
+        for number in range(TRANSACTION_COUNT)
+    ]
+
+
+def _seconds(operation: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    operation()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    transactions = _transactions()
+    build_seconds = _seconds(lambda: columnar.build_columns(transactions))
+    columns = columnar.build_columns(transactions)
+    first_half = Period(START, START + timedelta(days=182))
+    second_half = Period(START + timedelta(days=182), START + timedelta(days=365))
+    reports: list[tuple[str, Callable[[], object], Callable[[], object]]] = [
+        (
+            "sums by month",
+            lambda: reference.group_sums(transactions, GroupBy.MONTH),
+            lambda: columnar.group_sums(columns, GroupBy.MONTH),
+        ),
+        (
+            "running balance",
+            lambda: reference.running_balance(transactions, "b_0", Decimal(0)),
+            lambda: columnar.running_balance(columns, "b_0", Decimal(0)),
+        ),
+        (
+            "half-year comparison",
+            lambda: reference.compare_periods(transactions, GroupBy.CATEGORY, first_half, second_half),
+            lambda: columnar.compare_periods(columns, GroupBy.CATEGORY, first_half, second_half),
+        ),
+    ]
+    logger.info("%d transactions, columnar snapshot built in %.3fs", TRANSACTION_COUNT, build_seconds)
+    for name, reference_report, columnar_report in reports:
+        reference_seconds = _seconds(reference_report)
+        columnar_seconds = _seconds(columnar_report)
+        logger.info(
+            "%-20s reference %.3fs  columnar %.3fs  (%.1fx)",
+            name,
+            reference_seconds,
+            columnar_seconds,
+            reference_seconds / columnar_seconds,
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
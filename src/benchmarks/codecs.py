@@ -0,0 +1,56 @@
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import asdict
+from decimal import Decimal
+from typing import Any
+
+from domain.models.budget import Budget
+from domain.models.transaction import Transaction, TransactionType
+from infra.repos.file.serializers import Codec, budget_from_dict, decode_record, encode_record, transaction_from_dict
+
+logger = logging.getLogger(__name__)
+
+ITERATIONS = 50_000
+
+
+def _ops_per_second(operation: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        operation()
+    return ITERATIONS / (time.perf_counter() - started)
+
+
+def _measure(name: str, entity: Any, from_dict: Callable[[dict], object]) -> None:
+    for codec in Codec:
+        encoded = encode_record(asdict(entity), codec)
+        encode_rate = _ops_per_second(lambda codec=codec: encode_record(asdict(entity), codec))
+        decode_rate = _ops_per_second(lambda encoded=encoded: from_dict(decode_record(encoded)))
+        logger.info(
+            "%-11s %-12s %4d bytes  encode %8.0f/s  decode %8.0f/s",
+            name,
+            codec,
+            len(encoded),
+            encode_rate,
+            decode_rate,
+        )
+
+
+def main() -> None:
+    budget = Budget(id="2f1c", name="Monthly budget", balance=Decimal("1500.75"), user_id="demo-user")
+    transaction = Transaction(
+        id="9a7e",
+        budget_id="2f1c",
+        category_id="5b3d",
+        amount=Decimal("42.10"),
+        type=TransactionType.EXPENSE,
+        user_id="demo-user",
+        description="Groceries",
+    )
+    _measure("Budget", budget, budget_from_dict)
+    _measure("Transaction", transaction, transaction_from_dict)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
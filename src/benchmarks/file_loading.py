@@ -0,0 +1,51 @@
+import asyncio
+import logging
+import tempfile
+import time
+from collections.abc import Awaitable
+from dataclasses import asdict
+from decimal import Decimal
+from pathlib import Path
+
+from domain.models.budget import Budget
+from infra.repos.file.serializers import load_from_file, load_many_from_files, save_to_file
+
+logger = logging.getLogger(__name__)
+
+FILES_COUNT = 10_000
+
+
+async def _write_budgets(base_dir: Path) -> list[Path]:
+    paths = []
+    for number in range(FILES_COUNT):
+        budget = Budget(id=f"b_{number}", name=f"Budget {number}", balance=Decimal(number), user_id="u_1")
+        path = base_dir / f"{budget.id}.json"
+        await save_to_file(path, asdict(budget))
+        paths.append(path)
+    return paths
+
+
+async def _load_sequentially(paths: list[Path]) -> None:
+    for path in paths:
+        await load_from_file(path)
+
+
+async def _measure(name: str, load: Awaitable[object]) -> float:
+    started = time.perf_counter()
+    await load
+    elapsed = time.perf_counter() - started
+    logger.info("%s: %.3fs", name, elapsed)
+    return elapsed
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = await _write_budgets(Path(tmp_dir))
+        sequential = await _measure("sequential load_from_file", _load_sequentially(paths))
+        batched = await _measure("load_many_from_files", load_many_from_files(paths))
+    logger.info("%d files: %.1fx speedup", FILES_COUNT, sequential / batched)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
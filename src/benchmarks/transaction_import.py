@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+from domain.models.transaction import TransactionType
+from domain.use_cases.budget import CreateBudget
+from domain.use_cases.category import CreateCategory
+from domain.use_cases.transaction import CreateTransaction, ImportTransactions
+from infra.repos.file.aggregate import AggregateFileRepo
+from infra.repos.file.budget import BudgetFileRepo
+from infra.repos.file.category import CategoryFileRepo
+from infra.repos.file.transaction import TransactionFileRepo
+
+logger = logging.getLogger(__name__)
+
+ROWS_COUNT = 2_000
+USER_ID = "u_1"
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base_dir = Path(tmp_dir)
+        budget_repo = BudgetFileRepo(base_dir / "budgets")
+        category_repo = CategoryFileRepo(base_dir / "categories")
+        budget = await CreateBudget(budget_repo).execute("Main", Decimal(0), USER_ID)
+        category = await CreateCategory(category_repo).execute("Salary", USER_ID)
+
+        one_by_one = CreateTransaction(
+            TransactionFileRepo(base_dir / "one_by_one"),
+            budget_repo,
+            category_repo,
+            AggregateFileRepo(base_dir / "aggregates_1"),
+        )
+        started = time.perf_counter()
+        for _ in range(ROWS_COUNT):
+            await one_by_one.execute(budget.id, category.id, Decimal("1.50"), TransactionType.INCOME, USER_ID)
+        sequential = time.perf_counter() - started
+        logger.info("CreateTransaction one by one: %.0f rows/s", ROWS_COUNT / sequential)
+
+        importer = ImportTransactions(
+            TransactionFileRepo(base_dir / "imported"),
+            budget_repo,
+            category_repo,
+            AggregateFileRepo(base_dir / "aggregates_2"),
+        )
+        lines = [
+            "date,budget_id,category_id,amount,type,description,target_budget_id",
+            *(
+                f"2025-01-01T00:00:{number % 60:02d},{budget.id},{category.id},1.50,income,,"
+                for number in range(ROWS_COUNT)
+            ),
+        ]
+        report = await importer.execute(USER_ID, lines)
+        logger.info("ImportTransactions: %.0f rows/s", report.rows_per_second)
+    logger.info("%d rows: %.1fx speedup", ROWS_COUNT, report.rows_per_second * sequential / ROWS_COUNT)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    logger.setLevel(logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,163 @@
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+import numpy.typing as npt
+
+from domain.analytics.report import (
+    GroupBy,
+    Period,
+    PeriodComparison,
+    from_epoch_us,
+    from_minor_units,
+    to_epoch_us,
+    to_minor_units,
+)
+from domain.models.transaction import Transaction, TransactionType
+
+logger = logging.getLogger(__name__)
+
+TRANSACTION_TYPES = tuple(TransactionType)
+_NO_TARGET = -1
+_MONTHS_PER_YEAR = 12
+_FIRST_EPOCH_YEAR = 1970
+
+type IntArray = npt.NDArray[np.int64]
+
+
+@dataclass(frozen=True, slots=True)
+class TransactionColumns:
+    """
+    Columnar snapshot of transactions, sorted by `(date, id)`.
+
+    Amounts are exact int64 minor units (cents), dates are int64 microseconds since the Unix epoch, and types,
+    budgets and categories are dictionary-encoded: each code indexes `TRANSACTION_TYPES`, `budget_ids` or
+    `category_ids`. Transactions that are not transfers have `_NO_TARGET` as their target budget code.
+    """
+
+    epoch_us: IntArray
+    amounts: IntArray
+    types: IntArray
+    budgets: IntArray
+    targets: IntArray
+    categories: IntArray
+    budget_ids: list[str]
+    category_ids: list[str]
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+
+def build_columns(transactions: Iterable[Transaction]) -> TransactionColumns:
+    rows = sorted(transactions, key=lambda transaction: (transaction.date, transaction.id))
+    budget_codes: dict[str, int] = {}
+    category_codes: dict[str, int] = {}
+    type_codes = {transaction_type: code for code, transaction_type in enumerate(TRANSACTION_TYPES)}
+    columns = TransactionColumns(
+        epoch_us=np.fromiter((to_epoch_us(row.date) for row in rows), np.int64, len(rows)),
+        amounts=np.fromiter((to_minor_units(row.amount) for row in rows), np.int64, len(rows)),
+        types=np.fromiter((type_codes[row.type] for row in rows), np.int64, len(rows)),
+        budgets=np.fromiter((budget_codes.setdefault(row.budget_id, len(budget_codes)) for row in rows), np.int64),
+        targets=np.fromiter(
+            (
+                _NO_TARGET
+                if row.target_budget_id is None
+                else budget_codes.setdefault(row.target_budget_id, len(budget_codes))
+                for row in rows
+            ),
+            np.int64,
+        ),
+        categories=np.fromiter(
+            (category_codes.setdefault(row.category_id, len(category_codes)) for row in rows), np.int64
+        ),
+        budget_ids=list(budget_codes),
+        category_ids=list(category_codes),
+    )
+    logger.debug("Built columns for %d transactions", len(rows))
+    return columns
+
+
+def group_sums(
+    columns: TransactionColumns, by: GroupBy, transaction_type: TransactionType | None = None
+) -> dict[str, Decimal]:
+    """Sum amounts per budget, category or month, optionally only of one transaction type."""
+    sums = _group_sums(columns, by, _type_mask(columns, transaction_type))
+    return {label: from_minor_units(total) for label, total in sums.items()}
+
+
+def running_balance(
+    columns: TransactionColumns, budget_id: str, initial_balance: Decimal
+) -> list[tuple[datetime, Decimal]]:
+    """Balance of a budget after each transaction touching it, starting from `initial_balance`."""
+    if budget_id not in columns.budget_ids:
+        return []
+    code = columns.budget_ids.index(budget_id)
+    is_income = columns.types == TRANSACTION_TYPES.index(TransactionType.INCOME)
+    is_source = columns.budgets == code
+    is_target = columns.targets == code
+    deltas = np.where(is_source, np.where(is_income, columns.amounts, -columns.amounts), columns.amounts)
+    touched = is_source | is_target
+    balances = to_minor_units(initial_balance) + np.cumsum(deltas[touched])
+    return [
+        (from_epoch_us(int(epoch_us)), from_minor_units(int(balance)))
+        for epoch_us, balance in zip(columns.epoch_us[touched], balances, strict=True)
+    ]
+
+
+def compare_periods(
+    columns: TransactionColumns,
+    by: GroupBy,
+    previous: Period,
+    current: Period,
+    transaction_type: TransactionType | None = None,
+) -> dict[str, PeriodComparison]:
+    """Group sums of two periods side by side; groups present in only one period get a zero on the other side."""
+    type_mask = _type_mask(columns, transaction_type)
+    previous_sums = _group_sums(columns, by, type_mask & _period_mask(columns, previous))
+    current_sums = _group_sums(columns, by, type_mask & _period_mask(columns, current))
+    return {
+        label: PeriodComparison(
+            from_minor_units(previous_sums.get(label, 0)), from_minor_units(current_sums.get(label, 0))
+        )
+        for label in previous_sums.keys() | current_sums.keys()
+    }
+
+
+def _type_mask(columns: TransactionColumns, transaction_type: TransactionType | None) -> npt.NDArray[np.bool_]:
+    if transaction_type is None:
+        return np.ones(len(columns), dtype=np.bool_)
+    return columns.types == TRANSACTION_TYPES.index(transaction_type)
+
+
+def _period_mask(columns: TransactionColumns, period: Period) -> npt.NDArray[np.bool_]:
+    return (columns.epoch_us >= to_epoch_us(period.start)) & (columns.epoch_us < to_epoch_us(period.end))
+
+
+def _group_sums(columns: TransactionColumns, by: GroupBy, mask: npt.NDArray[np.bool_]) -> dict[str, int]:
+    codes, labels = _group_codes(columns, by)
+    selected = codes[mask]
+    # int64 accumulation keeps the sums exact; bincount with weights would go through float64
+    sums = np.zeros(len(labels), dtype=np.int64)
+    np.add.at(sums, selected, columns.amounts[mask])
+    counts = np.bincount(selected, minlength=len(labels))
+    return {labels[code]: int(sums[code]) for code in np.flatnonzero(counts)}
+
+
+def _group_codes(columns: TransactionColumns, by: GroupBy) -> tuple[IntArray, list[str]]:
+    match by:
+        case GroupBy.BUDGET:
+            return columns.budgets, columns.budget_ids
+        case GroupBy.CATEGORY:
+            return columns.categories, columns.category_ids
+        case GroupBy.MONTH:
+            months = columns.epoch_us.astype("datetime64[us]").astype("datetime64[M]").astype(np.int64)
+            unique_months, codes = np.unique(months, return_inverse=True)
+            return codes.astype(np.int64), [_month_label(int(month)) for month in unique_months]
+
+
+def _month_label(months_since_epoch: int) -> str:
+    year, month_index = divmod(months_since_epoch, _MONTHS_PER_YEAR)
+    return f"{_FIRST_EPOCH_YEAR + year:04d}-{month_index + 1:02d}"
@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from enum import StrEnum
+
+from domain.errors import InexactAmountError
+
+MINOR_UNITS_EXPONENT = 2
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class GroupBy(StrEnum):
+    BUDGET = "budget"
+    CATEGORY = "category"
+    MONTH = "month"
+
+
+@dataclass(frozen=True, slots=True)
+class Period:
+    """Half-open time range `[start, end)`."""
+
+    start: datetime
+    end: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class PeriodComparison:
+    previous: Decimal
+    current: Decimal
+
+    @property
+    def change(self) -> Decimal:
+        return self.current - self.previous
+
+
+def to_minor_units(amount: Decimal) -> int:
+    minor = amount.scaleb(MINOR_UNITS_EXPONENT)
+    if minor != minor.to_integral_value():
+        raise InexactAmountError(amount)
+    return int(minor)
+
+
+def from_minor_units(minor: int) -> Decimal:
+    return Decimal(minor).scaleb(-MINOR_UNITS_EXPONENT)
+
+
+def to_epoch_us(moment: datetime) -> int:
+    return (moment - EPOCH) // _MICROSECOND
+
+
+def from_epoch_us(epoch_us: int) -> datetime:
+    return EPOCH + epoch_us * _MICROSECOND
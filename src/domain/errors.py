@@ -15,11 +15,21 @@ class CategoryNotFoundError(DomainError):
         super().__init__(f"Category with id '{category_id}' not found")
 
 
+class CategoryTypeMismatchError(DomainError):
+    def __init__(self, category_id: str, transaction_type: str) -> None:
+        super().__init__(f"Category with id '{category_id}' is not for {transaction_type} transactions")
+
+
 class TransactionNotFoundError(DomainError):
     def __init__(self, transaction_id: str) -> None:
         super().__init__(f"Transaction with id '{transaction_id}' not found")
 
 
+class ConcurrentUpdateError(DomainError):
+    def __init__(self, entity_id: str) -> None:
+        super().__init__(f"Entity with id '{entity_id}' was changed by someone else, reload it and try again")
+
+
 class NegativeBalanceError(DomainError):
     def __init__(self, balance: Decimal) -> None:
         super().__init__(f"Balance cannot be negative: {balance}")
@@ -28,3 +38,41 @@ class NegativeBalanceError(DomainError):
 class EmptyNameError(DomainError):
     def __init__(self, field: str = "name") -> None:
         super().__init__(f"{field.capitalize()} cannot be empty")
+
+
+class InvalidPageLimitError(DomainError):
+    def __init__(self, limit: int) -> None:
+        super().__init__(f"Page limit must be positive, got {limit}")
+
+
+class NonPositiveAmountError(DomainError):
+    def __init__(self, amount: Decimal) -> None:
+        super().__init__(f"Amount must be positive: {amount}")
+
+
+class InvalidTransferTargetError(DomainError):
+    def __init__(self, budget_id: str, target_budget_id: str | None) -> None:
+        super().__init__(
+            f"Transfers need a target budget other than their own, other transactions none: "
+            f"budget '{budget_id}', target '{target_budget_id}'"
+        )
+
+
+class InvalidMonthError(DomainError):
+    def __init__(self, month: int) -> None:
+        super().__init__(f"Month must be between 1 and 12, got {month}")
+
+
+class InexactAmountError(DomainError):
+    def __init__(self, amount: Decimal) -> None:
+        super().__init__(f"Amount {amount} has more precision than whole cents")
+
+
+class InvalidAmountError(DomainError):
+    def __init__(self, amount: str) -> None:
+        super().__init__(f"Amount is not a finite number: '{amount}'")
+
+
+class MissingImportColumnsError(DomainError):
+    def __init__(self, columns: list[str]) -> None:
+        super().__init__(f"Import file is missing columns: {', '.join(columns)}")
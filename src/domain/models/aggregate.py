@@ -0,0 +1,38 @@
+from dataclasses import dataclass, replace
+from datetime import datetime
+from decimal import Decimal
+
+from domain.models.transaction import TransactionType
+
+type AggregateKey = tuple[str, str, str, str, TransactionType]
+
+
+@dataclass
+class TransactionAggregate:
+    """Sum and count of a user's transactions sharing budget, category, month (`YYYY-MM`) and type."""
+
+    user_id: str
+    budget_id: str
+    category_id: str
+    month: str
+    type: TransactionType
+    total: Decimal
+    count: int
+
+    @property
+    def key(self) -> AggregateKey:
+        return self.user_id, self.budget_id, self.category_id, self.month, self.type
+
+
+def month_of(moment: datetime) -> str:
+    return f"{moment.year:04d}-{moment.month:02d}"
+
+
+def merge_delta(aggregates: dict[AggregateKey, TransactionAggregate], delta: TransactionAggregate) -> None:
+    """Add `delta` to the aggregate with its key in `aggregates`, or insert a copy of it; callers drop emptied ones."""
+    aggregate = aggregates.get(delta.key)
+    if aggregate is None:
+        aggregates[delta.key] = replace(delta)
+    else:
+        aggregate.total += delta.total
+        aggregate.count += delta.count
@@ -14,3 +14,28 @@ class Budget:
     description: str | None = None
     created_at: datetime = field(default_factory=utc_now)
     updated_at: datetime = field(default_factory=utc_now)
+    initial_balance: Decimal | None = None
+    version: int = 1
+
+    def __post_init__(self) -> None:
+        # Balance before any transaction; budgets stored before transactions existed never moved from it
+        if self.initial_balance is None:
+            self.initial_balance = self.balance
+
+
+@dataclass
+class BudgetDraft:
+    name: str
+    balance: Decimal
+    description: str | None = None
+
+
+@dataclass
+class BalanceCheck:
+    budget_id: str
+    stored: Decimal
+    expected: Decimal
+
+    @property
+    def is_consistent(self) -> bool:
+        return self.stored == self.expected
@@ -14,3 +14,11 @@ class Category:
     description: str | None = None
     created_at: datetime = field(default_factory=utc_now)
     updated_at: datetime = field(default_factory=utc_now)
+    version: int = 1
+
+
+@dataclass
+class CategoryDraft:
+    name: str
+    transaction_type: TransactionType | None = None
+    description: str | None = None
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from enum import StrEnum
+
+
+class ChangeKind(StrEnum):
+    UPSERTED = "upserted"
+    DELETED = "deleted"
+
+
+@dataclass
+class Change[T]:
+    kind: ChangeKind
+    entity_id: str
+    entity: T | None = None
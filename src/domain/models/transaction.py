@@ -22,5 +22,24 @@ class Transaction:
     user_id: str
     date: datetime = field(default_factory=utc_now)
     description: str | None = None
+    target_budget_id: str | None = None
     created_at: datetime = field(default_factory=utc_now)
     updated_at: datetime = field(default_factory=utc_now)
+    version: int = 1
+
+
+@dataclass
+class RejectedRow:
+    line: int
+    reason: str
+
+
+@dataclass
+class ImportReport:
+    imported: int = 0
+    rejected: list[RejectedRow] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return (self.imported + len(self.rejected)) / self.seconds if self.seconds else 0.0
@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+
+from domain.models.aggregate import TransactionAggregate
+
+
+class AggregateRepo(ABC):
+    @abstractmethod
+    async def add(self, deltas: list[TransactionAggregate]) -> None:
+        """Add the totals and counts of `deltas` to the stored aggregates with the same keys, dropping emptied ones."""
+
+    @abstractmethod
+    async def get_by_user_id(self, user_id: str, month: str | None = None) -> list[TransactionAggregate]: ...
+
+    @abstractmethod
+    async def replace_by_user_id(self, user_id: str, aggregates: list[TransactionAggregate]) -> None:
+        """Replace all aggregates of the user with `aggregates`."""
@@ -1,20 +1,56 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 
 from domain.models.budget import Budget
+from domain.repos.ordering import Ordering
+from domain.repos.page import STREAM_BATCH_SIZE, Page, iterate_pages
 
 
 class BudgetRepo(ABC):
     @abstractmethod
     async def create(self, budget: Budget) -> None: ...
 
+    @abstractmethod
+    async def create_many(self, budgets: list[Budget]) -> None: ...
+
     @abstractmethod
     async def get_by_id(self, budget_id: str) -> Budget | None: ...
 
     @abstractmethod
-    async def get_by_user_id(self, user_id: str) -> list[Budget]: ...
+    async def get_by_user_id(
+        self, user_id: str, ordering: Ordering | None = None, limit: int | None = None
+    ) -> list[Budget]:
+        """Budgets of the user, in `ordering` if given, cut to the first `limit` of them if given."""
+
+    @abstractmethod
+    async def get_page_by_user_id(
+        self, user_id: str, limit: int, cursor: str | None = None, ordering: Ordering | None = None
+    ) -> Page[Budget]:
+        """
+        Up to `limit` budgets of the user, starting after the `next_cursor` of the previous page.
+
+        Budgets are ordered by id, or in `ordering` if given; a cursor only continues pages of its own ordering.
+        """
+
+    def iter_by_user_id(self, user_id: str, batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[Budget]:
+        return iterate_pages(lambda cursor: self.get_page_by_user_id(user_id, batch_size, cursor))
+
+    @abstractmethod
+    async def update(self, budget: Budget) -> None:
+        """
+        Compare-and-swap: overwrite the stored budget only if its version is still the given one, then bump it.
+
+        Raises `ConcurrentUpdateError` if someone else wrote the budget since it was read.
+        """
+
+    @abstractmethod
+    async def update_many(self, budgets: list[Budget]) -> None:
+        """Update all `budgets` like `update`, or none of them if any does not exist or has a stale version."""
 
     @abstractmethod
-    async def update(self, budget: Budget) -> None: ...
+    async def delete(self, budget_id: str, expected_version: int | None = None) -> bool:
+        """Delete the budget and return whether it existed, checking `expected_version` like `update` if given."""
 
     @abstractmethod
-    async def delete(self, budget_id: str) -> None: ...
+    async def delete_many(self, budget_ids: list[str]) -> None:
+        """Delete all `budget_ids`, or none of them if any does not exist."""
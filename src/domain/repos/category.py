@@ -1,13 +1,18 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 
 from domain.models.category import Category
 from domain.models.transaction import TransactionType
+from domain.repos.page import STREAM_BATCH_SIZE, Page, iterate_pages
 
 
 class CategoryRepo(ABC):
     @abstractmethod
     async def create(self, category: Category) -> None: ...
 
+    @abstractmethod
+    async def create_many(self, categories: list[Category]) -> None: ...
+
     @abstractmethod
     async def get_by_id(self, category_id: str) -> Category | None: ...
 
@@ -15,7 +20,39 @@ class CategoryRepo(ABC):
     async def get_by_user_id(self, user_id: str, transaction_type: TransactionType | None = None) -> list[Category]: ...
 
     @abstractmethod
-    async def update(self, category: Category) -> None: ...
+    async def get_page_by_user_id(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: str | None = None,
+        transaction_type: TransactionType | None = None,
+    ) -> Page[Category]:
+        """Up to `limit` categories of the user ordered by id, starting after the `next_cursor` of the previous page."""
+
+    def iter_by_user_id(
+        self,
+        user_id: str,
+        transaction_type: TransactionType | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[Category]:
+        return iterate_pages(lambda cursor: self.get_page_by_user_id(user_id, batch_size, cursor, transaction_type))
+
+    @abstractmethod
+    async def update(self, category: Category) -> None:
+        """
+        Compare-and-swap: overwrite the stored category only if its version is still the given one, then bump it.
+
+        Raises `ConcurrentUpdateError` if someone else wrote the category since it was read.
+        """
+
+    @abstractmethod
+    async def update_many(self, categories: list[Category]) -> None:
+        """Update all `categories` like `update`, or none of them if any does not exist or has a stale version."""
+
+    @abstractmethod
+    async def delete(self, category_id: str, expected_version: int | None = None) -> bool:
+        """Delete the category and return whether it existed, checking `expected_version` like `update` if given."""
 
     @abstractmethod
-    async def delete(self, category_id: str) -> None: ...
+    async def delete_many(self, category_ids: list[str]) -> None:
+        """Delete all `category_ids`, or none of them if any does not exist."""
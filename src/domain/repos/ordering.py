@@ -0,0 +1,8 @@
+from enum import StrEnum
+
+
+class Ordering(StrEnum):
+    """Order of list query results by creation time; ties are broken by id."""
+
+    OLDEST_FIRST = "oldest_first"
+    NEWEST_FIRST = "newest_first"
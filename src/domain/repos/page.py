@@ -0,0 +1,40 @@
+from bisect import bisect_right
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+
+STREAM_BATCH_SIZE = 100
+
+
+@dataclass(slots=True)
+class Page[T]:
+    items: list[T] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+def slice_page(sorted_ids: list[str], limit: int, cursor: str | None) -> tuple[list[str], str | None]:
+    """Take up to `limit` ids following `cursor`; the returned cursor is None when nothing is left after them."""
+    start = 0 if cursor is None else bisect_right(sorted_ids, cursor)
+    page_ids = sorted_ids[start : start + limit]
+    has_more = bool(page_ids) and start + limit < len(sorted_ids)
+    return page_ids, page_ids[-1] if has_more else None
+
+
+def keyset_cursor(order_value: str, record_id: str) -> str:
+    """Cursor of a page ordered by `(order_value, id)`, e.g. by creation time; ISO datetimes hold no spaces."""
+    return f"{order_value} {record_id}"
+
+
+def parse_keyset_cursor(cursor: str) -> tuple[str, str]:
+    order_value, _, record_id = cursor.partition(" ")
+    return order_value, record_id
+
+
+async def iterate_pages[T](fetch_page: Callable[[str | None], Awaitable[Page[T]]]) -> AsyncIterator[T]:
+    cursor = None
+    while True:
+        page = await fetch_page(cursor)
+        for item in page.items:
+            yield item
+        if page.next_cursor is None:
+            return
+        cursor = page.next_cursor
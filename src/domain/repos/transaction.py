@@ -1,15 +1,26 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Mapping
+from datetime import datetime
 
 from domain.models.transaction import Transaction
+from domain.repos.page import STREAM_BATCH_SIZE, Page, iterate_pages
 
 
 class TransactionRepo(ABC):
     @abstractmethod
     async def create(self, transaction: Transaction) -> None: ...
 
+    @abstractmethod
+    async def create_many(self, transactions: list[Transaction]) -> None:
+        """Create all `transactions` at once, for bulk imports that would be slow one write at a time."""
+
     @abstractmethod
     async def get_by_id(self, transaction_id: str) -> Transaction | None: ...
 
+    @abstractmethod
+    async def get_by_ids(self, transaction_ids: list[str]) -> list[Transaction]:
+        """Return the transactions among `transaction_ids` that exist, in no particular order, in one batch read."""
+
     @abstractmethod
     async def get_by_user_id(self, user_id: str) -> list[Transaction]: ...
 
@@ -17,7 +28,46 @@ class TransactionRepo(ABC):
     async def get_by_budget_id(self, budget_id: str) -> list[Transaction]: ...
 
     @abstractmethod
-    async def update(self, transaction: Transaction) -> None: ...
+    async def get_by_date_range(
+        self, user_id: str, start: datetime, end: datetime, budget_id: str | None = None
+    ) -> list[Transaction]:
+        """Transactions of the user, and of the budget if given, dated within `[start, end)`, ordered by date."""
+
+    @abstractmethod
+    async def get_page_by_user_id(self, user_id: str, limit: int, cursor: str | None = None) -> Page[Transaction]:
+        """Up to `limit` transactions of the user ordered by id, starting after the previous page's `next_cursor`."""
+
+    @abstractmethod
+    async def get_page_by_budget_id(self, budget_id: str, limit: int, cursor: str | None = None) -> Page[Transaction]:
+        """Up to `limit` transactions of the budget ordered by id, starting after the previous page's `next_cursor`."""
+
+    def iter_by_user_id(self, user_id: str, batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[Transaction]:
+        return iterate_pages(lambda cursor: self.get_page_by_user_id(user_id, batch_size, cursor))
+
+    def iter_by_budget_id(self, budget_id: str, batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[Transaction]:
+        return iterate_pages(lambda cursor: self.get_page_by_budget_id(budget_id, batch_size, cursor))
+
+    @abstractmethod
+    async def update(self, transaction: Transaction) -> None:
+        """
+        Compare-and-swap: overwrite the stored transaction only if its version is still the given one, then bump it.
+
+        Raises `ConcurrentUpdateError` if someone else wrote the transaction since it was read.
+        """
 
     @abstractmethod
-    async def delete(self, transaction_id: str) -> None: ...
+    async def update_many(self, transactions: list[Transaction]) -> None:
+        """Update all `transactions` like `update`, or none of them if any does not exist or has a stale version."""
+
+    @abstractmethod
+    async def delete(self, transaction_id: str, expected_version: int | None = None) -> bool:
+        """Delete the transaction and return whether it existed, checking `expected_version` like `update` if given."""
+
+    @abstractmethod
+    async def delete_many(self, transaction_ids: list[str], expected_versions: Mapping[str, int] | None = None) -> None:
+        """
+        Delete all `transaction_ids`, or none of them if any does not exist.
+
+        With `expected_versions`, the version each of them was read at, none is deleted either if any has another
+        version by now, and `ConcurrentUpdateError` is raised.
+        """
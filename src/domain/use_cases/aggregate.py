@@ -0,0 +1,60 @@
+import logging
+from collections.abc import Iterable
+
+from domain.errors import InvalidMonthError
+from domain.models.aggregate import AggregateKey, TransactionAggregate, merge_delta, month_of
+from domain.models.transaction import Transaction
+from domain.repos.aggregate import AggregateRepo
+from domain.repos.transaction import TransactionRepo
+
+logger = logging.getLogger(__name__)
+
+
+def aggregate_deltas(
+    added: Iterable[Transaction] = (), removed: Iterable[Transaction] = ()
+) -> list[TransactionAggregate]:
+    """Compute the changes to the aggregates made by writing `added` in place of `removed`, without no-op entries."""
+    deltas: dict[AggregateKey, TransactionAggregate] = {}
+    for transaction in added:
+        merge_delta(deltas, _aggregate_of(transaction, sign=1))
+    for transaction in removed:
+        merge_delta(deltas, _aggregate_of(transaction, sign=-1))
+    return [delta for delta in deltas.values() if delta.count or delta.total]
+
+
+def _aggregate_of(transaction: Transaction, sign: int) -> TransactionAggregate:
+    return TransactionAggregate(
+        user_id=transaction.user_id,
+        budget_id=transaction.budget_id,
+        category_id=transaction.category_id,
+        month=month_of(transaction.date),
+        type=transaction.type,
+        total=sign * transaction.amount,
+        count=sign,
+    )
+
+
+class GetMonthlyAggregates:
+    def __init__(self, repo: AggregateRepo) -> None:
+        self._repo = repo
+
+    async def execute(self, user_id: str, year: int, month: int) -> list[TransactionAggregate]:
+        if not 1 <= month <= 12:  # noqa: PLR2004
+            raise InvalidMonthError(month)
+        aggregates = await self._repo.get_by_user_id(user_id, f"{year:04d}-{month:02d}")
+        logger.info("Listed %d aggregates of %04d-%02d for user %s", len(aggregates), year, month, user_id)
+        return aggregates
+
+
+class RebuildAggregates:
+    def __init__(self, repo: AggregateRepo, transaction_repo: TransactionRepo) -> None:
+        self._repo = repo
+        self._transaction_repo = transaction_repo
+
+    async def execute(self, user_id: str) -> list[TransactionAggregate]:
+        aggregates: dict[AggregateKey, TransactionAggregate] = {}
+        async for transaction in self._transaction_repo.iter_by_user_id(user_id):
+            merge_delta(aggregates, _aggregate_of(transaction, sign=1))
+        await self._repo.replace_by_user_id(user_id, list(aggregates.values()))
+        logger.info("Rebuilt %d aggregates for user %s", len(aggregates), user_id)
+        return list(aggregates.values())
@@ -1,34 +1,78 @@
 import logging
+from collections.abc import AsyncIterator
+from dataclasses import replace
 from decimal import Decimal
 
-from domain.errors import BudgetNotFoundError, EmptyNameError, NegativeBalanceError
-from domain.models.budget import Budget
+from domain.errors import (
+    BudgetNotFoundError,
+    EmptyNameError,
+    InvalidPageLimitError,
+    NegativeBalanceError,
+)
+from domain.models.budget import Budget, BudgetDraft
 from domain.repos.budget import BudgetRepo
+from domain.repos.ordering import Ordering
+from domain.repos.page import Page
+from domain.use_cases.feed import ChangeFeed, RemoteChanges
+from domain.use_cases.retry import MAX_WRITE_ATTEMPTS, retry_on_conflict
+from domain.use_cases.single_flight import DEFAULT_RESULT_TTL_SECONDS, SingleFlight
 from domain.utils import UNSET, Unset, uuid4_str
 
 logger = logging.getLogger(__name__)
 
 
+def _apply_changes(
+    budget: Budget, name: str | Unset, balance: Decimal | Unset, description: str | None | Unset
+) -> None:
+    if not isinstance(name, Unset):
+        if not name.strip():
+            raise EmptyNameError(field="name")
+        budget.name = name
+    if not isinstance(balance, Unset):
+        if balance < 0:
+            raise NegativeBalanceError(balance)
+        # A manual correction moves the opening balance too, so transactions still add up to the new balance
+        if budget.initial_balance is not None:
+            budget.initial_balance += balance - budget.balance
+        budget.balance = balance
+    if not isinstance(description, Unset):
+        budget.description = description
+
+
 class CreateBudget:
-    def __init__(self, repo: BudgetRepo) -> None:
+    def __init__(self, repo: BudgetRepo, feed: ChangeFeed[Budget] | None = None) -> None:
         self._repo = repo
+        self._feed = feed if feed is not None else ChangeFeed()
 
     async def execute(self, name: str, balance: Decimal, user_id: str, description: str | None = None) -> Budget:
-        if not name or not name.strip():
+        budget = self._build(BudgetDraft(name, balance, description), user_id)
+        await self._repo.create(budget)
+        self._feed.upserted(budget.id, budget)
+        logger.info("Created budget %s for user %s", budget.id, user_id)
+        return budget
+
+    async def execute_many(self, drafts: list[BudgetDraft], user_id: str) -> list[Budget]:
+        """Create all the budgets in one repo write, or none of them if any is invalid."""
+        budgets = [self._build(draft, user_id) for draft in drafts]
+        await self._repo.create_many(budgets)
+        for budget in budgets:
+            self._feed.upserted(budget.id, budget)
+        logger.info("Created %d budgets for user %s", len(budgets), user_id)
+        return budgets
+
+    @staticmethod
+    def _build(draft: BudgetDraft, user_id: str) -> Budget:
+        if not draft.name or not draft.name.strip():
             raise EmptyNameError(field="name")
-        if balance < 0:
-            raise NegativeBalanceError(balance)
-        budget_id = uuid4_str()
-        budget = Budget(
-            id=budget_id,
-            name=name,
-            balance=balance,
+        if draft.balance < 0:
+            raise NegativeBalanceError(draft.balance)
+        return Budget(
+            id=uuid4_str(),
+            name=draft.name,
+            balance=draft.balance,
             user_id=user_id,
-            description=description,
+            description=draft.description,
         )
-        await self._repo.create(budget)
-        logger.info("Created budget %s for user %s", budget_id, user_id)
-        return budget
 
 
 class GetBudget:
@@ -44,18 +88,74 @@ class GetBudget:
 
 
 class ListBudgets:
-    def __init__(self, repo: BudgetRepo) -> None:
+    """
+    Lists shared by concurrent callers: identical reads in flight are coalesced and their results kept briefly.
+
+    The results are dropped on every write published on `feed`, and on every budget write of another worker that
+    `remote_changes`, polled before each read, reports. Without a feed nothing is kept, as nothing would tell it
+    the results went stale.
+    """
+
+    def __init__(
+        self,
+        repo: BudgetRepo,
+        feed: ChangeFeed[Budget] | None = None,
+        remote_changes: RemoteChanges | None = None,
+    ) -> None:
         self._repo = repo
+        self._remote_changes = remote_changes
+        ttl_seconds = DEFAULT_RESULT_TTL_SECONDS if feed is not None else 0
+        self._lists: SingleFlight[tuple[str, Ordering | None, int | None], list[Budget]] = SingleFlight(ttl_seconds)
+        self._pages: SingleFlight[tuple[str, int, str | None, Ordering | None], Page[Budget]] = SingleFlight(
+            ttl_seconds
+        )
+        if feed is not None:
+            feed.subscribe(lambda _: self._invalidate())
+        if remote_changes is not None:
+            remote_changes.subscribe("budgets", lambda _: self._invalidate())
 
-    async def execute(self, user_id: str) -> list[Budget]:
-        budgets = await self._repo.get_by_user_id(user_id)
-        logger.info("Listed %d budgets for user %s", len(budgets), user_id)
-        return budgets
+    async def execute(self, user_id: str, ordering: Ordering | None = None, limit: int | None = None) -> list[Budget]:
+        if limit is not None and limit <= 0:
+            raise InvalidPageLimitError(limit)
+
+        async def fetch() -> list[Budget]:
+            budgets = await self._repo.get_by_user_id(user_id, ordering, limit)
+            logger.info("Listed %d budgets for user %s", len(budgets), user_id)
+            return budgets
+
+        await self._poll_remote_changes()
+        return await self._lists.run((user_id, ordering, limit), fetch)
+
+    async def execute_page(
+        self, user_id: str, limit: int, cursor: str | None = None, ordering: Ordering | None = None
+    ) -> Page[Budget]:
+        if limit <= 0:
+            raise InvalidPageLimitError(limit)
+
+        async def fetch() -> Page[Budget]:
+            page = await self._repo.get_page_by_user_id(user_id, limit, cursor, ordering)
+            logger.info("Listed page of %d budgets for user %s", len(page.items), user_id)
+            return page
+
+        await self._poll_remote_changes()
+        return await self._pages.run((user_id, limit, cursor, ordering), fetch)
+
+    def stream(self, user_id: str) -> AsyncIterator[Budget]:
+        return self._repo.iter_by_user_id(user_id)
+
+    async def _poll_remote_changes(self) -> None:
+        if self._remote_changes is not None:
+            await self._remote_changes.poll()
+
+    def _invalidate(self) -> None:
+        self._lists.invalidate()
+        self._pages.invalidate()
 
 
 class UpdateBudget:
-    def __init__(self, repo: BudgetRepo) -> None:
+    def __init__(self, repo: BudgetRepo, feed: ChangeFeed[Budget] | None = None) -> None:
         self._repo = repo
+        self._feed = feed if feed is not None else ChangeFeed()
 
     async def execute(
         self,
@@ -63,34 +163,60 @@ class UpdateBudget:
         name: str | Unset = UNSET,
         balance: Decimal | Unset = UNSET,
         description: str | None | Unset = UNSET,
+        expected_version: int | None = None,
     ) -> Budget:
-        budget = await self._repo.get_by_id(budget_id)
-        if budget is None:
-            raise BudgetNotFoundError(budget_id)
-
-        if not isinstance(name, Unset):
-            if not name.strip():
-                raise EmptyNameError(field="name")
-            budget.name = name
-        if not isinstance(balance, Unset):
-            if balance < 0:
-                raise NegativeBalanceError(balance)
-            budget.balance = balance
-        if not isinstance(description, Unset):
-            budget.description = description
-
-        await self._repo.update(budget)
+        """
+        Apply the changes to a fresh read of the budget, starting over if a concurrent write gets in first.
+
+        With `expected_version`, the caller's copy must still be current, so a conflict is raised instead of retried.
+        """
+
+        async def attempt() -> Budget:
+            budget = await self._repo.get_by_id(budget_id)
+            if budget is None:
+                raise BudgetNotFoundError(budget_id)
+            if expected_version is not None:
+                budget.version = expected_version
+            _apply_changes(budget, name, balance, description)
+            await self._repo.update(budget)
+            return budget
+
+        budget = await retry_on_conflict(attempt, attempts=MAX_WRITE_ATTEMPTS if expected_version is None else 1)
+        self._feed.upserted(budget_id, budget)
         logger.info("Updated budget %s", budget_id)
         return budget
 
+    async def execute_many(self, changes: list[tuple[Budget, BudgetDraft]]) -> list[Budget]:
+        """
+        Apply each draft to the caller's copy of its budget and write them all at once, or none if any fails.
+
+        The copies must still be current, so a concurrent write to any of them raises `ConcurrentUpdateError`.
+        """
+        budgets = []
+        for budget, draft in changes:
+            updated = replace(budget)
+            _apply_changes(updated, draft.name, draft.balance, draft.description)
+            budgets.append(updated)
+        await self._repo.update_many(budgets)
+        for budget in budgets:
+            self._feed.upserted(budget.id, budget)
+        logger.info("Updated %d budgets", len(budgets))
+        return budgets
+
 
 class DeleteBudget:
-    def __init__(self, repo: BudgetRepo) -> None:
+    def __init__(self, repo: BudgetRepo, feed: ChangeFeed[Budget] | None = None) -> None:
         self._repo = repo
+        self._feed = feed if feed is not None else ChangeFeed()
 
-    async def execute(self, budget_id: str) -> None:
-        existing = await self._repo.get_by_id(budget_id)
-        if existing is None:
+    async def execute(self, budget_id: str, expected_version: int | None = None) -> None:
+        if not await self._repo.delete(budget_id, expected_version):
             raise BudgetNotFoundError(budget_id)
-        await self._repo.delete(budget_id)
+        self._feed.deleted(budget_id)
         logger.info("Deleted budget %s", budget_id)
+
+    async def execute_many(self, budget_ids: list[str]) -> None:
+        await self._repo.delete_many(budget_ids)
+        for budget_id in budget_ids:
+            self._feed.deleted(budget_id)
+        logger.info("Deleted %d budgets", len(budget_ids))
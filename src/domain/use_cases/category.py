@@ -1,14 +1,34 @@
 import logging
+from collections.abc import AsyncIterator
+from dataclasses import replace
 
-from domain.errors import CategoryNotFoundError, EmptyNameError
-from domain.models.category import Category
+from domain.errors import CategoryNotFoundError, EmptyNameError, InvalidPageLimitError
+from domain.models.category import Category, CategoryDraft
 from domain.models.transaction import TransactionType
 from domain.repos.category import CategoryRepo
+from domain.repos.page import Page
+from domain.use_cases.retry import MAX_WRITE_ATTEMPTS, retry_on_conflict
 from domain.utils import UNSET, Unset, uuid4_str
 
 logger = logging.getLogger(__name__)
 
 
+def _apply_changes(
+    category: Category,
+    name: str | Unset,
+    transaction_type: TransactionType | None | Unset,
+    description: str | None | Unset,
+) -> None:
+    if not isinstance(name, Unset):
+        if not name.strip():
+            raise EmptyNameError(field="name")
+        category.name = name
+    if not isinstance(transaction_type, Unset):
+        category.transaction_type = transaction_type
+    if not isinstance(description, Unset):
+        category.description = description
+
+
 class CreateCategory:
     def __init__(self, repo: CategoryRepo) -> None:
         self._repo = repo
@@ -16,20 +36,29 @@ class CreateCategory:
     async def execute(
         self, name: str, user_id: str, transaction_type: TransactionType | None = None, description: str | None = None
     ) -> Category:
-        if not name or not name.strip():
-            raise EmptyNameError(field="name")
+        category = self._build(CategoryDraft(name, transaction_type, description), user_id)
+        await self._repo.create(category)
+        logger.info("Created category %s for user %s", category.id, user_id)
+        return category
 
-        category_id = uuid4_str()
-        category = Category(
-            id=category_id,
-            name=name,
+    async def execute_many(self, drafts: list[CategoryDraft], user_id: str) -> list[Category]:
+        """Create all the categories in one repo write, or none of them if any is invalid."""
+        categories = [self._build(draft, user_id) for draft in drafts]
+        await self._repo.create_many(categories)
+        logger.info("Created %d categories for user %s", len(categories), user_id)
+        return categories
+
+    @staticmethod
+    def _build(draft: CategoryDraft, user_id: str) -> Category:
+        if not draft.name or not draft.name.strip():
+            raise EmptyNameError(field="name")
+        return Category(
+            id=uuid4_str(),
+            name=draft.name,
             user_id=user_id,
-            transaction_type=transaction_type,
-            description=description,
+            transaction_type=draft.transaction_type,
+            description=draft.description,
         )
-        await self._repo.create(category)
-        logger.info("Created category %s for user %s", category_id, user_id)
-        return category
 
 
 class GetCategory:
@@ -53,6 +82,22 @@ class ListCategories:
         logger.info("Listed %d categories for user %s", len(categories), user_id)
         return categories
 
+    async def execute_page(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: str | None = None,
+        transaction_type: TransactionType | None = None,
+    ) -> Page[Category]:
+        if limit <= 0:
+            raise InvalidPageLimitError(limit)
+        page = await self._repo.get_page_by_user_id(user_id, limit, cursor, transaction_type)
+        logger.info("Listed page of %d categories for user %s", len(page.items), user_id)
+        return page
+
+    def stream(self, user_id: str, transaction_type: TransactionType | None = None) -> AsyncIterator[Category]:
+        return self._repo.iter_by_user_id(user_id, transaction_type)
+
 
 class UpdateCategory:
     def __init__(self, repo: CategoryRepo) -> None:
@@ -64,34 +109,53 @@ class UpdateCategory:
         name: str | Unset = UNSET,
         transaction_type: TransactionType | None | Unset = UNSET,
         description: str | None | Unset = UNSET,
+        expected_version: int | None = None,
     ) -> Category:
-        category = await self._repo.get_by_id(category_id)
-        if category is None:
-            raise CategoryNotFoundError(category_id)
-
-        if not isinstance(name, Unset):
-            if not name.strip():
-                raise EmptyNameError(field="name")
-            category.name = name
-
-        if not isinstance(transaction_type, Unset):
-            category.transaction_type = transaction_type
-
-        if not isinstance(description, Unset):
-            category.description = description
-
-        await self._repo.update(category)
+        """
+        Apply the changes to a fresh read of the category, starting over if a concurrent write gets in first.
+
+        With `expected_version`, the caller's copy must still be current, so a conflict is raised instead of retried.
+        """
+
+        async def attempt() -> Category:
+            category = await self._repo.get_by_id(category_id)
+            if category is None:
+                raise CategoryNotFoundError(category_id)
+            if expected_version is not None:
+                category.version = expected_version
+            _apply_changes(category, name, transaction_type, description)
+            await self._repo.update(category)
+            return category
+
+        category = await retry_on_conflict(attempt, attempts=MAX_WRITE_ATTEMPTS if expected_version is None else 1)
         logger.info("Updated category %s", category_id)
         return category
 
+    async def execute_many(self, changes: list[tuple[Category, CategoryDraft]]) -> list[Category]:
+        """
+        Apply each draft to the caller's copy of its category and write them all at once, or none if any fails.
+
+        The copies must still be current, so a concurrent write to any of them raises `ConcurrentUpdateError`.
+        """
+        categories = []
+        for category, draft in changes:
+            updated = replace(category)
+            _apply_changes(updated, draft.name, draft.transaction_type, draft.description)
+            categories.append(updated)
+        await self._repo.update_many(categories)
+        logger.info("Updated %d categories", len(categories))
+        return categories
+
 
 class DeleteCategory:
     def __init__(self, repo: CategoryRepo) -> None:
         self._repo = repo
 
-    async def execute(self, category_id: str) -> None:
-        existing = await self._repo.get_by_id(category_id)
-        if existing is None:
+    async def execute(self, category_id: str, expected_version: int | None = None) -> None:
+        if not await self._repo.delete(category_id, expected_version):
             raise CategoryNotFoundError(category_id)
-        await self._repo.delete(category_id)
         logger.info("Deleted category %s", category_id)
+
+    async def execute_many(self, category_ids: list[str]) -> None:
+        await self._repo.delete_many(category_ids)
+        logger.info("Deleted %d categories", len(category_ids))
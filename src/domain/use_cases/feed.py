@@ -0,0 +1,55 @@
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+from domain.models.change import Change, ChangeKind
+
+logger = logging.getLogger(__name__)
+
+type ChangeSubscriber[T] = Callable[[Change[T]], None]
+type RemoteChangeSubscriber = Callable[[list[str] | None], None]
+
+
+class ChangeFeed[T]:
+    """
+    In-process fan-out of the entities the use cases write, e.g. to every connected UI client.
+
+    Subscribers are called synchronously right after each successful write and must not block. A failing subscriber
+    is logged and skipped, so it can neither fail the write nor starve the others.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: list[ChangeSubscriber[T]] = []
+
+    def subscribe(self, subscriber: ChangeSubscriber[T]) -> Callable[[], None]:
+        """Start calling `subscriber` with every change; call the returned function to stop."""
+        self._subscribers.append(subscriber)
+        return lambda: self._subscribers.remove(subscriber)
+
+    def upserted(self, entity_id: str, entity: T) -> None:
+        self._publish(Change(ChangeKind.UPSERTED, entity_id, entity))
+
+    def deleted(self, entity_id: str) -> None:
+        self._publish(Change(ChangeKind.DELETED, entity_id))
+
+    def _publish(self, change: Change[T]) -> None:
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber(change)
+            except Exception:
+                logger.exception("Change subscriber failed on %s of %s", change.kind, change.entity_id)
+
+
+class RemoteChanges(ABC):
+    """
+    Ids of the entities other worker processes wrote, by topic such as `"budgets"`.
+
+    Nothing arrives in the background: readers `poll` before serving anything they keep, which calls the topic's
+    subscribers with the changed ids, or with None when changes were missed and everything must be dropped.
+    """
+
+    @abstractmethod
+    def subscribe(self, topic: str, callback: RemoteChangeSubscriber) -> None: ...
+
+    @abstractmethod
+    async def poll(self) -> None: ...
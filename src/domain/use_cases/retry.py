@@ -0,0 +1,22 @@
+import logging
+from collections.abc import Awaitable, Callable
+
+from domain.errors import ConcurrentUpdateError
+
+logger = logging.getLogger(__name__)
+
+MAX_WRITE_ATTEMPTS = 3
+
+
+async def retry_on_conflict[T](attempt: Callable[[], Awaitable[T]], attempts: int = MAX_WRITE_ATTEMPTS) -> T:
+    """
+    Run a read-modify-write `attempt`, starting over from a fresh read each time it loses a race.
+
+    Gives up after `attempts` tries by letting the last `ConcurrentUpdateError` through.
+    """
+    for number in range(1, attempts):
+        try:
+            return await attempt()
+        except ConcurrentUpdateError as exc:
+            logger.info("Write conflict on attempt %d of %d, retrying: %s", number, attempts, exc)
+    return await attempt()
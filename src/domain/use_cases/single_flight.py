@@ -0,0 +1,74 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULT_TTL_SECONDS = 2.0
+DEFAULT_MAX_RESULTS = 1024
+
+
+@dataclass
+class ReadStats:
+    fetched: int = 0
+    coalesced: int = 0
+    cached: int = 0
+
+
+class SingleFlight[K: Hashable, V]:
+    """
+    Request coalescing for reads: concurrent callers asking for the same key share one in-flight fetch.
+
+    The result is then kept for `ttl_seconds`, so a burst of sessions opening the same page costs one repo read.
+    `invalidate` drops it all and detaches the fetches in flight, whose results may predate the write, so the next
+    caller reads again. Callers get the same result object and must not mutate it. A caller that is cancelled
+    leaves the fetch running for the others.
+    """
+
+    def __init__(self, ttl_seconds: float = DEFAULT_RESULT_TTL_SECONDS, max_results: int = DEFAULT_MAX_RESULTS) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_results = max_results
+        self._in_flight: dict[K, asyncio.Task[V]] = {}
+        self._results: dict[K, tuple[float, V]] = {}
+        self._generation = 0
+        self.stats = ReadStats()
+
+    async def run(self, key: K, fetch: Callable[[], Awaitable[V]]) -> V:
+        cached = self._results.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self.stats.cached += 1
+            return cached[1]
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, fetch, self._generation))
+            self._in_flight[key] = task
+            self.stats.fetched += 1
+        else:
+            self.stats.coalesced += 1
+        return await asyncio.shield(task)
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._in_flight.clear()
+        self._results.clear()
+
+    async def _fetch(self, key: K, fetch: Callable[[], Awaitable[V]], generation: int) -> V:
+        try:
+            result = await fetch()
+        finally:
+            if self._in_flight.get(key) is asyncio.current_task():
+                del self._in_flight[key]
+        if self._ttl_seconds > 0 and generation == self._generation:
+            self._store(key, result)
+        return result
+
+    def _store(self, key: K, result: V) -> None:
+        if len(self._results) >= self._max_results:
+            now = time.monotonic()
+            self._results = {stored: entry for stored, entry in self._results.items() if entry[0] > now}
+            if len(self._results) >= self._max_results:
+                logger.debug("Read results are full, dropping the oldest")
+                del self._results[next(iter(self._results))]
+        self._results[key] = (time.monotonic() + self._ttl_seconds, result)
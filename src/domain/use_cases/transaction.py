@@ -0,0 +1,463 @@
+import csv
+import itertools
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import replace
+from datetime import UTC, datetime
+from decimal import Decimal, InvalidOperation
+from functools import partial
+
+from domain.analytics.report import to_minor_units
+from domain.errors import (
+    BudgetNotFoundError,
+    CategoryNotFoundError,
+    CategoryTypeMismatchError,
+    ConcurrentUpdateError,
+    DomainError,
+    InvalidAmountError,
+    InvalidTransferTargetError,
+    MissingImportColumnsError,
+    NegativeBalanceError,
+    NonPositiveAmountError,
+    TransactionNotFoundError,
+)
+from domain.models.budget import BalanceCheck, Budget
+from domain.models.category import Category
+from domain.models.transaction import ImportReport, RejectedRow, Transaction, TransactionType
+from domain.repos.aggregate import AggregateRepo
+from domain.repos.budget import BudgetRepo
+from domain.repos.category import CategoryRepo
+from domain.repos.transaction import TransactionRepo
+from domain.use_cases.aggregate import aggregate_deltas
+from domain.use_cases.feed import ChangeFeed
+from domain.use_cases.retry import MAX_WRITE_ATTEMPTS, retry_on_conflict
+from domain.utils import UNSET, Unset, utc_now, uuid4_str
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 500
+IMPORT_COLUMNS = ("date", "budget_id", "category_id", "amount", "type", "description", "target_budget_id")
+
+
+def balance_deltas(transaction: Transaction) -> dict[str, Decimal]:
+    """How much `transaction` moves the balance of each budget it touches."""
+    if transaction.type is TransactionType.INCOME:
+        return {transaction.budget_id: transaction.amount}
+    deltas = {transaction.budget_id: -transaction.amount}
+    if transaction.type is TransactionType.TRANSFER and transaction.target_budget_id is not None:
+        deltas[transaction.target_budget_id] = transaction.amount
+    return deltas
+
+
+def _validate(transaction: Transaction) -> None:
+    if not transaction.amount.is_finite():
+        raise InvalidAmountError(str(transaction.amount))
+    if transaction.amount <= 0:
+        raise NonPositiveAmountError(transaction.amount)
+    to_minor_units(transaction.amount)
+    has_target = transaction.target_budget_id is not None
+    if (
+        has_target != (transaction.type is TransactionType.TRANSFER)
+        or transaction.target_budget_id == transaction.budget_id
+    ):
+        raise InvalidTransferTargetError(transaction.budget_id, transaction.target_budget_id)
+
+
+def _check_category(transaction: Transaction, category: Category | None) -> None:
+    if category is None or category.user_id != transaction.user_id:
+        raise CategoryNotFoundError(transaction.category_id)
+    if category.transaction_type not in (None, transaction.type):
+        raise CategoryTypeMismatchError(category.id, transaction.type)
+
+
+def _parse_row(row: dict[str, str], user_id: str, budget_ids: set[str], categories: dict[str, Category]) -> Transaction:
+    target_budget_id = row["target_budget_id"] or None
+    for budget_id in (row["budget_id"], target_budget_id):
+        if budget_id is not None and budget_id not in budget_ids:
+            raise BudgetNotFoundError(budget_id)
+    if row["category_id"] not in categories:
+        raise CategoryNotFoundError(row["category_id"])
+    try:
+        amount = Decimal(row["amount"])
+    except InvalidOperation:
+        raise InvalidAmountError(row["amount"]) from None
+    date = datetime.fromisoformat(row["date"])
+    transaction = Transaction(
+        id=uuid4_str(),
+        budget_id=row["budget_id"],
+        category_id=row["category_id"],
+        amount=amount,
+        type=TransactionType(row["type"]),
+        user_id=user_id,
+        date=(date if date.tzinfo else date.replace(tzinfo=UTC)).astimezone(UTC),
+        description=row["description"] or None,
+        target_budget_id=target_budget_id,
+    )
+    _validate(transaction)
+    _check_category(transaction, categories[transaction.category_id])
+    return transaction
+
+
+class _BalanceUpdater:
+    """
+    Applies transaction writes to budget balances incrementally: each write touches only the budgets it moves.
+
+    All affected budgets are loaded and checked before anything is written, so an invalid write changes nothing.
+    A budget that is gone is skipped when only a removed transaction touches it, so the transactions of a deleted
+    budget can still be updated and deleted, and the other budgets they touch get their money back.
+    The balances are written before the transactions they come from and moved back if those cannot be written.
+    Each written budget goes out on `budget_feed`, so its new balance shows up without a reload.
+    """
+
+    def __init__(self, budget_repo: BudgetRepo, budget_feed: ChangeFeed[Budget] | None = None) -> None:
+        self._budget_repo = budget_repo
+        self._budget_feed = budget_feed if budget_feed is not None else ChangeFeed()
+
+    async def prepare(
+        self, user_id: str, added: Iterable[Transaction] = (), removed: Iterable[Transaction] = ()
+    ) -> list[tuple[Budget, Decimal]]:
+        deltas: defaultdict[str, Decimal] = defaultdict(Decimal)
+        for transaction in added:
+            for budget_id, delta in balance_deltas(transaction).items():
+                deltas[budget_id] += delta
+        required = set(deltas)
+        for transaction in removed:
+            for budget_id, delta in balance_deltas(transaction).items():
+                deltas[budget_id] -= delta
+
+        changes = []
+        for budget_id, delta in deltas.items():
+            if not delta:
+                continue
+            try:
+                changes.append((await self._apply(budget_id, delta, user_id), delta))
+            except BudgetNotFoundError:
+                if budget_id in required:
+                    raise
+                logger.warning("Budget %s of a removed transaction is gone, leaving its balance alone", budget_id)
+        return changes
+
+    async def commit(self, changes: list[tuple[Budget, Decimal]], write: Callable[[], Awaitable[object]]) -> None:
+        """Write the prepared balances, then `write` the transactions; if either fails, the balances are undone."""
+        written: list[tuple[Budget, Decimal]] = []
+        try:
+            for budget, delta in changes:
+                written.append((await self._write(budget, delta), delta))
+            await write()
+        except Exception:
+            await self._undo(written)
+            raise
+        for budget, _ in written:
+            self._budget_feed.upserted(budget.id, budget)
+
+    async def _undo(self, written: list[tuple[Budget, Decimal]]) -> None:
+        for budget, delta in reversed(written):
+            try:
+                restored = await self._write(await self._apply(budget.id, -delta, budget.user_id), -delta)
+            except DomainError:
+                logger.exception("Could not move the balance of budget %s back by %s", budget.id, -delta)
+            else:
+                self._budget_feed.upserted(restored.id, restored)
+
+    async def _apply(self, budget_id: str, delta: Decimal, user_id: str) -> Budget:
+        budget = await self._budget_repo.get_by_id(budget_id)
+        if budget is None or budget.user_id != user_id:
+            raise BudgetNotFoundError(budget_id)
+        budget.balance += delta
+        if budget.balance < 0:
+            raise NegativeBalanceError(budget.balance)
+        return budget
+
+    async def _write(self, budget: Budget, delta: Decimal) -> Budget:
+        # Balance moves commute, so when another write gets in first, the delta goes onto the fresh balance
+        for _ in range(MAX_WRITE_ATTEMPTS - 1):
+            try:
+                await self._budget_repo.update(budget)
+            except ConcurrentUpdateError:
+                budget = await self._apply(budget.id, delta, budget.user_id)
+            else:
+                return budget
+        await self._budget_repo.update(budget)
+        return budget
+
+
+class CreateTransaction:
+    def __init__(
+        self,
+        repo: TransactionRepo,
+        budget_repo: BudgetRepo,
+        category_repo: CategoryRepo,
+        aggregate_repo: AggregateRepo,
+        budget_feed: ChangeFeed[Budget] | None = None,
+    ) -> None:
+        self._repo = repo
+        self._category_repo = category_repo
+        self._balances = _BalanceUpdater(budget_repo, budget_feed)
+        self._aggregate_repo = aggregate_repo
+
+    async def execute(  # noqa: PLR0913
+        self,
+        budget_id: str,
+        category_id: str,
+        amount: Decimal,
+        transaction_type: TransactionType,
+        user_id: str,
+        *,
+        date: datetime | None = None,
+        description: str | None = None,
+        target_budget_id: str | None = None,
+    ) -> Transaction:
+        transaction = Transaction(
+            id=uuid4_str(),
+            budget_id=budget_id,
+            category_id=category_id,
+            amount=amount,
+            type=transaction_type,
+            user_id=user_id,
+            date=(date or utc_now()).astimezone(UTC),
+            description=description,
+            target_budget_id=target_budget_id,
+        )
+        _validate(transaction)
+        budgets = await self._balances.prepare(user_id, added=[transaction])
+        _check_category(transaction, await self._category_repo.get_by_id(category_id))
+        await self._balances.commit(budgets, partial(self._repo.create, transaction))
+        await self._aggregate_repo.add(aggregate_deltas(added=[transaction]))
+        logger.info("Created transaction %s in budget %s", transaction.id, budget_id)
+        return transaction
+
+
+class GetTransaction:
+    def __init__(self, repo: TransactionRepo) -> None:
+        self._repo = repo
+
+    async def execute(self, transaction_id: str) -> Transaction:
+        transaction = await self._repo.get_by_id(transaction_id)
+        if transaction is None:
+            raise TransactionNotFoundError(transaction_id)
+        logger.info("Retrieved transaction %s", transaction_id)
+        return transaction
+
+
+class ListTransactions:
+    def __init__(self, repo: TransactionRepo) -> None:
+        self._repo = repo
+
+    async def execute(self, budget_id: str) -> list[Transaction]:
+        transactions = await self._repo.get_by_budget_id(budget_id)
+        logger.info("Listed %d transactions for budget %s", len(transactions), budget_id)
+        return transactions
+
+    async def execute_in_date_range(
+        self, user_id: str, start: datetime, end: datetime, budget_id: str | None = None
+    ) -> list[Transaction]:
+        transactions = await self._repo.get_by_date_range(user_id, start, end, budget_id)
+        logger.info("Listed %d transactions of user %s from %s to %s", len(transactions), user_id, start, end)
+        return transactions
+
+
+class UpdateTransaction:
+    def __init__(
+        self,
+        repo: TransactionRepo,
+        budget_repo: BudgetRepo,
+        category_repo: CategoryRepo,
+        aggregate_repo: AggregateRepo,
+        budget_feed: ChangeFeed[Budget] | None = None,
+    ) -> None:
+        self._repo = repo
+        self._category_repo = category_repo
+        self._balances = _BalanceUpdater(budget_repo, budget_feed)
+        self._aggregate_repo = aggregate_repo
+
+    async def execute(  # noqa: PLR0913
+        self,
+        transaction_id: str,
+        *,
+        budget_id: str | Unset = UNSET,
+        category_id: str | Unset = UNSET,
+        amount: Decimal | Unset = UNSET,
+        transaction_type: TransactionType | Unset = UNSET,
+        date: datetime | Unset = UNSET,
+        description: str | None | Unset = UNSET,
+        target_budget_id: str | None | Unset = UNSET,
+    ) -> Transaction:
+        async def attempt() -> tuple[Transaction, Transaction]:
+            existing = await self._repo.get_by_id(transaction_id)
+            if existing is None:
+                raise TransactionNotFoundError(transaction_id)
+            transaction = replace(existing)
+
+            if not isinstance(budget_id, Unset):
+                transaction.budget_id = budget_id
+            if not isinstance(category_id, Unset):
+                transaction.category_id = category_id
+            if not isinstance(amount, Unset):
+                transaction.amount = amount
+            if not isinstance(transaction_type, Unset):
+                transaction.type = transaction_type
+            if not isinstance(date, Unset):
+                transaction.date = date.astimezone(UTC)
+            if not isinstance(description, Unset):
+                transaction.description = description
+            if not isinstance(target_budget_id, Unset):
+                transaction.target_budget_id = target_budget_id
+
+            _validate(transaction)
+            budgets = await self._balances.prepare(transaction.user_id, added=[transaction], removed=[existing])
+            await self._check_category_change(transaction, existing)
+            await self._balances.commit(budgets, partial(self._repo.update, transaction))
+            return transaction, existing
+
+        transaction, existing = await retry_on_conflict(attempt)
+        await self._aggregate_repo.add(aggregate_deltas(added=[transaction], removed=[existing]))
+        logger.info("Updated transaction %s", transaction_id)
+        return transaction
+
+    async def _check_category_change(self, transaction: Transaction, existing: Transaction) -> None:
+        # A transaction keeps its category even if that was deleted or retyped since, unless it moves
+        if transaction.category_id != existing.category_id or transaction.type is not existing.type:
+            _check_category(transaction, await self._category_repo.get_by_id(transaction.category_id))
+
+
+class DeleteTransaction:
+    def __init__(
+        self,
+        repo: TransactionRepo,
+        budget_repo: BudgetRepo,
+        aggregate_repo: AggregateRepo,
+        budget_feed: ChangeFeed[Budget] | None = None,
+    ) -> None:
+        self._repo = repo
+        self._balances = _BalanceUpdater(budget_repo, budget_feed)
+        self._aggregate_repo = aggregate_repo
+
+    async def execute(self, transaction_id: str) -> None:
+        async def attempt() -> Transaction:
+            existing = await self._repo.get_by_id(transaction_id)
+            if existing is None:
+                raise TransactionNotFoundError(transaction_id)
+
+            async def delete() -> None:
+                if not await self._repo.delete(transaction_id, existing.version):
+                    raise TransactionNotFoundError(transaction_id)
+
+            budgets = await self._balances.prepare(existing.user_id, removed=[existing])
+            await self._balances.commit(budgets, delete)
+            return existing
+
+        existing = await retry_on_conflict(attempt)
+        await self._aggregate_repo.add(aggregate_deltas(removed=[existing]))
+        logger.info("Deleted transaction %s", transaction_id)
+
+    async def execute_many(self, transaction_ids: list[str]) -> None:
+        transaction_ids = list(dict.fromkeys(transaction_ids))
+
+        async def attempt() -> dict[str, Transaction]:
+            existing = {transaction.id: transaction for transaction in await self._repo.get_by_ids(transaction_ids)}
+            removed_by_user: defaultdict[str, list[Transaction]] = defaultdict(list)
+            for transaction_id in transaction_ids:
+                if transaction_id not in existing:
+                    raise TransactionNotFoundError(transaction_id)
+                removed_by_user[existing[transaction_id].user_id].append(existing[transaction_id])
+            budgets = [
+                budget
+                for user_id, removed in removed_by_user.items()
+                for budget in await self._balances.prepare(user_id, removed=removed)
+            ]
+            versions = {transaction_id: transaction.version for transaction_id, transaction in existing.items()}
+            await self._balances.commit(budgets, partial(self._repo.delete_many, transaction_ids, versions))
+            return existing
+
+        existing = await retry_on_conflict(attempt)
+        await self._aggregate_repo.add(aggregate_deltas(removed=existing.values()))
+        logger.info("Deleted %d transactions", len(transaction_ids))
+
+
+class ImportTransactions:
+    """
+    Bulk import of transactions from CSV with the `IMPORT_COLUMNS` header, e.g. a converted bank statement.
+
+    Rows are parsed in batches of `batch_size` and checked against the user's budget and category ids, loaded once
+    up front. Each batch is written with one `create_many` and moves each budget balance once. Invalid rows, and
+    whole batches that would overdraw a budget, are rejected and reported instead of stopping the import.
+    Dates without a UTC offset are taken as UTC.
+    """
+
+    def __init__(
+        self,
+        repo: TransactionRepo,
+        budget_repo: BudgetRepo,
+        category_repo: CategoryRepo,
+        aggregate_repo: AggregateRepo,
+        budget_feed: ChangeFeed[Budget] | None = None,
+    ) -> None:
+        self._repo = repo
+        self._budget_repo = budget_repo
+        self._category_repo = category_repo
+        self._balances = _BalanceUpdater(budget_repo, budget_feed)
+        self._aggregate_repo = aggregate_repo
+
+    async def execute(self, user_id: str, lines: Iterable[str], batch_size: int = IMPORT_BATCH_SIZE) -> ImportReport:
+        started = time.perf_counter()
+        reader = csv.DictReader(lines, restval="")
+        missing: list[str] = [column for column in IMPORT_COLUMNS if column not in (reader.fieldnames or ())]
+        if missing:
+            raise MissingImportColumnsError(missing)
+        budget_ids = {budget.id for budget in await self._budget_repo.get_by_user_id(user_id)}
+        categories = {category.id: category async for category in self._category_repo.iter_by_user_id(user_id)}
+
+        report = ImportReport()
+        for batch in itertools.batched(((reader.line_num, row) for row in reader), batch_size):  # noqa: B911 - the last batch may be short
+            transactions, parsed_lines = [], []
+            for line, row in batch:
+                try:
+                    transactions.append(_parse_row(row, user_id, budget_ids, categories))
+                    parsed_lines.append(line)
+                except (DomainError, ValueError) as exc:
+                    report.rejected.append(RejectedRow(line, str(exc)))
+            if not transactions:
+                continue
+            try:
+                budgets = await self._balances.prepare(user_id, added=transactions)
+            except NegativeBalanceError as exc:
+                report.rejected.extend(RejectedRow(line, str(exc)) for line in parsed_lines)
+                continue
+            await self._balances.commit(budgets, partial(self._repo.create_many, transactions))
+            await self._aggregate_repo.add(aggregate_deltas(added=transactions))
+            report.imported += len(transactions)
+
+        report.seconds = time.perf_counter() - started
+        logger.info(
+            "Imported %d transactions for user %s, rejected %d rows, %.0f rows/s",
+            report.imported,
+            user_id,
+            len(report.rejected),
+            report.rows_per_second,
+        )
+        return report
+
+
+class VerifyBudgetBalance:
+    """Recompute a budget's balance from its opening balance and every transaction, and compare with the stored one."""
+
+    def __init__(self, budget_repo: BudgetRepo, transaction_repo: TransactionRepo) -> None:
+        self._budget_repo = budget_repo
+        self._transaction_repo = transaction_repo
+
+    async def execute(self, budget_id: str) -> BalanceCheck:
+        budget = await self._budget_repo.get_by_id(budget_id)
+        if budget is None:
+            raise BudgetNotFoundError(budget_id)
+        expected = budget.balance if budget.initial_balance is None else budget.initial_balance
+        # Incoming transfers are indexed under their source budget, so scan all of the user's transactions
+        async for transaction in self._transaction_repo.iter_by_user_id(budget.user_id):
+            expected += balance_deltas(transaction).get(budget_id, Decimal(0))
+        check = BalanceCheck(budget_id=budget_id, stored=budget.balance, expected=expected)
+        if check.is_consistent:
+            logger.info("Balance of budget %s is consistent", budget_id)
+        else:
+            logger.warning("Balance of budget %s is %s, expected %s", budget_id, budget.balance, expected)
+        return check
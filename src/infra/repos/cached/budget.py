@@ -0,0 +1,89 @@
+from pathlib import Path
+
+from domain.errors import ConcurrentUpdateError
+from domain.models.budget import Budget
+from domain.repos.budget import BudgetRepo
+from domain.repos.ordering import Ordering
+from domain.repos.page import Page
+from infra.repos.cached.cache import EntityCache
+from infra.repos.cached.channel import ChangeChannel
+
+
+class CachedBudgetRepo(BudgetRepo):
+    def __init__(
+        self,
+        repo: BudgetRepo,
+        max_size: int = 1024,
+        watch_dir: Path | None = None,
+        channel: ChangeChannel | None = None,
+    ) -> None:
+        self._repo = repo
+        self._cache: EntityCache[Budget] = EntityCache(max_size, watch_dir, channel, topic="budgets")
+
+    async def create(self, budget: Budget) -> None:
+        await self._repo.create(budget)
+        await self._cache.written(budget.id, budget)
+
+    async def create_many(self, budgets: list[Budget]) -> None:
+        await self._repo.create_many(budgets)
+        await self._cache.written_many({budget.id: budget for budget in budgets})
+
+    async def get_by_id(self, budget_id: str) -> Budget | None:
+        budget = await self._cache.get(budget_id)
+        if budget is None:
+            budget = await self._repo.get_by_id(budget_id)
+            if budget is not None:
+                self._cache.put(budget_id, budget)
+        return budget
+
+    async def get_by_user_id(
+        self, user_id: str, ordering: Ordering | None = None, limit: int | None = None
+    ) -> list[Budget]:
+        query = ("user_id", user_id, ordering, limit)
+        budgets = await self._cache.get_list(query)
+        if budgets is None:
+            budgets = await self._repo.get_by_user_id(user_id, ordering, limit)
+            self._cache.put_list(query, {budget.id: budget for budget in budgets})
+        return budgets
+
+    async def get_page_by_user_id(
+        self, user_id: str, limit: int, cursor: str | None = None, ordering: Ordering | None = None
+    ) -> Page[Budget]:
+        page = await self._repo.get_page_by_user_id(user_id, limit, cursor, ordering)
+        for budget in page.items:
+            self._cache.put(budget.id, budget)
+        return page
+
+    async def update(self, budget: Budget) -> None:
+        try:
+            await self._repo.update(budget)
+        except ConcurrentUpdateError:
+            self._cache.evict(budget.id)
+            raise
+        await self._cache.written(budget.id, budget)
+
+    async def update_many(self, budgets: list[Budget]) -> None:
+        try:
+            await self._repo.update_many(budgets)
+        except ConcurrentUpdateError:
+            for budget in budgets:
+                self._cache.evict(budget.id)
+            raise
+        await self._cache.written_many({budget.id: budget for budget in budgets})
+
+    async def delete(self, budget_id: str, expected_version: int | None = None) -> bool:
+        try:
+            is_deleted = await self._repo.delete(budget_id, expected_version)
+        except ConcurrentUpdateError:
+            self._cache.evict(budget_id)
+            raise
+        await self._cache.written(budget_id, None)
+        return is_deleted
+
+    async def delete_many(self, budget_ids: list[str]) -> None:
+        await self._repo.delete_many(budget_ids)
+        await self._cache.written_many(dict.fromkeys(budget_ids))
+
+    def evict_user(self, user_id: str) -> None:
+        """Forget the cached budgets of a user who went idle; the user's next reads warm them up again."""
+        self._cache.evict_where(lambda budget: budget.user_id == user_id)
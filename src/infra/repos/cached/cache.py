@@ -0,0 +1,141 @@
+import asyncio
+import copy
+import logging
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from pathlib import Path
+
+from infra.repos.cached.channel import ChangeChannel
+
+logger = logging.getLogger(__name__)
+
+
+class EntityCache[T]:
+    """
+    LRU of decoded entities plus the id lists of recent list queries.
+
+    Entities are copied on the way in and out, so callers can mutate what they get without corrupting the cache.
+    A list query hits only while all its entities are still cached. Everything is dropped when the mtime of
+    `watch_dir` differs from the one last checked, so our own writes drop it too, but a write another process makes
+    at the same moment is never mistaken for ours. With a `channel` shared by cooperating workers, writes are
+    published under `topic` instead, and a change made by another worker evicts just the entities it touched
+    (plus the list queries, whose results it may change); `watch_dir` is not checked then.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        watch_dir: Path | None = None,
+        channel: ChangeChannel | None = None,
+        topic: str = "",
+    ) -> None:
+        self._max_size = max_size
+        self._watch_dir = watch_dir
+        self._channel = channel
+        self._topic = topic
+        self._entities: OrderedDict[str, T] = OrderedDict()
+        self._lists: OrderedDict[Hashable, list[str]] = OrderedDict()
+        self._seen_mtime_ns = _read_mtime_ns(watch_dir) if channel is None else None
+        if channel is not None:
+            channel.subscribe(topic, self._changed_elsewhere)
+
+    async def get(self, entity_id: str) -> T | None:
+        await self._validate()
+        entity = self._entities.get(entity_id)
+        if entity is None:
+            return None
+        self._entities.move_to_end(entity_id)
+        return copy.copy(entity)
+
+    async def get_many(self, entity_ids: list[str]) -> dict[str, T]:
+        """Return the cached entities among `entity_ids`, validating the cache once for the whole batch."""
+        await self._validate()
+        found = {}
+        for entity_id in entity_ids:
+            entity = self._entities.get(entity_id)
+            if entity is not None:
+                self._entities.move_to_end(entity_id)
+                found[entity_id] = copy.copy(entity)
+        return found
+
+    def put(self, entity_id: str, entity: T) -> None:
+        self._entities[entity_id] = copy.copy(entity)
+        self._entities.move_to_end(entity_id)
+        if len(self._entities) > self._max_size:
+            self._entities.popitem(last=False)
+
+    async def get_list(self, query: Hashable) -> list[T] | None:
+        await self._validate()
+        entity_ids = self._lists.get(query)
+        if entity_ids is None or any(entity_id not in self._entities for entity_id in entity_ids):
+            return None
+        self._lists.move_to_end(query)
+        return [copy.copy(self._entities[entity_id]) for entity_id in entity_ids]
+
+    def put_list(self, query: Hashable, entities: dict[str, T]) -> None:
+        for entity_id, entity in entities.items():
+            self.put(entity_id, entity)
+        self._lists[query] = list(entities)
+        self._lists.move_to_end(query)
+        if len(self._lists) > self._max_size:
+            self._lists.popitem(last=False)
+
+    async def written(self, entity_id: str, entity: T | None) -> None:
+        """Record a write that went through this cache; `None` means the entity was deleted."""
+        await self.written_many({entity_id: entity})
+
+    async def written_many(self, entities: dict[str, T | None]) -> None:
+        for entity_id, entity in entities.items():
+            if entity is None:
+                self._entities.pop(entity_id, None)
+            else:
+                self.put(entity_id, entity)
+        self._lists.clear()
+        if self._channel is not None:
+            await self._channel.publish(self._topic, list(entities))
+
+    def evict(self, entity_id: str) -> None:
+        """Drop an entity that turned out to be stale, so the next read goes to the underlying repo."""
+        self._entities.pop(entity_id, None)
+
+    def evict_where(self, predicate: Callable[[T], bool]) -> None:
+        """Drop the entities matching `predicate`, e.g. those of an idle user, and the list queries holding them."""
+        evicted = {entity_id for entity_id, entity in self._entities.items() if predicate(entity)}
+        for entity_id in evicted:
+            del self._entities[entity_id]
+        self._lists = OrderedDict(
+            (query, entity_ids) for query, entity_ids in self._lists.items() if evicted.isdisjoint(entity_ids)
+        )
+
+    def clear(self) -> None:
+        self._entities.clear()
+        self._lists.clear()
+
+    def _changed_elsewhere(self, entity_ids: list[str] | None) -> None:
+        if entity_ids is None:
+            self.clear()
+            return
+        for entity_id in entity_ids:
+            self._entities.pop(entity_id, None)
+        self._lists.clear()
+
+    async def _validate(self) -> None:
+        if self._channel is not None:
+            await self._channel.poll()
+            return
+        if self._watch_dir is None:
+            return
+        mtime_ns = await asyncio.to_thread(_read_mtime_ns, self._watch_dir)
+        if mtime_ns != self._seen_mtime_ns:
+            logger.debug("%s changed, dropping cache", self._watch_dir)
+            self.clear()
+            self._seen_mtime_ns = mtime_ns
+
+
+def _read_mtime_ns(path: Path | None) -> int | None:
+    if path is None:
+        return None
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+from domain.errors import ConcurrentUpdateError
+from domain.models.category import Category
+from domain.models.transaction import TransactionType
+from domain.repos.category import CategoryRepo
+from domain.repos.page import Page
+from infra.repos.cached.cache import EntityCache
+from infra.repos.cached.channel import ChangeChannel
+
+
+class CachedCategoryRepo(CategoryRepo):
+    def __init__(
+        self,
+        repo: CategoryRepo,
+        max_size: int = 1024,
+        watch_dir: Path | None = None,
+        channel: ChangeChannel | None = None,
+    ) -> None:
+        self._repo = repo
+        self._cache: EntityCache[Category] = EntityCache(max_size, watch_dir, channel, topic="categories")
+
+    async def create(self, category: Category) -> None:
+        await self._repo.create(category)
+        await self._cache.written(category.id, category)
+
+    async def create_many(self, categories: list[Category]) -> None:
+        await self._repo.create_many(categories)
+        await self._cache.written_many({category.id: category for category in categories})
+
+    async def get_by_id(self, category_id: str) -> Category | None:
+        category = await self._cache.get(category_id)
+        if category is None:
+            category = await self._repo.get_by_id(category_id)
+            if category is not None:
+                self._cache.put(category_id, category)
+        return category
+
+    async def get_by_user_id(self, user_id: str, transaction_type: TransactionType | None = None) -> list[Category]:
+        query = ("user_id", user_id, transaction_type)
+        categories = await self._cache.get_list(query)
+        if categories is None:
+            categories = await self._repo.get_by_user_id(user_id, transaction_type)
+            self._cache.put_list(query, {category.id: category for category in categories})
+        return categories
+
+    async def get_page_by_user_id(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: str | None = None,
+        transaction_type: TransactionType | None = None,
+    ) -> Page[Category]:
+        page = await self._repo.get_page_by_user_id(user_id, limit, cursor, transaction_type)
+        for category in page.items:
+            self._cache.put(category.id, category)
+        return page
+
+    async def update(self, category: Category) -> None:
+        try:
+            await self._repo.update(category)
+        except ConcurrentUpdateError:
+            self._cache.evict(category.id)
+            raise
+        await self._cache.written(category.id, category)
+
+    async def update_many(self, categories: list[Category]) -> None:
+        try:
+            await self._repo.update_many(categories)
+        except ConcurrentUpdateError:
+            for category in categories:
+                self._cache.evict(category.id)
+            raise
+        await self._cache.written_many({category.id: category for category in categories})
+
+    async def delete(self, category_id: str, expected_version: int | None = None) -> bool:
+        try:
+            is_deleted = await self._repo.delete(category_id, expected_version)
+        except ConcurrentUpdateError:
+            self._cache.evict(category_id)
+            raise
+        await self._cache.written(category_id, None)
+        return is_deleted
+
+    async def delete_many(self, category_ids: list[str]) -> None:
+        await self._repo.delete_many(category_ids)
+        await self._cache.written_many(dict.fromkeys(category_ids))
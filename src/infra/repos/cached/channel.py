@@ -0,0 +1,103 @@
+import asyncio
+import itertools
+import json
+import logging
+import os
+import socket
+from collections import defaultdict
+from pathlib import Path
+
+from domain.use_cases.feed import RemoteChanges, RemoteChangeSubscriber
+from domain.utils import uuid4_str
+
+logger = logging.getLogger(__name__)
+
+SOCKET_SUFFIX = ".sock"
+OVERFLOW_SUFFIX = ".overflow"
+IDS_PER_MESSAGE = 1000
+MAX_MESSAGE_BYTES = 256 * 1024
+
+
+class ChangeChannel(RemoteChanges):
+    """
+    Broadcast of entity changes between the worker processes sharing one data directory, over Unix datagram sockets.
+
+    Every worker binds a socket in `channel_dir` and sends the ids it writes to all the other sockets there, tagged
+    with a topic such as `"budgets"`. Nothing runs in the background: readers `poll` first, which drains whatever
+    has arrived in a worker thread and calls the topic's subscribers with the changed ids; `publish` sends from
+    one too. When a peer's queue is full, the sender leaves an overflow marker next to its socket instead, and the
+    peer then tells all subscribers to drop everything (`None`). Sockets of workers that died without `close` are
+    removed by the first sender they refuse. Socket paths are limited to about 100 bytes, so keep `channel_dir`
+    short, e.g. relative.
+    """
+
+    def __init__(self, channel_dir: Path) -> None:
+        channel_dir.mkdir(parents=True, exist_ok=True)
+        self._dir = channel_dir
+        self._path = channel_dir / f"{os.getpid()}-{uuid4_str()[:8]}{SOCKET_SUFFIX}"
+        self._overflow_path = self._path.with_suffix(OVERFLOW_SUFFIX)
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._socket.bind(str(self._path))
+        self._socket.settimeout(0)
+        self._subscribers: defaultdict[str, list[RemoteChangeSubscriber]] = defaultdict(list)
+
+    def subscribe(self, topic: str, callback: RemoteChangeSubscriber) -> None:
+        self._subscribers[topic].append(callback)
+
+    async def publish(self, topic: str, entity_ids: list[str]) -> None:
+        """Tell the other workers that `entity_ids` changed."""
+        if entity_ids:
+            await asyncio.to_thread(self._publish, topic, entity_ids)
+
+    async def poll(self) -> None:
+        """Deliver the changes other workers have published since the last poll."""
+        messages = await asyncio.to_thread(self._drain)
+        if messages is None:
+            logger.warning("Missed changes from other workers, dropping all cached entities")
+            for callbacks in self._subscribers.values():
+                for callback in callbacks:
+                    callback(None)
+            return
+        for message in messages:
+            for callback in self._subscribers[message["topic"]]:
+                callback(message["ids"])
+
+    def close(self) -> None:
+        self._socket.close()
+        self._path.unlink(missing_ok=True)
+        self._overflow_path.unlink(missing_ok=True)
+
+    def _publish(self, topic: str, entity_ids: list[str]) -> None:
+        peers = [path for path in self._dir.glob(f"*{SOCKET_SUFFIX}") if path != self._path]
+        if not peers:
+            return
+        for batch in itertools.batched(entity_ids, IDS_PER_MESSAGE):  # noqa: B911 - the last batch may be short
+            message = json.dumps({"topic": topic, "ids": batch}).encode()
+            for peer in peers:
+                self._send(peer, message)
+
+    def _send(self, peer: Path, message: bytes) -> None:
+        try:
+            self._socket.sendto(message, str(peer))
+        except (ConnectionRefusedError, FileNotFoundError):
+            logger.info("Removing socket %s of a stopped worker", peer)
+            peer.unlink(missing_ok=True)
+            peer.with_suffix(OVERFLOW_SUFFIX).unlink(missing_ok=True)
+        except BlockingIOError:
+            peer.with_suffix(OVERFLOW_SUFFIX).touch()
+
+    def _drain(self) -> list[dict] | None:
+        """Receive every queued message, or None if some were lost to an overflow and the rest are of no use."""
+        is_overflowed = self._overflow_path.exists()
+        if is_overflowed:
+            self._overflow_path.unlink(missing_ok=True)
+        messages = []
+        while (message := self._receive()) is not None:
+            messages.append(message)
+        return None if is_overflowed else messages
+
+    def _receive(self) -> dict | None:
+        try:
+            return json.loads(self._socket.recv(MAX_MESSAGE_BYTES))
+        except BlockingIOError:
+            return None
@@ -0,0 +1,117 @@
+from collections.abc import Mapping
+from datetime import datetime
+from pathlib import Path
+
+from domain.errors import ConcurrentUpdateError
+from domain.models.transaction import Transaction
+from domain.repos.page import Page
+from domain.repos.transaction import TransactionRepo
+from infra.repos.cached.cache import EntityCache
+from infra.repos.cached.channel import ChangeChannel
+
+
+class CachedTransactionRepo(TransactionRepo):
+    def __init__(
+        self,
+        repo: TransactionRepo,
+        max_size: int = 4096,
+        watch_dir: Path | None = None,
+        channel: ChangeChannel | None = None,
+    ) -> None:
+        self._repo = repo
+        self._cache: EntityCache[Transaction] = EntityCache(max_size, watch_dir, channel, topic="transactions")
+
+    async def create(self, transaction: Transaction) -> None:
+        await self._repo.create(transaction)
+        await self._cache.written(transaction.id, transaction)
+
+    async def create_many(self, transactions: list[Transaction]) -> None:
+        await self._repo.create_many(transactions)
+        await self._cache.written_many({transaction.id: transaction for transaction in transactions})
+
+    async def get_by_id(self, transaction_id: str) -> Transaction | None:
+        transaction = await self._cache.get(transaction_id)
+        if transaction is None:
+            transaction = await self._repo.get_by_id(transaction_id)
+            if transaction is not None:
+                self._cache.put(transaction_id, transaction)
+        return transaction
+
+    async def get_by_ids(self, transaction_ids: list[str]) -> list[Transaction]:
+        cached = await self._cache.get_many(transaction_ids)
+        missed_ids = [transaction_id for transaction_id in transaction_ids if transaction_id not in cached]
+        loaded = await self._repo.get_by_ids(missed_ids) if missed_ids else []
+        for transaction in loaded:
+            self._cache.put(transaction.id, transaction)
+        return [*cached.values(), *loaded]
+
+    async def get_by_user_id(self, user_id: str) -> list[Transaction]:
+        query = ("user_id", user_id)
+        transactions = await self._cache.get_list(query)
+        if transactions is None:
+            transactions = await self._repo.get_by_user_id(user_id)
+            self._cache.put_list(query, {transaction.id: transaction for transaction in transactions})
+        return transactions
+
+    async def get_by_budget_id(self, budget_id: str) -> list[Transaction]:
+        query = ("budget_id", budget_id)
+        transactions = await self._cache.get_list(query)
+        if transactions is None:
+            transactions = await self._repo.get_by_budget_id(budget_id)
+            self._cache.put_list(query, {transaction.id: transaction for transaction in transactions})
+        return transactions
+
+    async def get_by_date_range(
+        self, user_id: str, start: datetime, end: datetime, budget_id: str | None = None
+    ) -> list[Transaction]:
+        transactions = await self._repo.get_by_date_range(user_id, start, end, budget_id)
+        for transaction in transactions:
+            self._cache.put(transaction.id, transaction)
+        return transactions
+
+    async def get_page_by_user_id(self, user_id: str, limit: int, cursor: str | None = None) -> Page[Transaction]:
+        page = await self._repo.get_page_by_user_id(user_id, limit, cursor)
+        for transaction in page.items:
+            self._cache.put(transaction.id, transaction)
+        return page
+
+    async def get_page_by_budget_id(self, budget_id: str, limit: int, cursor: str | None = None) -> Page[Transaction]:
+        page = await self._repo.get_page_by_budget_id(budget_id, limit, cursor)
+        for transaction in page.items:
+            self._cache.put(transaction.id, transaction)
+        return page
+
+    async def update(self, transaction: Transaction) -> None:
+        try:
+            await self._repo.update(transaction)
+        except ConcurrentUpdateError:
+            self._cache.evict(transaction.id)
+            raise
+        await self._cache.written(transaction.id, transaction)
+
+    async def update_many(self, transactions: list[Transaction]) -> None:
+        try:
+            await self._repo.update_many(transactions)
+        except ConcurrentUpdateError:
+            for transaction in transactions:
+                self._cache.evict(transaction.id)
+            raise
+        await self._cache.written_many({transaction.id: transaction for transaction in transactions})
+
+    async def delete(self, transaction_id: str, expected_version: int | None = None) -> bool:
+        try:
+            is_deleted = await self._repo.delete(transaction_id, expected_version)
+        except ConcurrentUpdateError:
+            self._cache.evict(transaction_id)
+            raise
+        await self._cache.written(transaction_id, None)
+        return is_deleted
+
+    async def delete_many(self, transaction_ids: list[str], expected_versions: Mapping[str, int] | None = None) -> None:
+        try:
+            await self._repo.delete_many(transaction_ids, expected_versions)
+        except ConcurrentUpdateError:
+            for transaction_id in transaction_ids:
+                self._cache.evict(transaction_id)
+            raise
+        await self._cache.written_many(dict.fromkeys(transaction_ids))
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import shutil
+from collections import defaultdict
+from dataclasses import asdict
+from pathlib import Path
+
+from domain.models.aggregate import TransactionAggregate, merge_delta
+from domain.repos.aggregate import AggregateRepo
+from infra.repos.file.commit import Durability, FileCommitter
+from infra.repos.file.locks import LOCK_DIR_NAME, LockManager
+from infra.repos.file.paths import child_path, replace_dir
+from infra.repos.file.serializers import (
+    Codec,
+    aggregate_from_dict,
+    load_from_file,
+    load_many_from_files,
+    save_to_file,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AggregateFileRepo(AggregateRepo):
+    """
+    Stores the aggregates of each user and month in one small file, `<base_dir>/<user_id>/<month>.json`.
+
+    A monthly report therefore reads a single file, and a transaction write rewrites only the month it falls into.
+    Writers hold the stripe of the user in a `LockManager`; with `inter_process_locks` these are file locks that
+    also serialize other processes. A replacement is written to a directory of its own and swapped in with
+    `replace_dir`, so the old aggregates stay until the new ones are complete.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path = Path("data/aggregates"),
+        durability: Durability = Durability.NONE,
+        codec: Codec = Codec.PRETTY_JSON,
+        *,
+        inter_process_locks: bool = False,
+    ) -> None:
+        self._base_dir = base_dir
+        self._base_dir.mkdir(parents=True, exist_ok=True)
+        self._committer = FileCommitter(durability)
+        self._codec = codec
+        self._locks = LockManager(lock_dir=base_dir / LOCK_DIR_NAME if inter_process_locks else None)
+
+    def _file_path(self, user_id: str, month: str) -> Path:
+        return child_path(child_path(self._base_dir, user_id), f"{month}.json")
+
+    async def add(self, deltas: list[TransactionAggregate]) -> None:
+        grouped: defaultdict[tuple[str, str], list[TransactionAggregate]] = defaultdict(list)
+        for delta in deltas:
+            grouped[delta.user_id, delta.month].append(delta)
+        async with self._locks.hold(*{user_id for user_id, _ in grouped}):
+            for (user_id, month), month_deltas in grouped.items():
+                path = self._file_path(user_id, month)
+                aggregates = {aggregate.key: aggregate for aggregate in await self._load(path)}
+                for delta in month_deltas:
+                    merge_delta(aggregates, delta)
+                await self._save(path, [aggregate for aggregate in aggregates.values() if aggregate.count > 0])
+        logger.debug("Applied %d aggregate deltas", len(deltas))
+
+    async def get_by_user_id(self, user_id: str, month: str | None = None) -> list[TransactionAggregate]:
+        if month is not None:
+            return await self._load(self._file_path(user_id, month))
+        user_dir = child_path(self._base_dir, user_id)
+        paths = sorted(await asyncio.to_thread(lambda: list(user_dir.glob("*.json"))))
+        records = await load_many_from_files(paths)
+        return [aggregate_from_dict(row) for data in records if data is not None for row in data["aggregates"]]
+
+    async def replace_by_user_id(self, user_id: str, aggregates: list[TransactionAggregate]) -> None:
+        grouped: defaultdict[str, list[TransactionAggregate]] = defaultdict(list)
+        for aggregate in aggregates:
+            grouped[aggregate.month].append(aggregate)
+        user_dir = child_path(self._base_dir, user_id)
+        tmp_dir = child_path(self._base_dir, f".{user_id}.tmp")
+        async with self._locks.hold(user_id):
+            await asyncio.to_thread(shutil.rmtree, tmp_dir, ignore_errors=True)
+            await asyncio.to_thread(tmp_dir.mkdir)
+            for month, month_aggregates in grouped.items():
+                await self._save(tmp_dir / f"{month}.json", month_aggregates)
+            await asyncio.to_thread(replace_dir, tmp_dir, user_dir)
+        logger.info("Replaced aggregates of user %s: %d months", user_id, len(grouped))
+
+    async def _load(self, path: Path) -> list[TransactionAggregate]:
+        data = await load_from_file(path)
+        return [aggregate_from_dict(row) for row in data["aggregates"]] if data else []
+
+    async def _save(self, path: Path, aggregates: list[TransactionAggregate]) -> None:
+        if not aggregates:
+            await asyncio.to_thread(path.unlink, missing_ok=True)
+            return
+        await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+        data = {"aggregates": [asdict(aggregate) for aggregate in aggregates]}
+        await save_to_file(path, data, self._committer, self._codec)
@@ -1,65 +1,197 @@
 import logging
 from dataclasses import asdict
-from datetime import datetime
-from decimal import Decimal
 from pathlib import Path
-from typing import Any
 
-from domain.errors import BudgetNotFoundError
+from domain.errors import BudgetNotFoundError, ConcurrentUpdateError
 from domain.models.budget import Budget
 from domain.repos.budget import BudgetRepo
+from domain.repos.ordering import Ordering
+from domain.repos.page import Page
 from domain.utils import utc_now
-from infra.repos.file.serializers import load_from_file, save_to_file
+from infra.repos.file.commit import Durability, FileCommitter
+from infra.repos.file.index import FileIndex
+from infra.repos.file.locks import LOCK_DIR_NAME, LockManager, LockStats
+from infra.repos.file.paths import child_path
+from infra.repos.file.serializers import (
+    Codec,
+    budget_from_dict,
+    delete_files,
+    load_many_from_files,
+    save_many_to_files,
+    save_to_file,
+)
+from infra.repos.file.stamps import StampCache, load_stamped_from_file
 
 logger = logging.getLogger(__name__)
 
 
 class BudgetFileRepo(BudgetRepo):
-    def __init__(self, base_dir: Path = Path("data/budgets")) -> None:
+    def __init__(
+        self,
+        base_dir: Path = Path("data/budgets"),
+        durability: Durability = Durability.NONE,
+        codec: Codec = Codec.PRETTY_JSON,
+        *,
+        inter_process_locks: bool = False,
+    ) -> None:
         self._base_dir = base_dir
         self._base_dir.mkdir(parents=True, exist_ok=True)
+        self._committer = FileCommitter(durability)
+        self._codec = codec
+        self._locks = LockManager(lock_dir=base_dir / LOCK_DIR_NAME if inter_process_locks else None)
+        self._stamps: StampCache[Budget] = StampCache()
+        self._user_index = FileIndex(
+            base_dir,
+            field="user_id",
+            committer=self._committer,
+            codec=self._codec,
+            inter_process_locks=inter_process_locks,
+        )
+        self._user_created_index = FileIndex(
+            base_dir,
+            field="user_id",
+            committer=self._committer,
+            codec=self._codec,
+            order_field="created_at",
+            inter_process_locks=inter_process_locks,
+        )
 
-    def _file_path(self, budget_id: str) -> Path:
-        return self._base_dir / f"{budget_id}.json"
+    @property
+    def lock_stats(self) -> LockStats:
+        return self._locks.stats
 
-    @staticmethod
-    def _from_dict(data: dict[str, Any]) -> Budget:
-        # Convert string fields back to proper types
-        data["balance"] = Decimal(data["balance"])
-        data["created_at"] = datetime.fromisoformat(data["created_at"])
-        data["updated_at"] = datetime.fromisoformat(data["updated_at"])
-        return Budget(**data)
+    def _file_path(self, budget_id: str) -> Path:
+        return child_path(self._base_dir, f"{budget_id}.json")
 
     async def create(self, budget: Budget) -> None:
-        path = self._file_path(budget.id)
-        await save_to_file(path, asdict(budget))
+        await self._user_index.add(budget.user_id, budget.id)
+        await self._user_created_index.add(budget.user_id, budget.id, budget.created_at)
+        await save_to_file(self._file_path(budget.id), asdict(budget), self._committer, self._codec)
         logger.debug("Created budget %s", budget.id)
 
+    async def create_many(self, budgets: list[Budget]) -> None:
+        await self._add_many_to_indexes(budgets)
+        await self._save_many(budgets)
+        logger.debug("Created %d budgets", len(budgets))
+
     async def get_by_id(self, budget_id: str) -> Budget | None:
-        data = await load_from_file(self._file_path(budget_id))
-        if data is None:
+        budget = await self._stamps.recall(budget_id, self._file_path(budget_id))
+        return budget if budget is not None else await self._read(budget_id)
+
+    async def _read(self, budget_id: str) -> Budget | None:
+        """Read the budget from its file, as writers holding its lock must, since a remembered one may be stale."""
+        stamped = await load_stamped_from_file(self._file_path(budget_id))
+        if stamped is None:
             return None
-        return self._from_dict(data)
+        data, stamp = stamped
+        budget = budget_from_dict(data)
+        self._stamps.remember(budget_id, stamp, budget)
+        return budget
+
+    async def get_by_user_id(
+        self, user_id: str, ordering: Ordering | None = None, limit: int | None = None
+    ) -> list[Budget]:
+        if ordering is None:
+            budget_ids = await self._user_index.get(user_id)
+        else:
+            budget_ids = await self._user_created_index.get(user_id)
+            if ordering is Ordering.NEWEST_FIRST:
+                budget_ids.reverse()
+        return await self._get_many(budget_ids[:limit])
+
+    async def get_page_by_user_id(
+        self, user_id: str, limit: int, cursor: str | None = None, ordering: Ordering | None = None
+    ) -> Page[Budget]:
+        if ordering is None:
+            budget_ids, next_cursor = await self._user_index.get_page(user_id, limit, cursor)
+        else:
+            budget_ids, next_cursor = await self._user_created_index.get_page(
+                user_id, limit, cursor, descending=ordering is Ordering.NEWEST_FIRST
+            )
+        return Page(await self._get_many(budget_ids), next_cursor)
+
+    async def _get_many(self, budget_ids: list[str]) -> list[Budget]:
+        records = await load_many_from_files(self._file_path(budget_id) for budget_id in budget_ids)
+        return [budget_from_dict(data) for data in records if data is not None]
 
-    async def get_by_user_id(self, user_id: str) -> list[Budget]:
+    async def _get_existing(self, budget_ids: list[str]) -> list[Budget]:
+        records = await load_many_from_files(self._file_path(budget_id) for budget_id in budget_ids)
         budgets = []
-        for path in self._base_dir.glob("*.json"):
-            data = await load_from_file(path)
-            if data and data.get("user_id") == user_id:
-                budgets.append(self._from_dict(data))
+        for budget_id, data in zip(budget_ids, records, strict=True):
+            if data is None:
+                raise BudgetNotFoundError(budget_id=budget_id)
+            budgets.append(budget_from_dict(data))
         return budgets
 
+    async def _add_many_to_indexes(self, budgets: list[Budget]) -> None:
+        entries = [(budget.user_id, budget.id, budget.created_at) for budget in budgets]
+        await self._user_index.add_many(entries)
+        await self._user_created_index.add_many(entries)
+
+    async def _remove_stale_from_indexes(self, replaced: list[tuple[Budget, Budget | None]]) -> None:
+        """Remove the entries of each old budget that its replacement, None when deleted, no longer has."""
+        await self._user_index.remove_many(
+            [(old.user_id, old.id, None) for old, new in replaced if new is None or new.user_id != old.user_id]
+        )
+        await self._user_created_index.remove_many(
+            [
+                (old.user_id, old.id, old.created_at)
+                for old, new in replaced
+                if new is None or (new.user_id, new.created_at) != (old.user_id, old.created_at)
+            ]
+        )
+
+    async def _save_many(self, budgets: list[Budget]) -> None:
+        records = [(self._file_path(budget.id), asdict(budget)) for budget in budgets]
+        await save_many_to_files(records, self._committer, self._codec)
+
     async def update(self, budget: Budget) -> None:
-        existing = await self.get_by_id(budget.id)
-        if existing is None:
-            raise BudgetNotFoundError(budget_id=budget.id)
-        budget.updated_at = utc_now()
-        await save_to_file(self._file_path(budget.id), asdict(budget))
-        logger.debug("Updated budget %s", budget.id)
-
-    async def delete(self, budget_id: str) -> None:
-        path = self._file_path(budget_id)
-        if not path.exists():
-            raise BudgetNotFoundError(budget_id=budget_id)
-        path.unlink()
-        logger.debug("Deleted budget %s", budget_id)
+        async with self._locks.hold(budget.id):
+            existing = await self._read(budget.id)
+            if existing is None:
+                raise BudgetNotFoundError(budget_id=budget.id)
+            if existing.version != budget.version:
+                raise ConcurrentUpdateError(budget.id)
+            budget.updated_at = utc_now()
+            budget.version += 1
+            await self._user_index.add(budget.user_id, budget.id)
+            await self._user_created_index.add(budget.user_id, budget.id, budget.created_at)
+            await save_to_file(self._file_path(budget.id), asdict(budget), self._committer, self._codec)
+            await self._remove_stale_from_indexes([(existing, budget)])
+            logger.debug("Updated budget %s", budget.id)
+
+    async def update_many(self, budgets: list[Budget]) -> None:
+        async with self._locks.hold(*(budget.id for budget in budgets)):
+            existing = await self._get_existing([budget.id for budget in budgets])
+            self._stamps.forget(*(budget.id for budget in budgets))
+            for old, budget in zip(existing, budgets, strict=True):
+                if old.version != budget.version:
+                    raise ConcurrentUpdateError(budget.id)
+            updated_at = utc_now()
+            for budget in budgets:
+                budget.updated_at = updated_at
+                budget.version += 1
+            await self._add_many_to_indexes(budgets)
+            await self._save_many(budgets)
+            await self._remove_stale_from_indexes(list(zip(existing, budgets, strict=True)))
+            logger.debug("Updated %d budgets", len(budgets))
+
+    async def delete(self, budget_id: str, expected_version: int | None = None) -> bool:
+        async with self._locks.hold(budget_id):
+            existing = await self._read(budget_id)
+            if existing is None:
+                return False
+            if expected_version is not None and existing.version != expected_version:
+                raise ConcurrentUpdateError(budget_id)
+            self._file_path(budget_id).unlink()
+            await self._remove_stale_from_indexes([(existing, None)])
+            logger.debug("Deleted budget %s", budget_id)
+            return True
+
+    async def delete_many(self, budget_ids: list[str]) -> None:
+        async with self._locks.hold(*budget_ids):
+            existing = await self._get_existing(budget_ids)
+            self._stamps.forget(*budget_ids)
+            await delete_files([self._file_path(budget_id) for budget_id in budget_ids])
+            await self._remove_stale_from_indexes([(budget, None) for budget in existing])
+            logger.debug("Deleted %d budgets", len(budget_ids))
@@ -1,67 +1,178 @@
 import logging
 from dataclasses import asdict
-from datetime import datetime
 from pathlib import Path
-from typing import Any
 
-from domain.errors import CategoryNotFoundError
+from domain.errors import CategoryNotFoundError, ConcurrentUpdateError
 from domain.models.category import Category
 from domain.models.transaction import TransactionType
 from domain.repos.category import CategoryRepo
+from domain.repos.page import Page
 from domain.utils import utc_now
-from infra.repos.file.serializers import load_from_file, save_to_file
+from infra.repos.file.commit import Durability, FileCommitter
+from infra.repos.file.index import FileIndex
+from infra.repos.file.locks import LOCK_DIR_NAME, LockManager, LockStats
+from infra.repos.file.paths import child_path
+from infra.repos.file.serializers import (
+    Codec,
+    category_from_dict,
+    delete_files,
+    load_many_from_files,
+    save_many_to_files,
+    save_to_file,
+)
+from infra.repos.file.stamps import StampCache, load_stamped_from_file
 
 logger = logging.getLogger(__name__)
 
 
 class CategoryFileRepo(CategoryRepo):
-    def __init__(self, base_dir: Path = Path("data/categories")) -> None:
+    def __init__(
+        self,
+        base_dir: Path = Path("data/categories"),
+        durability: Durability = Durability.NONE,
+        codec: Codec = Codec.PRETTY_JSON,
+        *,
+        inter_process_locks: bool = False,
+    ) -> None:
         self._base_dir = base_dir
         self._base_dir.mkdir(parents=True, exist_ok=True)
+        self._committer = FileCommitter(durability)
+        self._codec = codec
+        self._locks = LockManager(lock_dir=base_dir / LOCK_DIR_NAME if inter_process_locks else None)
+        self._stamps: StampCache[Category] = StampCache()
+        self._user_index = FileIndex(
+            base_dir,
+            field="user_id",
+            committer=self._committer,
+            codec=self._codec,
+            inter_process_locks=inter_process_locks,
+        )
 
-    def _file_path(self, category_id: str) -> Path:
-        return self._base_dir / f"{category_id}.json"
+    @property
+    def lock_stats(self) -> LockStats:
+        return self._locks.stats
 
-    @staticmethod
-    def _from_dict(data: dict[str, Any]) -> Category:
-        # Convert string fields back to proper types
-        if data.get("transaction_type") is not None:
-            data["transaction_type"] = TransactionType(data["transaction_type"])
-        data["created_at"] = datetime.fromisoformat(data["created_at"])
-        data["updated_at"] = datetime.fromisoformat(data["updated_at"])
-        return Category(**data)
+    def _file_path(self, category_id: str) -> Path:
+        return child_path(self._base_dir, f"{category_id}.json")
 
     async def create(self, category: Category) -> None:
-        path = self._file_path(category.id)
-        await save_to_file(path, asdict(category))
+        await self._user_index.add(category.user_id, category.id)
+        await save_to_file(self._file_path(category.id), asdict(category), self._committer, self._codec)
         logger.debug("Created category %s", category.id)
 
+    async def create_many(self, categories: list[Category]) -> None:
+        await self._user_index.add_many([(category.user_id, category.id, None) for category in categories])
+        await self._save_many(categories)
+        logger.debug("Created %d categories", len(categories))
+
     async def get_by_id(self, category_id: str) -> Category | None:
-        data = await load_from_file(self._file_path(category_id))
-        return self._from_dict(data) if data else None
+        category = await self._stamps.recall(category_id, self._file_path(category_id))
+        return category if category is not None else await self._read(category_id)
+
+    async def _read(self, category_id: str) -> Category | None:
+        """Read the category from its file, as writers holding its lock must, since a remembered one may be stale."""
+        stamped = await load_stamped_from_file(self._file_path(category_id))
+        if stamped is None:
+            return None
+        data, stamp = stamped
+        category = category_from_dict(data)
+        self._stamps.remember(category_id, stamp, category)
+        return category
 
     async def get_by_user_id(self, user_id: str, transaction_type: TransactionType | None = None) -> list[Category]:
-        result = []
-        for path in self._base_dir.glob("*.json"):
-            data = await load_from_file(path)
-            if not data or data.get("user_id") != user_id:
-                continue
-            if transaction_type is not None and data.get("transaction_type") != transaction_type.value:
-                continue
-            result.append(self._from_dict(data))
-        return result
+        return await self._get_many(await self._user_index.get(user_id), transaction_type)
+
+    async def get_page_by_user_id(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: str | None = None,
+        transaction_type: TransactionType | None = None,
+    ) -> Page[Category]:
+        page = Page[Category](next_cursor=cursor)
+        # The type is not indexed, so keep reading until the filtered page is full or the ids run out
+        while True:
+            page_ids, page.next_cursor = await self._user_index.get_page(
+                user_id, limit - len(page.items), page.next_cursor
+            )
+            page.items += await self._get_many(page_ids, transaction_type)
+            if len(page.items) >= limit or page.next_cursor is None:
+                return page
+
+    async def _get_many(self, category_ids: list[str], transaction_type: TransactionType | None) -> list[Category]:
+        records = await load_many_from_files(self._file_path(category_id) for category_id in category_ids)
+        return [
+            category_from_dict(data)
+            for data in records
+            if data is not None and (transaction_type is None or data.get("transaction_type") == transaction_type)
+        ]
+
+    async def _get_existing(self, category_ids: list[str]) -> list[Category]:
+        records = await load_many_from_files(self._file_path(category_id) for category_id in category_ids)
+        categories = []
+        for category_id, data in zip(category_ids, records, strict=True):
+            if data is None:
+                raise CategoryNotFoundError(category_id)
+            categories.append(category_from_dict(data))
+        return categories
+
+    async def _save_many(self, categories: list[Category]) -> None:
+        records = [(self._file_path(category.id), asdict(category)) for category in categories]
+        await save_many_to_files(records, self._committer, self._codec)
 
     async def update(self, category: Category) -> None:
-        existing = await self.get_by_id(category.id)
-        if existing is None:
-            raise CategoryNotFoundError(category.id)
-        category.updated_at = utc_now()
-        await save_to_file(self._file_path(category.id), asdict(category))
-        logger.debug("Updated category %s", category.id)
-
-    async def delete(self, category_id: str) -> None:
-        path = self._file_path(category_id)
-        if not path.exists():
-            raise CategoryNotFoundError(category_id)
-        path.unlink()
-        logger.debug("Deleted category %s", category_id)
+        async with self._locks.hold(category.id):
+            existing = await self._read(category.id)
+            if existing is None:
+                raise CategoryNotFoundError(category.id)
+            if existing.version != category.version:
+                raise ConcurrentUpdateError(category.id)
+            category.updated_at = utc_now()
+            category.version += 1
+            await self._user_index.add(category.user_id, category.id)
+            await save_to_file(self._file_path(category.id), asdict(category), self._committer, self._codec)
+            if existing.user_id != category.user_id:
+                await self._user_index.remove(existing.user_id, category.id)
+            logger.debug("Updated category %s", category.id)
+
+    async def update_many(self, categories: list[Category]) -> None:
+        async with self._locks.hold(*(category.id for category in categories)):
+            existing = await self._get_existing([category.id for category in categories])
+            self._stamps.forget(*(category.id for category in categories))
+            for old, category in zip(existing, categories, strict=True):
+                if old.version != category.version:
+                    raise ConcurrentUpdateError(category.id)
+            updated_at = utc_now()
+            for category in categories:
+                category.updated_at = updated_at
+                category.version += 1
+            await self._user_index.add_many([(category.user_id, category.id, None) for category in categories])
+            await self._save_many(categories)
+            await self._user_index.remove_many(
+                [
+                    (old.user_id, old.id, None)
+                    for old, category in zip(existing, categories, strict=True)
+                    if old.user_id != category.user_id
+                ]
+            )
+            logger.debug("Updated %d categories", len(categories))
+
+    async def delete(self, category_id: str, expected_version: int | None = None) -> bool:
+        async with self._locks.hold(category_id):
+            existing = await self._read(category_id)
+            if existing is None:
+                return False
+            if expected_version is not None and existing.version != expected_version:
+                raise ConcurrentUpdateError(category_id)
+            self._file_path(category_id).unlink()
+            await self._user_index.remove(existing.user_id, category_id)
+            logger.debug("Deleted category %s", category_id)
+            return True
+
+    async def delete_many(self, category_ids: list[str]) -> None:
+        async with self._locks.hold(*category_ids):
+            existing = await self._get_existing(category_ids)
+            self._stamps.forget(*category_ids)
+            await delete_files([self._file_path(category_id) for category_id in category_ids])
+            await self._user_index.remove_many([(category.user_id, category.id, None) for category in existing])
+            logger.debug("Deleted %d categories", len(category_ids))
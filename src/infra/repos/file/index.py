@@ -0,0 +1,308 @@
+import asyncio
+import bisect
+import logging
+import shutil
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from domain.repos.page import keyset_cursor, parse_keyset_cursor
+from domain.utils import uuid4_str
+from infra.repos.file.commit import FileCommitter
+from infra.repos.file.locks import LOCK_DIR_NAME, LockManager
+from infra.repos.file.paths import child_path, replace_dir
+from infra.repos.file.serializers import (
+    Codec,
+    delete_files,
+    load_from_file,
+    load_many_from_files,
+    save_many_to_files,
+    save_to_file,
+    to_primitive,
+)
+
+logger = logging.getLogger(__name__)
+
+INDEX_DIR_NAME = "_index"
+CHUNK_SIZE = 512
+_HEAD_NAME = "head"
+
+type _Entry = tuple[Any, ...]
+
+
+@dataclass(slots=True)
+class _Chunk:
+    name: str
+    first: _Entry
+    size: int
+
+
+class FileIndex:
+    """
+    Persisted secondary index over a directory of JSON records: `field` value -> sorted ids of the records holding it.
+
+    Ids are sorted by themselves, or by `(order_field value, id)` when `order_field` is given, in which case the
+    order values are stored next to the ids and callers pass them to `add` and `remove`. Order values compare in
+    their encoded form, so datetimes must share one UTC offset to sort chronologically.
+
+    Every key has its own directory of sorted chunks of at most `CHUNK_SIZE` entries, plus a head file listing
+    each chunk's name, size and first entry. A range or page lookup reads the head and only the chunks it
+    overlaps, and an update rewrites one chunk and the head, so their cost does not grow with the key's size.
+    Chunks are copy-on-write: new chunks are written before the head that points at them, and replaced chunks are
+    deleted after it, so a reader that loses that race simply reads the head again.
+
+    A missing index (e.g. for data written before indexing existed) is rebuilt from the records on first use;
+    delete the index directory to force a rebuild. The rebuild is written to a temporary directory of its own and
+    renamed into place.
+
+    Writers of a key hold its stripe of a `LockManager` from reading the head to writing it back, and a rebuild
+    holds every stripe; with `inter_process_locks` these are file locks that also shut out other processes.
+
+    Callers add an id before writing the record and remove it after deleting the record, so a crash can only
+    leave dangling ids behind, and readers must skip ids whose record no longer exists.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        records_dir: Path,
+        field: str,
+        committer: FileCommitter | None = None,
+        codec: Codec = Codec.PRETTY_JSON,
+        order_field: str | None = None,
+        *,
+        inter_process_locks: bool = False,
+    ) -> None:
+        self._records_dir = records_dir
+        self._field = field
+        self._committer = committer
+        self._codec = codec
+        self._order_field = order_field
+        self._index_dir = records_dir / INDEX_DIR_NAME / (field if order_field is None else f"{field}-by-{order_field}")
+        lock_dir = records_dir / LOCK_DIR_NAME / INDEX_DIR_NAME / self._index_dir.name
+        self._locks = LockManager(lock_dir=lock_dir if inter_process_locks else None)
+        self._is_ready = False
+
+    def _key_dir(self, key: str, index_dir: Path | None = None) -> Path:
+        return child_path(index_dir or self._index_dir, key)
+
+    async def get(self, key: str) -> list[str]:
+        """Ids of the records with `field == key` in ascending index order."""
+        await self._ensure_ready()
+        return [entry[-1] for entry in await self._read(key, lambda chunks: chunks)]
+
+    async def get_range(self, key: str, start: Any, end: Any) -> list[str]:
+        """Ids of the records with `field == key` and an `order_field` value within `[start, end)`, in order."""
+        await self._ensure_ready()
+        low_entry, high_entry = (to_primitive(start),), (to_primitive(end),)
+
+        def overlapping(chunks: list[_Chunk]) -> list[_Chunk]:
+            firsts = [chunk.first for chunk in chunks]
+            return chunks[_position(firsts, low_entry) : bisect.bisect_left(firsts, high_entry)]
+
+        entries = await self._read(key, overlapping)
+        low = bisect.bisect_left(entries, low_entry)
+        high = bisect.bisect_left(entries, high_entry, lo=low)
+        return [entry[-1] for entry in entries[low:high]]
+
+    async def get_page(
+        self, key: str, limit: int, cursor: str | None = None, *, descending: bool = False
+    ) -> tuple[list[str], str | None]:
+        """
+        Up to `limit` ids with `field == key` following `cursor` in index order, or preceding it if `descending`.
+
+        Cursors are ids, like `slice_page` over `get(key)`, or `keyset_cursor`s for indexes with `order_field`.
+        """
+        await self._ensure_ready()
+        after = None if cursor is None else self._cursor_entry(cursor)
+
+        def following(chunks: list[_Chunk]) -> list[_Chunk]:
+            position = 0 if after is None else _position([chunk.first for chunk in chunks], after)
+            if descending:
+                high = len(chunks) if after is None else position + 1
+                low, needed = max(high - 1, 0), limit + 1
+                while low > 0 and needed > 0:
+                    low -= 1
+                    needed -= chunks[low].size
+                return chunks[low:high]
+            high, needed = position + 1, limit + 1
+            while high < len(chunks) and needed > 0:
+                needed -= chunks[high].size
+                high += 1
+            return chunks[position:high]
+
+        entries = await self._read(key, following)
+        if descending:
+            entries = entries[: len(entries) if after is None else bisect.bisect_left(entries, after)][::-1]
+        elif after is not None:
+            entries = entries[bisect.bisect_right(entries, after) :]
+        page = entries[:limit]
+        return [entry[-1] for entry in page], self._cursor(page[-1]) if len(entries) > limit else None
+
+    async def add(self, key: str, record_id: str, order_value: Any = None) -> None:
+        await self.add_many([(key, record_id, order_value)])
+
+    async def add_many(self, additions: list[tuple[str, str, Any]]) -> None:
+        """Add `(key, record_id, order_value)` triples, rewriting each touched chunk and head only once."""
+        await self._update(additions, [])
+
+    async def remove(self, key: str, record_id: str, order_value: Any = None) -> None:
+        await self.remove_many([(key, record_id, order_value)])
+
+    async def remove_many(self, removals: list[tuple[str, str, Any]]) -> None:
+        """Remove `(key, record_id, order_value)` triples, rewriting each touched chunk and head only once."""
+        await self._update([], removals)
+
+    async def rebuild(self) -> None:
+        async with self._locks.hold_all():
+            await self._rebuild()
+            self._is_ready = True
+
+    def _entry(self, record_id: str, order_value: Any) -> _Entry:
+        return (record_id,) if self._order_field is None else (to_primitive(order_value), record_id)
+
+    def _cursor(self, entry: _Entry) -> str:
+        return entry[-1] if self._order_field is None else keyset_cursor(*entry)
+
+    def _cursor_entry(self, cursor: str) -> _Entry:
+        return (cursor,) if self._order_field is None else parse_keyset_cursor(cursor)
+
+    async def _read(self, key: str, select: Callable[[list[_Chunk]], list[_Chunk]]) -> list[_Entry]:
+        key_dir = self._key_dir(key)
+        previous = None
+        while True:
+            chunks = select(await self._read_head(key_dir))
+            records = await load_many_from_files(key_dir / f"{chunk.name}.json" for chunk in chunks)
+            # A chunk vanishes when a writer replaces it after we read the head; a head that still lists it is broken
+            if all(data is not None for data in records) or chunks == previous:
+                return [entry for data in records for entry in self._decode(data)]
+            previous = chunks
+
+    async def _read_head(self, key_dir: Path) -> list[_Chunk]:
+        data = await load_from_file(key_dir / f"{_HEAD_NAME}.json")
+        if not data:
+            return []
+        return [
+            _Chunk(name, tuple(first), size)
+            for name, first, size in zip(data["names"], data["firsts"], data["sizes"], strict=True)
+        ]
+
+    def _decode(self, data: dict | None) -> list[_Entry]:
+        if not data:
+            return []
+        if self._order_field is None:
+            return [(record_id,) for record_id in data["ids"]]
+        return list(zip(data["order"], data["ids"], strict=True))
+
+    def _encode(self, entries: list[_Entry]) -> dict:
+        data = {"ids": [entry[-1] for entry in entries]}
+        if self._order_field is not None:
+            data["order"] = [entry[0] for entry in entries]
+        return data
+
+    async def _update(self, additions: list[tuple[str, str, Any]], removals: list[tuple[str, str, Any]]) -> None:
+        await self._ensure_ready()
+        grouped: defaultdict[str, tuple[set[_Entry], set[_Entry]]] = defaultdict(lambda: (set(), set()))
+        for key, record_id, order_value in additions:
+            grouped[key][0].add(self._entry(record_id, order_value))
+        for key, record_id, order_value in removals:
+            grouped[key][1].add(self._entry(record_id, order_value))
+        async with self._locks.hold(*grouped):
+            for key, (added, removed) in grouped.items():
+                await self._update_key(self._key_dir(key), added, removed)
+
+    async def _update_key(self, key_dir: Path, added: set[_Entry], removed: set[_Entry]) -> None:
+        chunks = await self._read_head(key_dir)
+        firsts = [chunk.first for chunk in chunks]
+        changes: defaultdict[int, tuple[set[_Entry], set[_Entry]]] = defaultdict(lambda: (set(), set()))
+        for entry in added:
+            changes[_position(firsts, entry)][0].add(entry)
+        for entry in removed:
+            changes[_position(firsts, entry)][1].add(entry)
+        positions = sorted(changes)
+        records = (
+            await load_many_from_files(key_dir / f"{chunks[position].name}.json" for position in positions)
+            if chunks
+            else [None]
+        )
+        pieces: dict[int, list[list[_Entry]]] = {}
+        for position, data in zip(positions, records, strict=True):
+            old_entries = set(self._decode(data))
+            new_entries = (old_entries - changes[position][1]) | changes[position][0]
+            if new_entries != old_entries:
+                pieces[position] = _split(sorted(new_entries))
+        if not pieces:
+            return
+
+        await asyncio.to_thread(key_dir.mkdir, parents=True, exist_ok=True)
+        written = iter(await self._write_chunks(key_dir, [piece for split in pieces.values() for piece in split]))
+        replacements = {position: [next(written) for _ in split] for position, split in pieces.items()}
+        if not chunks:
+            await self._write_head(key_dir, replacements[0])
+            return
+        new_chunks = [new for position, chunk in enumerate(chunks) for new in replacements.get(position, [chunk])]
+        if not new_chunks:
+            await asyncio.to_thread(shutil.rmtree, key_dir, ignore_errors=True)
+            return
+        await self._write_head(key_dir, new_chunks)
+        await delete_files([key_dir / f"{chunks[position].name}.json" for position in replacements])
+
+    async def _write_chunks(self, key_dir: Path, pieces: list[list[_Entry]]) -> list[_Chunk]:
+        chunks = [_Chunk(uuid4_str(), entries[0], len(entries)) for entries in pieces]
+        await save_many_to_files(
+            [
+                (key_dir / f"{chunk.name}.json", self._encode(entries))
+                for chunk, entries in zip(chunks, pieces, strict=True)
+            ],
+            self._committer,
+            self._codec,
+        )
+        return chunks
+
+    async def _write_head(self, key_dir: Path, chunks: list[_Chunk]) -> None:
+        data = {
+            "names": [chunk.name for chunk in chunks],
+            "firsts": [list(chunk.first) for chunk in chunks],
+            "sizes": [chunk.size for chunk in chunks],
+        }
+        await save_to_file(key_dir / f"{_HEAD_NAME}.json", data, self._committer, self._codec)
+
+    async def _ensure_ready(self) -> None:
+        if self._is_ready:
+            return
+        async with self._locks.hold_all():
+            if not self._is_ready and not await asyncio.to_thread(self._index_dir.exists):
+                await self._rebuild()
+            self._is_ready = True
+
+    async def _rebuild(self) -> None:
+        grouped: defaultdict[str, list[_Entry]] = defaultdict(list)
+        paths = await asyncio.to_thread(lambda: list(self._records_dir.glob("*.json")))
+        for path, data in zip(paths, await load_many_from_files(paths), strict=True):
+            if data and data.get(self._field) is not None:
+                order_value = data.get(self._order_field) if self._order_field is not None else None
+                grouped[data[self._field]].append(self._entry(path.stem, order_value))
+
+        tmp_dir = self._index_dir.with_name(f".{self._index_dir.name}.{uuid4_str()}.tmp")
+        await asyncio.to_thread(tmp_dir.mkdir, parents=True)
+        for key, entries in grouped.items():
+            key_dir = self._key_dir(key, tmp_dir)
+            await asyncio.to_thread(key_dir.mkdir)
+            await self._write_head(key_dir, await self._write_chunks(key_dir, _split(sorted(entries))))
+        await asyncio.to_thread(replace_dir, tmp_dir, self._index_dir)
+        logger.info("Rebuilt %s index for %s: %d keys", self._field, self._records_dir, len(grouped))
+
+
+def _position(firsts: list[_Entry], entry: _Entry) -> int:
+    """Position of the chunk that holds, or would hold, `entry`."""
+    return max(bisect.bisect_right(firsts, entry) - 1, 0)
+
+
+def _split(entries: list[_Entry]) -> list[list[_Entry]]:
+    """Split sorted entries into the fewest chunks of at most `CHUNK_SIZE`, all of about the same size."""
+    if not entries:
+        return []
+    count = -(-len(entries) // CHUNK_SIZE)
+    size = -(-len(entries) // count)
+    return [entries[start : start + size] for start in range(0, len(entries), size)]
@@ -0,0 +1,95 @@
+import asyncio
+import fcntl
+import logging
+import os
+import time
+import zlib
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager, AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STRIPES = 64
+LOCK_DIR_NAME = "_locks"
+FLOCK_POLL_SECONDS = 0.001
+FLOCK_MAX_POLL_SECONDS = 0.05
+
+
+@dataclass
+class LockStats:
+    acquisitions: int = 0
+    contended: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    @property
+    def contention_ratio(self) -> float:
+        return self.contended / self.acquisitions if self.acquisitions else 0.0
+
+
+class LockManager:
+    """
+    Striped locks that serialize writers of the same entity while writers of different entities run in parallel.
+
+    Each entity id maps to one of `stripes` `asyncio.Lock`s by its crc32, so memory stays bounded however many
+    entities there are, and unrelated ids sharing a stripe merely wait for each other. With `lock_dir`, holding a
+    stripe also means holding an `fcntl.flock` on its file in that directory, which serializes worker processes
+    sharing the data directory. The flock is polled rather than waited for in a thread, so a cancelled waiter
+    leaves nothing behind. `stats` counts acquisitions, how many of them had to wait, and for how long.
+    """
+
+    def __init__(self, stripes: int = DEFAULT_STRIPES, lock_dir: Path | None = None) -> None:
+        self._locks = [asyncio.Lock() for _ in range(stripes)]
+        self._lock_dir = lock_dir
+        if lock_dir is not None:
+            lock_dir.mkdir(parents=True, exist_ok=True)
+        self.stats = LockStats()
+
+    def hold(self, *entity_ids: str) -> AbstractAsyncContextManager[None]:
+        """Hold the locks of all `entity_ids`, taken in stripe order, so overlapping holders cannot deadlock."""
+        return self._hold({zlib.crc32(entity_id.encode()) % len(self._locks) for entity_id in entity_ids})
+
+    def hold_all(self) -> AbstractAsyncContextManager[None]:
+        """Hold every stripe, shutting out all other holders, e.g. while rebuilding state that all entities share."""
+        return self._hold(set(range(len(self._locks))))
+
+    @asynccontextmanager
+    async def _hold(self, stripes: set[int]) -> AsyncIterator[None]:
+        started = time.perf_counter()
+        is_contended = False
+        async with AsyncExitStack() as stack:
+            for stripe in sorted(stripes):
+                lock = self._locks[stripe]
+                is_contended |= lock.locked()
+                await stack.enter_async_context(lock)
+                if self._lock_dir is not None:
+                    fd = os.open(self._lock_dir / f"{stripe}.lock", os.O_RDWR | os.O_CREAT)
+                    stack.callback(os.close, fd)
+                    is_contended |= await _flock(fd)
+            self._record(time.perf_counter() - started, is_contended=is_contended)
+            yield
+
+    def _record(self, wait_seconds: float, *, is_contended: bool) -> None:
+        self.stats.acquisitions += 1
+        if is_contended:
+            self.stats.contended += 1
+            logger.debug("Waited %.6fs for a contended lock", wait_seconds)
+        self.stats.wait_seconds += wait_seconds
+        self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, wait_seconds)
+
+
+async def _flock(fd: int) -> bool:
+    """Take an exclusive flock on `fd`, released when it is closed; return whether another holder made us wait."""
+    delay = FLOCK_POLL_SECONDS
+    is_contended = False
+    while True:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            is_contended = True
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, FLOCK_MAX_POLL_SECONDS)
+        else:
+            return is_contended
@@ -0,0 +1,34 @@
+import shutil
+from pathlib import Path
+
+from domain.utils import uuid4_str
+
+
+class UnsafePathError(ValueError):
+    def __init__(self, parent: Path, name: str) -> None:
+        super().__init__(f"{name!r} does not name an entry of {parent}")
+
+
+def child_path(parent: Path, name: str) -> Path:
+    """`parent / name`, refusing any `name` (an id, an index key) that would lead anywhere but into `parent`."""
+    path = parent / name
+    if path.parent != parent or path.name in {"", ".", ".."} or "\x00" in name:
+        raise UnsafePathError(parent, name)
+    return path
+
+
+def replace_dir(new_dir: Path, target: Path) -> None:
+    """
+    Move `new_dir` to `target`, in one rename unless `target` exists and has to be moved out of the way first.
+
+    The old directory is renamed aside rather than deleted until the new one is in place, so a crash in between
+    leaves it behind as `.<name>.<uuid>.old` instead of losing it.
+    """
+    old_dir = target.with_name(f".{target.name}.{uuid4_str()}.old")
+    try:
+        target.rename(old_dir)
+    except FileNotFoundError:
+        new_dir.rename(target)
+        return
+    new_dir.rename(target)
+    shutil.rmtree(old_dir, ignore_errors=True)
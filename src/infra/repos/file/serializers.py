@@ -1,12 +1,32 @@
+import asyncio
 import json
+import marshal
+from collections.abc import Iterable
 from datetime import datetime
 from decimal import Decimal
-from enum import Enum
+from enum import Enum, StrEnum
 from pathlib import Path
 from typing import Any
 
 import aiofiles
 
+from domain.models.aggregate import TransactionAggregate
+from domain.models.budget import Budget
+from domain.models.category import Category
+from domain.models.transaction import Transaction, TransactionType
+from domain.utils import uuid4_str
+from infra.repos.file.commit import FileCommitter
+
+DEFAULT_LOAD_CONCURRENCY = 64
+_BINARY_MAGIC = b"\x00RSM1"
+_MARSHAL_VERSION = 4
+
+
+class Codec(StrEnum):
+    PRETTY_JSON = "pretty_json"
+    COMPACT_JSON = "compact_json"
+    BINARY = "binary"
+
 
 class CustomJSONEncoder(json.JSONEncoder):
     def default(self, o: Any) -> Any:
@@ -19,17 +39,156 @@ class CustomJSONEncoder(json.JSONEncoder):
         return super().default(o)
 
 
-async def save_to_file(path: Path, data: dict) -> None:
-    """Save dict as JSON to file."""
-    async with aiofiles.open(path, "w", encoding="utf-8") as f:
-        await f.write(json.dumps(data, cls=CustomJSONEncoder, ensure_ascii=False, indent=2))
+def to_primitive(value: Any) -> Any:
+    """Convert a field value to the form it takes once encoded, e.g. a datetime to its ISO string."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def encode_record(data: dict, codec: Codec = Codec.PRETTY_JSON) -> bytes:
+    """
+    Encode a record dict (e.g. `dataclasses.asdict` output) with `codec`.
+
+    `Codec.BINARY` is a magic prefix followed by `marshal` of the dict with datetimes, decimals and enums turned
+    into strings, so it decodes to exactly what the JSON codecs decode to.
+    """
+    match codec:
+        case Codec.PRETTY_JSON:
+            return json.dumps(data, cls=CustomJSONEncoder, ensure_ascii=False, indent=2).encode()
+        case Codec.COMPACT_JSON:
+            return json.dumps(data, cls=CustomJSONEncoder, ensure_ascii=False, separators=(",", ":")).encode()
+        case Codec.BINARY:
+            primitive = {key: to_primitive(value) for key, value in data.items()}
+            return _BINARY_MAGIC + marshal.dumps(primitive, _MARSHAL_VERSION)
+
+
+def decode_record(raw: bytes) -> dict:
+    """Decode a record written with any `Codec`, detecting the codec from its content."""
+    if raw.startswith(_BINARY_MAGIC):
+        return marshal.loads(raw[len(_BINARY_MAGIC) :])  # noqa: S302 - only reads files this app wrote itself
+    return json.loads(raw)
+
+
+def budget_from_dict(data: dict[str, Any]) -> Budget:
+    data["balance"] = Decimal(data["balance"])
+    if data.get("initial_balance") is not None:
+        data["initial_balance"] = Decimal(data["initial_balance"])
+    data["created_at"] = datetime.fromisoformat(data["created_at"])
+    data["updated_at"] = datetime.fromisoformat(data["updated_at"])
+    return Budget(**data)
+
+
+def category_from_dict(data: dict[str, Any]) -> Category:
+    if data.get("transaction_type") is not None:
+        data["transaction_type"] = TransactionType(data["transaction_type"])
+    data["created_at"] = datetime.fromisoformat(data["created_at"])
+    data["updated_at"] = datetime.fromisoformat(data["updated_at"])
+    return Category(**data)
+
+
+def transaction_from_dict(data: dict[str, Any]) -> Transaction:
+    data["amount"] = Decimal(data["amount"])
+    data["type"] = TransactionType(data["type"])
+    data["date"] = datetime.fromisoformat(data["date"])
+    data["created_at"] = datetime.fromisoformat(data["created_at"])
+    data["updated_at"] = datetime.fromisoformat(data["updated_at"])
+    return Transaction(**data)
+
+
+def aggregate_from_dict(data: dict[str, Any]) -> TransactionAggregate:
+    data["type"] = TransactionType(data["type"])
+    data["total"] = Decimal(data["total"])
+    return TransactionAggregate(**data)
+
+
+async def save_to_file(
+    path: Path, data: dict, committer: FileCommitter | None = None, codec: Codec = Codec.PRETTY_JSON
+) -> None:
+    """
+    Save dict to file atomically: readers see either the old or the new content, never a partial write.
+
+    The encoded record is written to a temp file next to `path`, which `committer` then renames over it.
+    """
+    content = encode_record(data, codec)
+    tmp_path = path.with_name(f".{path.name}.{uuid4_str()}.tmp")
+    try:
+        async with aiofiles.open(tmp_path, "wb") as f:
+            await f.write(content)
+        await (committer or FileCommitter()).commit(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+async def save_many_to_files(
+    records: list[tuple[Path, dict]], committer: FileCommitter | None = None, codec: Codec = Codec.PRETTY_JSON
+) -> None:
+    """
+    Save many dicts to their files atomically, each like `save_to_file`.
+
+    All temp files are written in a single worker-thread call and published in one commit, instead of one
+    aiofiles round-trip and one rename call per record.
+    """
+    entries = [(path.with_name(f".{path.name}.{uuid4_str()}.tmp"), path) for path, _ in records]
+    contents = [encode_record(data, codec) for _, data in records]
+    try:
+        await asyncio.to_thread(_write_files, [tmp_path for tmp_path, _ in entries], contents)
+        await (committer or FileCommitter()).commit_many(entries)
+    except OSError:
+        for tmp_path, _ in entries:
+            tmp_path.unlink(missing_ok=True)
+        raise
+
+
+async def delete_files(paths: list[Path]) -> None:
+    """Delete many record files in a single worker-thread call."""
+    await asyncio.to_thread(_unlink_files, paths)
 
 
 async def load_from_file(path: Path) -> dict | None:
-    """Load JSON from file, return None if not found."""
+    """Load a record written with any `Codec` from file, return None if not found."""
     try:
-        async with aiofiles.open(path, encoding="utf-8") as f:
+        async with aiofiles.open(path, "rb") as f:
             content = await f.read()
-        return json.loads(content)
     except FileNotFoundError:
         return None
+    return decode_record(content)
+
+
+async def load_many_from_files(paths: Iterable[Path], concurrency: int = DEFAULT_LOAD_CONCURRENCY) -> list[dict | None]:
+    """
+    Load many record files concurrently, keeping at most `concurrency` of them in flight.
+
+    Each file is read and decoded in a single worker-thread call, instead of one aiofiles round-trip per
+    open/read/close. Results keep the order of `paths`; missing files yield None.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def load(path: Path) -> dict | None:
+        async with semaphore:
+            return await asyncio.to_thread(_read_record, path)
+
+    return await asyncio.gather(*(load(path) for path in paths))
+
+
+def _read_record(path: Path) -> dict | None:
+    try:
+        content = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    return decode_record(content)
+
+
+def _write_files(paths: list[Path], contents: list[bytes]) -> None:
+    for path, content in zip(paths, contents, strict=True):
+        path.write_bytes(content)
+
+
+def _unlink_files(paths: list[Path]) -> None:
+    for path in paths:
+        path.unlink(missing_ok=True)
@@ -0,0 +1,71 @@
+import asyncio
+import copy
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+from infra.repos.file.serializers import decode_record
+
+DEFAULT_MAX_STAMPS = 1024
+
+type FileStamp = tuple[int, int, int]
+
+
+class StampCache[T]:
+    """
+    The records a repo read last, each with the stamp (inode, size, mtime) of the file it was read from.
+
+    Plain reads use `recall` to skip reading a record again: records are replaced by renaming a new file over the
+    old one, so an unchanged stamp almost always means an unchanged record, and one `stat` replaces a read and
+    decode. Almost: a recycled inode with the same size and mtime passes for the old file, so writers re-read
+    the record under its lock instead of trusting the cache. At most `max_size` records are kept, least recently
+    read first out.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_STAMPS) -> None:
+        self._max_size = max_size
+        self._records: OrderedDict[str, tuple[FileStamp, T]] = OrderedDict()
+
+    def remember(self, record_id: str, stamp: FileStamp, record: T) -> None:
+        self._records[record_id] = (stamp, copy.copy(record))
+        self._records.move_to_end(record_id)
+        if len(self._records) > self._max_size:
+            self._records.popitem(last=False)
+
+    def forget(self, *record_ids: str) -> None:
+        for record_id in record_ids:
+            self._records.pop(record_id, None)
+
+    async def recall(self, record_id: str, path: Path) -> T | None:
+        """Return the remembered record if `path` still seems to hold it, otherwise None."""
+        remembered = self._records.get(record_id)
+        if remembered is None:
+            return None
+        stamp, record = remembered
+        if await asyncio.to_thread(_read_stamp, path) != stamp:
+            return None
+        self._records.move_to_end(record_id)
+        return copy.copy(record)
+
+
+async def load_stamped_from_file(path: Path) -> tuple[dict, FileStamp] | None:
+    """Load a record like `load_from_file`, together with the stamp of the very file it was read from."""
+    return await asyncio.to_thread(_read_stamped, path)
+
+
+def _read_stamped(path: Path) -> tuple[dict, FileStamp] | None:
+    try:
+        with path.open("rb") as f:
+            content = f.read()
+            stat = os.fstat(f.fileno())
+    except FileNotFoundError:
+        return None
+    return decode_record(content), (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def _read_stamp(path: Path) -> FileStamp | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
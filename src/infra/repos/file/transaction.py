@@ -1,73 +1,226 @@
 import logging
+from collections.abc import Mapping
 from dataclasses import asdict
-from datetime import datetime
-from decimal import Decimal
+from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
 
-from domain.errors import TransactionNotFoundError
-from domain.models.transaction import Transaction, TransactionType
+from domain.errors import ConcurrentUpdateError, TransactionNotFoundError
+from domain.models.transaction import Transaction
+from domain.repos.page import Page
 from domain.repos.transaction import TransactionRepo
 from domain.utils import utc_now
-from infra.repos.file.serializers import load_from_file, save_to_file
+from infra.repos.file.commit import Durability, FileCommitter
+from infra.repos.file.index import FileIndex
+from infra.repos.file.locks import LOCK_DIR_NAME, LockManager, LockStats
+from infra.repos.file.paths import child_path
+from infra.repos.file.serializers import (
+    Codec,
+    delete_files,
+    load_many_from_files,
+    save_many_to_files,
+    save_to_file,
+    transaction_from_dict,
+)
+from infra.repos.file.stamps import StampCache, load_stamped_from_file
 
 logger = logging.getLogger(__name__)
 
 
 class TransactionFileRepo(TransactionRepo):
-    def __init__(self, base_dir: Path = Path("data/transactions")) -> None:
+    def __init__(
+        self,
+        base_dir: Path = Path("data/transactions"),
+        durability: Durability = Durability.NONE,
+        codec: Codec = Codec.PRETTY_JSON,
+        *,
+        inter_process_locks: bool = False,
+    ) -> None:
         self._base_dir = base_dir
         self._base_dir.mkdir(parents=True, exist_ok=True)
+        self._committer = FileCommitter(durability)
+        self._codec = codec
+        self._locks = LockManager(lock_dir=base_dir / LOCK_DIR_NAME if inter_process_locks else None)
+        self._stamps: StampCache[Transaction] = StampCache()
+        self._user_index = FileIndex(
+            base_dir,
+            field="user_id",
+            committer=self._committer,
+            codec=self._codec,
+            inter_process_locks=inter_process_locks,
+        )
+        self._budget_index = FileIndex(
+            base_dir,
+            field="budget_id",
+            committer=self._committer,
+            codec=self._codec,
+            inter_process_locks=inter_process_locks,
+        )
+        self._user_date_index = FileIndex(
+            base_dir,
+            field="user_id",
+            committer=self._committer,
+            codec=self._codec,
+            order_field="date",
+            inter_process_locks=inter_process_locks,
+        )
+        self._budget_date_index = FileIndex(
+            base_dir,
+            field="budget_id",
+            committer=self._committer,
+            codec=self._codec,
+            order_field="date",
+            inter_process_locks=inter_process_locks,
+        )
+
+    @property
+    def lock_stats(self) -> LockStats:
+        return self._locks.stats
 
     def _file_path(self, transaction_id: str) -> Path:
-        return self._base_dir / f"{transaction_id}.json"
-
-    @staticmethod
-    def _from_dict(data: dict[str, Any]) -> Transaction:
-        # Convert string fields back to proper types
-        data["amount"] = Decimal(data["amount"])
-        data["type"] = TransactionType(data["type"])
-        data["date"] = datetime.fromisoformat(data["date"])
-        data["created_at"] = datetime.fromisoformat(data["created_at"])
-        data["updated_at"] = datetime.fromisoformat(data["updated_at"])
-        return Transaction(**data)
+        return child_path(self._base_dir, f"{transaction_id}.json")
 
     async def create(self, transaction: Transaction) -> None:
-        path = self._file_path(transaction.id)
-        await save_to_file(path, asdict(transaction))
+        await self._add_to_indexes(transaction)
+        await save_to_file(self._file_path(transaction.id), asdict(transaction), self._committer, self._codec)
         logger.debug("Created transaction %s", transaction.id)
 
+    async def create_many(self, transactions: list[Transaction]) -> None:
+        await self._add_many_to_indexes(transactions)
+        await self._save_many(transactions)
+        logger.debug("Created %d transactions", len(transactions))
+
     async def get_by_id(self, transaction_id: str) -> Transaction | None:
-        data = await load_from_file(self._file_path(transaction_id))
-        return self._from_dict(data) if data else None
+        transaction = await self._stamps.recall(transaction_id, self._file_path(transaction_id))
+        return transaction if transaction is not None else await self._read(transaction_id)
+
+    async def _read(self, transaction_id: str) -> Transaction | None:
+        """Read the transaction from its file, as writers holding its lock must, since a remembered one may be stale."""
+        stamped = await load_stamped_from_file(self._file_path(transaction_id))
+        if stamped is None:
+            return None
+        data, stamp = stamped
+        transaction = transaction_from_dict(data)
+        self._stamps.remember(transaction_id, stamp, transaction)
+        return transaction
+
+    async def get_by_ids(self, transaction_ids: list[str]) -> list[Transaction]:
+        return await self._get_many(transaction_ids)
 
     async def get_by_user_id(self, user_id: str) -> list[Transaction]:
-        result = []
-        for path in self._base_dir.glob("*.json"):
-            data = await load_from_file(path)
-            if data and data.get("user_id") == user_id:
-                result.append(self._from_dict(data))
-        return result
+        return await self._get_many(await self._user_index.get(user_id))
 
     async def get_by_budget_id(self, budget_id: str) -> list[Transaction]:
-        result = []
-        for path in self._base_dir.glob("*.json"):
-            data = await load_from_file(path)
-            if data and data.get("budget_id") == budget_id:
-                result.append(self._from_dict(data))
-        return result
+        return await self._get_many(await self._budget_index.get(budget_id))
+
+    async def get_by_date_range(
+        self, user_id: str, start: datetime, end: datetime, budget_id: str | None = None
+    ) -> list[Transaction]:
+        start, end = start.astimezone(UTC), end.astimezone(UTC)
+        if budget_id is None:
+            return await self._get_many(await self._user_date_index.get_range(user_id, start, end))
+        transactions = await self._get_many(await self._budget_date_index.get_range(budget_id, start, end))
+        return [transaction for transaction in transactions if transaction.user_id == user_id]
+
+    async def get_page_by_user_id(self, user_id: str, limit: int, cursor: str | None = None) -> Page[Transaction]:
+        transaction_ids, next_cursor = await self._user_index.get_page(user_id, limit, cursor)
+        return Page(await self._get_many(transaction_ids), next_cursor)
+
+    async def get_page_by_budget_id(self, budget_id: str, limit: int, cursor: str | None = None) -> Page[Transaction]:
+        transaction_ids, next_cursor = await self._budget_index.get_page(budget_id, limit, cursor)
+        return Page(await self._get_many(transaction_ids), next_cursor)
+
+    async def _add_to_indexes(self, transaction: Transaction) -> None:
+        await self._user_index.add(transaction.user_id, transaction.id)
+        await self._budget_index.add(transaction.budget_id, transaction.id)
+        await self._user_date_index.add(transaction.user_id, transaction.id, transaction.date)
+        await self._budget_date_index.add(transaction.budget_id, transaction.id, transaction.date)
+
+    async def _add_many_to_indexes(self, transactions: list[Transaction]) -> None:
+        user_entries = [(transaction.user_id, transaction.id, transaction.date) for transaction in transactions]
+        budget_entries = [(transaction.budget_id, transaction.id, transaction.date) for transaction in transactions]
+        await self._user_index.add_many(user_entries)
+        await self._user_date_index.add_many(user_entries)
+        await self._budget_index.add_many(budget_entries)
+        await self._budget_date_index.add_many(budget_entries)
+
+    async def _remove_stale_from_indexes(self, replaced: list[tuple[Transaction, Transaction | None]]) -> None:
+        """Remove the entries of each old transaction that its replacement, None when deleted, no longer has."""
+        user_moved = [(old, new) for old, new in replaced if new is None or new.user_id != old.user_id]
+        budget_moved = [(old, new) for old, new in replaced if new is None or new.budget_id != old.budget_id]
+        await self._user_index.remove_many([(old.user_id, old.id, None) for old, _ in user_moved])
+        await self._budget_index.remove_many([(old.budget_id, old.id, None) for old, _ in budget_moved])
+        redated = [(old, new) for old, new in replaced if new is not None and new.date != old.date]
+        await self._user_date_index.remove_many([(old.user_id, old.id, old.date) for old, _ in user_moved + redated])
+        await self._budget_date_index.remove_many(
+            [(old.budget_id, old.id, old.date) for old, _ in budget_moved + redated]
+        )
+
+    async def _save_many(self, transactions: list[Transaction]) -> None:
+        records = [(self._file_path(transaction.id), asdict(transaction)) for transaction in transactions]
+        await save_many_to_files(records, self._committer, self._codec)
+
+    async def _get_existing(self, transaction_ids: list[str]) -> list[Transaction]:
+        records = await load_many_from_files(self._file_path(transaction_id) for transaction_id in transaction_ids)
+        transactions = []
+        for transaction_id, data in zip(transaction_ids, records, strict=True):
+            if data is None:
+                raise TransactionNotFoundError(transaction_id)
+            transactions.append(transaction_from_dict(data))
+        return transactions
+
+    async def _get_many(self, transaction_ids: list[str]) -> list[Transaction]:
+        records = await load_many_from_files(self._file_path(transaction_id) for transaction_id in transaction_ids)
+        return [transaction_from_dict(data) for data in records if data is not None]
 
     async def update(self, transaction: Transaction) -> None:
-        existing = await self.get_by_id(transaction.id)
-        if existing is None:
-            raise TransactionNotFoundError(transaction.id)
-        transaction.updated_at = utc_now()
-        await save_to_file(self._file_path(transaction.id), asdict(transaction))
-        logger.debug("Updated transaction %s", transaction.id)
-
-    async def delete(self, transaction_id: str) -> None:
-        path = self._file_path(transaction_id)
-        if not path.exists():
-            raise TransactionNotFoundError(transaction_id)
-        path.unlink()
-        logger.debug("Deleted transaction %s", transaction_id)
+        async with self._locks.hold(transaction.id):
+            existing = await self._read(transaction.id)
+            if existing is None:
+                raise TransactionNotFoundError(transaction.id)
+            if existing.version != transaction.version:
+                raise ConcurrentUpdateError(transaction.id)
+            transaction.updated_at = utc_now()
+            transaction.version += 1
+            await self._add_to_indexes(transaction)
+            await save_to_file(self._file_path(transaction.id), asdict(transaction), self._committer, self._codec)
+            await self._remove_stale_from_indexes([(existing, transaction)])
+            logger.debug("Updated transaction %s", transaction.id)
+
+    async def update_many(self, transactions: list[Transaction]) -> None:
+        async with self._locks.hold(*(transaction.id for transaction in transactions)):
+            existing = await self._get_existing([transaction.id for transaction in transactions])
+            self._stamps.forget(*(transaction.id for transaction in transactions))
+            for old, transaction in zip(existing, transactions, strict=True):
+                if old.version != transaction.version:
+                    raise ConcurrentUpdateError(transaction.id)
+            updated_at = utc_now()
+            for transaction in transactions:
+                transaction.updated_at = updated_at
+                transaction.version += 1
+            await self._add_many_to_indexes(transactions)
+            await self._save_many(transactions)
+            await self._remove_stale_from_indexes(list(zip(existing, transactions, strict=True)))
+            logger.debug("Updated %d transactions", len(transactions))
+
+    async def delete(self, transaction_id: str, expected_version: int | None = None) -> bool:
+        async with self._locks.hold(transaction_id):
+            existing = await self._read(transaction_id)
+            if existing is None:
+                return False
+            if expected_version is not None and existing.version != expected_version:
+                raise ConcurrentUpdateError(transaction_id)
+            self._file_path(transaction_id).unlink()
+            await self._remove_stale_from_indexes([(existing, None)])
+            logger.debug("Deleted transaction %s", transaction_id)
+            return True
+
+    async def delete_many(self, transaction_ids: list[str], expected_versions: Mapping[str, int] | None = None) -> None:
+        async with self._locks.hold(*transaction_ids):
+            existing = await self._get_existing(transaction_ids)
+            self._stamps.forget(*transaction_ids)
+            for transaction in existing:
+                if expected_versions is not None and transaction.version != expected_versions[transaction.id]:
+                    raise ConcurrentUpdateError(transaction.id)
+            await delete_files([self._file_path(transaction_id) for transaction_id in transaction_ids])
+            await self._remove_stale_from_indexes([(transaction, None) for transaction in existing])
+            logger.debug("Deleted %d transactions", len(transaction_ids))
@@ -0,0 +1,54 @@
+import asyncio
+import logging
+from dataclasses import asdict
+from pathlib import Path
+
+from domain.models.aggregate import TransactionAggregate, merge_delta
+from domain.repos.aggregate import AggregateRepo
+from infra.repos.file.serializers import aggregate_from_dict
+from infra.repos.log.store import LogStore
+
+logger = logging.getLogger(__name__)
+
+
+class AggregateLogRepo(AggregateRepo):
+    def __init__(self, path: Path = Path("data/aggregates.log")) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._store = LogStore(path, indexed_fields=("user_id",))
+        self._lock = asyncio.Lock()
+
+    async def add(self, deltas: list[TransactionAggregate]) -> None:
+        async with self._lock:
+            for delta in deltas:
+                record_id = _record_id(delta)
+                data = await self._store.get(record_id)
+                aggregates = {} if data is None else {delta.key: aggregate_from_dict(data)}
+                merge_delta(aggregates, delta)
+                aggregate = aggregates[delta.key]
+                if aggregate.count > 0:
+                    await self._store.put(record_id, asdict(aggregate))
+                else:
+                    await self._store.delete(record_id)
+        logger.debug("Applied %d aggregate deltas", len(deltas))
+
+    async def get_by_user_id(self, user_id: str, month: str | None = None) -> list[TransactionAggregate]:
+        return [
+            aggregate_from_dict(data)
+            for data in await self._store.get_many_by("user_id", user_id)
+            if month is None or data["month"] == month
+        ]
+
+    async def replace_by_user_id(self, user_id: str, aggregates: list[TransactionAggregate]) -> None:
+        async with self._lock:
+            for data in await self._store.get_many_by("user_id", user_id):
+                await self._store.delete(_record_id(aggregate_from_dict(data)))
+            for aggregate in aggregates:
+                await self._store.put(_record_id(aggregate), asdict(aggregate))
+        logger.info("Replaced aggregates of user %s: %d rows", user_id, len(aggregates))
+
+    async def close(self) -> None:
+        await self._store.close()
+
+
+def _record_id(aggregate: TransactionAggregate) -> str:
+    return "/".join(aggregate.key)
@@ -0,0 +1,111 @@
+import logging
+from dataclasses import asdict
+from pathlib import Path
+
+from domain.errors import BudgetNotFoundError, ConcurrentUpdateError
+from domain.models.budget import Budget
+from domain.repos.budget import BudgetRepo
+from domain.repos.ordering import Ordering
+from domain.repos.page import Page
+from domain.utils import utc_now
+from infra.repos.file.serializers import budget_from_dict
+from infra.repos.log.store import LogStore, WriteOutcome
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetLogRepo(BudgetRepo):
+    def __init__(self, path: Path = Path("data/budgets.log")) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._store = LogStore(path, indexed_fields=("user_id", "created_at"), field_defaults={"version": 1})
+
+    async def create(self, budget: Budget) -> None:
+        await self._store.put(budget.id, asdict(budget))
+        logger.debug("Created budget %s", budget.id)
+
+    async def create_many(self, budgets: list[Budget]) -> None:
+        await self._store.put_many([(budget.id, asdict(budget)) for budget in budgets])
+        logger.debug("Created %d budgets", len(budgets))
+
+    async def get_by_id(self, budget_id: str) -> Budget | None:
+        data = await self._store.get(budget_id)
+        return budget_from_dict(data) if data else None
+
+    async def get_by_user_id(
+        self, user_id: str, ordering: Ordering | None = None, limit: int | None = None
+    ) -> list[Budget]:
+        records = await self._store.get_many_by(
+            "user_id",
+            user_id,
+            order_by=None if ordering is None else "created_at",
+            descending=ordering is Ordering.NEWEST_FIRST,
+            limit=limit,
+        )
+        return [budget_from_dict(data) for data in records]
+
+    async def get_page_by_user_id(
+        self, user_id: str, limit: int, cursor: str | None = None, ordering: Ordering | None = None
+    ) -> Page[Budget]:
+        records, next_cursor = await self._store.get_page_by(
+            "user_id",
+            user_id,
+            limit,
+            cursor,
+            order_by=None if ordering is None else "created_at",
+            descending=ordering is Ordering.NEWEST_FIRST,
+        )
+        return Page([budget_from_dict(data) for data in records], next_cursor)
+
+    async def update(self, budget: Budget) -> None:
+        updated_at = utc_now()
+        outcome = await self._store.replace(
+            budget.id,
+            {**asdict(budget), "updated_at": updated_at, "version": budget.version + 1},
+            {"version": budget.version},
+        )
+        if outcome is WriteOutcome.MISSING:
+            raise BudgetNotFoundError(budget_id=budget.id)
+        if outcome is WriteOutcome.CONFLICT:
+            raise ConcurrentUpdateError(budget.id)
+        budget.updated_at = updated_at
+        budget.version += 1
+        logger.debug("Updated budget %s", budget.id)
+
+    async def update_many(self, budgets: list[Budget]) -> None:
+        updated_at = utc_now()
+        failed = await self._store.replace_many(
+            [
+                (
+                    budget.id,
+                    {**asdict(budget), "updated_at": updated_at, "version": budget.version + 1},
+                    {"version": budget.version},
+                )
+                for budget in budgets
+            ]
+        )
+        if failed is not None:
+            if failed[1] is WriteOutcome.CONFLICT:
+                raise ConcurrentUpdateError(failed[0])
+            raise BudgetNotFoundError(budget_id=failed[0])
+        for budget in budgets:
+            budget.updated_at = updated_at
+            budget.version += 1
+        logger.debug("Updated %d budgets", len(budgets))
+
+    async def delete(self, budget_id: str, expected_version: int | None = None) -> bool:
+        outcome = await self._store.delete(budget_id, {"version": expected_version})
+        if outcome is WriteOutcome.CONFLICT:
+            raise ConcurrentUpdateError(budget_id)
+        if outcome is WriteOutcome.MISSING:
+            return False
+        logger.debug("Deleted budget %s", budget_id)
+        return True
+
+    async def delete_many(self, budget_ids: list[str]) -> None:
+        failed = await self._store.delete_many([(budget_id, None) for budget_id in budget_ids])
+        if failed is not None:
+            raise BudgetNotFoundError(budget_id=failed[0])
+        logger.debug("Deleted %d budgets", len(budget_ids))
+
+    async def close(self) -> None:
+        await self._store.close()
@@ -0,0 +1,104 @@
+import logging
+from dataclasses import asdict
+from pathlib import Path
+
+from domain.errors import CategoryNotFoundError, ConcurrentUpdateError
+from domain.models.category import Category
+from domain.models.transaction import TransactionType
+from domain.repos.category import CategoryRepo
+from domain.repos.page import Page
+from domain.utils import utc_now
+from infra.repos.file.serializers import category_from_dict
+from infra.repos.log.store import LogStore, WriteOutcome
+
+logger = logging.getLogger(__name__)
+
+
+class CategoryLogRepo(CategoryRepo):
+    def __init__(self, path: Path = Path("data/categories.log")) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._store = LogStore(path, indexed_fields=("user_id", "transaction_type"), field_defaults={"version": 1})
+
+    async def create(self, category: Category) -> None:
+        await self._store.put(category.id, asdict(category))
+        logger.debug("Created category %s", category.id)
+
+    async def create_many(self, categories: list[Category]) -> None:
+        await self._store.put_many([(category.id, asdict(category)) for category in categories])
+        logger.debug("Created %d categories", len(categories))
+
+    async def get_by_id(self, category_id: str) -> Category | None:
+        data = await self._store.get(category_id)
+        return category_from_dict(data) if data else None
+
+    async def get_by_user_id(self, user_id: str, transaction_type: TransactionType | None = None) -> list[Category]:
+        return [
+            category_from_dict(data)
+            for data in await self._store.get_many_by("user_id", user_id)
+            if transaction_type is None or data.get("transaction_type") == transaction_type
+        ]
+
+    async def get_page_by_user_id(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: str | None = None,
+        transaction_type: TransactionType | None = None,
+    ) -> Page[Category]:
+        where = None if transaction_type is None else {"transaction_type": transaction_type}
+        records, next_cursor = await self._store.get_page_by("user_id", user_id, limit, cursor, where)
+        return Page([category_from_dict(data) for data in records], next_cursor)
+
+    async def update(self, category: Category) -> None:
+        updated_at = utc_now()
+        outcome = await self._store.replace(
+            category.id,
+            {**asdict(category), "updated_at": updated_at, "version": category.version + 1},
+            {"version": category.version},
+        )
+        if outcome is WriteOutcome.MISSING:
+            raise CategoryNotFoundError(category.id)
+        if outcome is WriteOutcome.CONFLICT:
+            raise ConcurrentUpdateError(category.id)
+        category.updated_at = updated_at
+        category.version += 1
+        logger.debug("Updated category %s", category.id)
+
+    async def update_many(self, categories: list[Category]) -> None:
+        updated_at = utc_now()
+        failed = await self._store.replace_many(
+            [
+                (
+                    category.id,
+                    {**asdict(category), "updated_at": updated_at, "version": category.version + 1},
+                    {"version": category.version},
+                )
+                for category in categories
+            ]
+        )
+        if failed is not None:
+            if failed[1] is WriteOutcome.CONFLICT:
+                raise ConcurrentUpdateError(failed[0])
+            raise CategoryNotFoundError(failed[0])
+        for category in categories:
+            category.updated_at = updated_at
+            category.version += 1
+        logger.debug("Updated %d categories", len(categories))
+
+    async def delete(self, category_id: str, expected_version: int | None = None) -> bool:
+        outcome = await self._store.delete(category_id, {"version": expected_version})
+        if outcome is WriteOutcome.CONFLICT:
+            raise ConcurrentUpdateError(category_id)
+        if outcome is WriteOutcome.MISSING:
+            return False
+        logger.debug("Deleted category %s", category_id)
+        return True
+
+    async def delete_many(self, category_ids: list[str]) -> None:
+        failed = await self._store.delete_many([(category_id, None) for category_id in category_ids])
+        if failed is not None:
+            raise CategoryNotFoundError(failed[0])
+        logger.debug("Deleted %d categories", len(category_ids))
+
+    async def close(self) -> None:
+        await self._store.close()
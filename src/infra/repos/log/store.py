@@ -0,0 +1,440 @@
+import asyncio
+import heapq
+import json
+import logging
+import os
+import zlib
+from collections import defaultdict
+from collections.abc import Collection, Mapping
+from enum import StrEnum
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from domain.repos.page import keyset_cursor, parse_keyset_cursor, slice_page
+from infra.repos.file.commit import fsync_dir
+from infra.repos.file.serializers import CustomJSONEncoder, to_primitive
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMPACTION_MIN_BYTES = 1024 * 1024
+_CRC_PREFIX_LENGTH = 9  # eight hex digits and a space
+
+
+class CorruptedLogError(Exception):
+    def __init__(self, path: Path, offset: int) -> None:
+        super().__init__(f"Corrupted record at offset {offset} of {path} is followed by other records")
+
+
+class WriteOutcome(StrEnum):
+    WRITTEN = "written"
+    MISSING = "missing"
+    CONFLICT = "conflict"
+
+
+class LogStore:
+    """
+    Append-only segment file of JSON records with an in-memory offset index.
+
+    Every put or delete appends one `<crc32> <json>` line, and the index maps each live id to its latest line,
+    plus the values of `indexed_fields` to ids for list queries. On open the segment is replayed; a torn last
+    line left by a crash is truncated away, but a corrupted line followed by others raises `CorruptedLogError`
+    and leaves the segment as it is. Once superseded lines outweigh the live ones (and exceed
+    `compaction_min_bytes`), the live records are copied into a fresh segment that atomically replaces the old one.
+    `field_defaults` stand in for fields missing from records written before those fields existed.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        indexed_fields: Collection[str],
+        compaction_min_bytes: int = DEFAULT_COMPACTION_MIN_BYTES,
+        field_defaults: Mapping[str, Any] | None = None,
+    ) -> None:
+        self._path = path
+        self._indexed_fields = tuple(indexed_fields)
+        self._field_defaults = dict(field_defaults or {})
+        self._compaction_min_bytes = compaction_min_bytes
+        self._lock = asyncio.Lock()
+        self._file: BinaryIO | None = None
+        self._positions: dict[str, tuple[int, int]] = {}
+        self._field_values: dict[str, dict[str, Any]] = {}
+        self._ids_by_field: dict[str, defaultdict[Any, dict[str, None]]] = {
+            field: defaultdict(dict) for field in self._indexed_fields
+        }
+        self._live_bytes = 0
+        self._dead_bytes = 0
+
+    async def contains(self, record_id: str) -> bool:
+        async with self._lock:
+            await self._open()
+            return record_id in self._positions
+
+    async def get(self, record_id: str) -> dict[str, Any] | None:
+        async with self._lock:
+            file = await self._open()
+            position = self._positions.get(record_id)
+            if position is None:
+                return None
+            line = await asyncio.to_thread(_read_line, file, position)
+        return _decode_line(line)["data"]
+
+    async def get_many(self, record_ids: list[str]) -> list[dict[str, Any]]:
+        """Return the records among `record_ids` that exist, in the order of `record_ids`."""
+        async with self._lock:
+            file = await self._open()
+            positions = [self._positions[record_id] for record_id in record_ids if record_id in self._positions]
+            lines = await asyncio.to_thread(_read_lines, file, positions)
+        return [_decode_line(line)["data"] for line in lines]
+
+    async def get_many_by(
+        self,
+        field: str,
+        value: Any,
+        order_by: str | None = None,
+        *,
+        descending: bool = False,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Return records with `field == value`, sorted by the indexed field `order_by` (then id) if given.
+
+        Sorting and top-`limit` selection run on the in-memory index, so only the returned records are read from disk.
+        """
+        async with self._lock:
+            file = await self._open()
+            selected_ids = self._select_ids(field, value, order_by, descending=descending, limit=limit)
+            positions = [self._positions[record_id] for record_id in selected_ids]
+            lines = await asyncio.to_thread(_read_lines, file, positions)
+        return [_decode_line(line)["data"] for line in lines]
+
+    async def get_range_by(self, field: str, value: Any, order_by: str, start: Any, end: Any) -> list[dict[str, Any]]:
+        """Return records with `field == value` and `start <= order_by < end`, sorted by `order_by` (then id)."""
+        low, high = to_primitive(start), to_primitive(end)
+        async with self._lock:
+            file = await self._open()
+            record_ids = sorted(
+                (self._field_values[record_id][order_by], record_id)
+                for record_id in self._ids_by_field[field].get(value, {})
+                if low <= self._field_values[record_id][order_by] < high
+            )
+            lines = await asyncio.to_thread(
+                _read_lines, file, [self._positions[record_id] for _, record_id in record_ids]
+            )
+        return [_decode_line(line)["data"] for line in lines]
+
+    async def get_page_by(  # noqa: PLR0913
+        self,
+        field: str,
+        value: Any,
+        limit: int,
+        cursor: str | None = None,
+        where: Mapping[str, Any] | None = None,
+        *,
+        order_by: str | None = None,
+        descending: bool = False,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        Up to `limit` records with `field == value` in id order, after the id `cursor`, and the cursor of the next page.
+
+        With `order_by`, records are ordered by that indexed field (then id) instead, descending if asked, and the
+        cursors are `keyset_cursor`s. `where` narrows the page further by other indexed fields; filtering happens
+        on the in-memory index, so only the returned records are read from disk.
+        """
+        async with self._lock:
+            file = await self._open()
+            record_ids = [
+                record_id
+                for record_id in self._ids_by_field[field].get(value, {})
+                if all(self._field_values[record_id][name] == expected for name, expected in (where or {}).items())
+            ]
+            if order_by is None:
+                page_ids, next_cursor = slice_page(sorted(record_ids), limit, cursor)
+            else:
+                page_ids, next_cursor = self._ordered_page(record_ids, order_by, limit, cursor, descending=descending)
+            lines = await asyncio.to_thread(_read_lines, file, [self._positions[record_id] for record_id in page_ids])
+        return [_decode_line(line)["data"] for line in lines], next_cursor
+
+    async def put(self, record_id: str, data: dict[str, Any]) -> None:
+        line = _encode_line(record_id, data)
+        async with self._lock:
+            file = await self._open()
+            offset = await asyncio.to_thread(_append, file, line)
+            self._forget(record_id)
+            self._remember(record_id, data, (offset, len(line)))
+            await self._compact_if_needed()
+
+    async def put_many(self, records: list[tuple[str, dict[str, Any]]]) -> None:
+        """Put all `records` with a single append, so a bulk write costs one write call instead of one per record."""
+        lines = [_encode_line(record_id, data) for record_id, data in records]
+        async with self._lock:
+            file = await self._open()
+            offset = await asyncio.to_thread(_append, file, b"".join(lines))
+            for (record_id, data), line in zip(records, lines, strict=True):
+                self._forget(record_id)
+                self._remember(record_id, data, (offset, len(line)))
+                offset += len(line)
+            await self._compact_if_needed()
+
+    async def replace(
+        self, record_id: str, data: dict[str, Any], expected: Mapping[str, Any] | None = None
+    ) -> WriteOutcome:
+        """
+        Overwrite a live record, if its fields match the non-None values of `expected` (compared once encoded).
+
+        The check and the write happen under the store lock, so no other write can slip in between.
+        """
+        line = _encode_line(record_id, data)
+        async with self._lock:
+            file = await self._open()
+            failure = await self._check_precondition(file, record_id, expected)
+            if failure is not None:
+                return failure
+            offset = await asyncio.to_thread(_append, file, line)
+            self._forget(record_id)
+            self._remember(record_id, data, (offset, len(line)))
+            await self._compact_if_needed()
+        return WriteOutcome.WRITTEN
+
+    async def delete(self, record_id: str, expected: Mapping[str, Any] | None = None) -> WriteOutcome:
+        """Delete a live record, if its fields match `expected` like in `replace`."""
+        line = _encode_line(record_id, None)
+        async with self._lock:
+            file = await self._open()
+            failure = await self._check_precondition(file, record_id, expected)
+            if failure is not None:
+                return failure
+            await asyncio.to_thread(_append, file, line)
+            self._forget(record_id)
+            self._dead_bytes += len(line)
+            await self._compact_if_needed()
+        return WriteOutcome.WRITTEN
+
+    async def replace_many(
+        self, records: list[tuple[str, dict[str, Any], Mapping[str, Any] | None]]
+    ) -> tuple[str, WriteOutcome] | None:
+        """
+        Overwrite many live records with a single append, each checked against its `expected` like in `replace`.
+
+        Either all of them are written or none: the first record that is missing or fails its check is returned
+        with the reason. The checks and the write happen under one store lock, as in `replace`.
+        """
+        lines = [_encode_line(record_id, data) for record_id, data, _ in records]
+        async with self._lock:
+            file = await self._open()
+            failure = await self._check_preconditions(
+                file, [(record_id, expected) for record_id, _, expected in records]
+            )
+            if failure is not None:
+                return failure
+            offset = await asyncio.to_thread(_append, file, b"".join(lines))
+            for (record_id, data, _), line in zip(records, lines, strict=True):
+                self._forget(record_id)
+                self._remember(record_id, data, (offset, len(line)))
+                offset += len(line)
+            await self._compact_if_needed()
+        return None
+
+    async def delete_many(self, records: list[tuple[str, Mapping[str, Any] | None]]) -> tuple[str, WriteOutcome] | None:
+        """
+        Delete many live records with a single append, each checked against its `expected` like in `delete`.
+
+        Either all of them are deleted or none, like in `replace_many`; an id given twice is deleted once.
+        """
+        expectations = dict(records)
+        async with self._lock:
+            file = await self._open()
+            failure = await self._check_preconditions(file, list(expectations.items()))
+            if failure is not None:
+                return failure
+            lines = [_encode_line(record_id, None) for record_id in expectations]
+            await asyncio.to_thread(_append, file, b"".join(lines))
+            for record_id, line in zip(expectations, lines, strict=True):
+                self._forget(record_id)
+                self._dead_bytes += len(line)
+            await self._compact_if_needed()
+        return None
+
+    async def compact(self) -> None:
+        async with self._lock:
+            await self._open()
+            await self._compact()
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    async def _open(self) -> BinaryIO:
+        if self._file is None:
+            file, records = await asyncio.to_thread(_replay, self._path)
+            for record_id, data, position in records:
+                self._forget(record_id)
+                if data is None:
+                    self._dead_bytes += position[1]
+                else:
+                    self._remember(record_id, data, position)
+            self._file = file
+            logger.debug("Opened %s: %d live records", self._path, len(self._positions))
+        return self._file
+
+    async def _check_precondition(
+        self, file: BinaryIO, record_id: str, expected: Mapping[str, Any] | None
+    ) -> WriteOutcome | None:
+        failure = await self._check_preconditions(file, [(record_id, expected)])
+        return None if failure is None else failure[1]
+
+    async def _check_preconditions(
+        self, file: BinaryIO, expectations: list[tuple[str, Mapping[str, Any] | None]]
+    ) -> tuple[str, WriteOutcome] | None:
+        """Return the first record that is missing or does not match its expected values, reading all in one go."""
+        checks: dict[str, dict[str, Any]] = {}
+        for record_id, expected in expectations:
+            if record_id not in self._positions:
+                return record_id, WriteOutcome.MISSING
+            values = {field: to_primitive(value) for field, value in (expected or {}).items() if value is not None}
+            if values:
+                checks[record_id] = values
+        if not checks:
+            return None
+        lines = await asyncio.to_thread(_read_lines, file, [self._positions[record_id] for record_id in checks])
+        for (record_id, values), line in zip(checks.items(), lines, strict=True):
+            data = _decode_line(line)["data"]
+            if any(data.get(field, self._field_defaults.get(field)) != value for field, value in values.items()):
+                return record_id, WriteOutcome.CONFLICT
+        return None
+
+    def _select_ids(
+        self, field: str, value: Any, order_by: str | None, *, descending: bool, limit: int | None
+    ) -> list[str]:
+        record_ids = self._ids_by_field[field].get(value, {})
+        if order_by is None:
+            return list(record_ids)[:limit]
+
+        def sort_key(record_id: str) -> tuple[Any, str]:
+            return self._field_values[record_id][order_by], record_id
+
+        if limit is None:
+            return sorted(record_ids, key=sort_key, reverse=descending)
+        select = heapq.nlargest if descending else heapq.nsmallest
+        return select(limit, record_ids, key=sort_key)
+
+    def _ordered_page(
+        self, record_ids: list[str], order_by: str, limit: int, cursor: str | None, *, descending: bool
+    ) -> tuple[list[str], str | None]:
+        entries = [(self._field_values[record_id][order_by], record_id) for record_id in record_ids]
+        if cursor is not None:
+            after = parse_keyset_cursor(cursor)
+            entries = [entry for entry in entries if (entry < after if descending else entry > after)]
+        select = heapq.nlargest if descending else heapq.nsmallest
+        entries = select(limit + 1, entries)
+        page = entries[:limit]
+        return [record_id for _, record_id in page], keyset_cursor(*page[-1]) if len(entries) > limit else None
+
+    def _remember(self, record_id: str, data: dict[str, Any], position: tuple[int, int]) -> None:
+        self._positions[record_id] = position
+        self._live_bytes += position[1]
+        values = {field: to_primitive(data.get(field)) for field in self._indexed_fields}
+        self._field_values[record_id] = values
+        for field, value in values.items():
+            self._ids_by_field[field][value][record_id] = None
+
+    def _forget(self, record_id: str) -> None:
+        position = self._positions.pop(record_id, None)
+        if position is None:
+            return
+        self._live_bytes -= position[1]
+        self._dead_bytes += position[1]
+        for field, value in self._field_values.pop(record_id).items():
+            ids = self._ids_by_field[field][value]
+            ids.pop(record_id)
+            if not ids:
+                del self._ids_by_field[field][value]
+
+    async def _compact_if_needed(self) -> None:
+        if self._dead_bytes >= self._compaction_min_bytes and self._dead_bytes > self._live_bytes:
+            await self._compact()
+
+    async def _compact(self) -> None:
+        if self._file is None:
+            return
+        old_file = self._file
+        self._file, self._positions = await asyncio.to_thread(_rewrite, self._path, old_file, self._positions)
+        old_file.close()
+        logger.info("Compacted %s: dropped %d bytes", self._path, self._dead_bytes)
+        self._dead_bytes = 0
+
+
+def _encode_line(record_id: str, data: dict[str, Any] | None) -> bytes:
+    payload = json.dumps({"id": record_id, "data": data}, cls=CustomJSONEncoder, ensure_ascii=False).encode()
+    return f"{zlib.crc32(payload):08x} ".encode() + payload + b"\n"
+
+
+def _decode_line(line: bytes) -> dict[str, Any]:
+    return json.loads(line[_CRC_PREFIX_LENGTH:-1])
+
+
+def _is_valid_line(line: bytes) -> bool:
+    if len(line) <= _CRC_PREFIX_LENGTH or not line.endswith(b"\n"):
+        return False
+    try:
+        expected_crc = int(line[: _CRC_PREFIX_LENGTH - 1], 16)
+    except ValueError:
+        return False
+    return zlib.crc32(line[_CRC_PREFIX_LENGTH:-1]) == expected_crc
+
+
+def _replay(path: Path) -> tuple[BinaryIO, list[tuple[str, dict[str, Any] | None, tuple[int, int]]]]:
+    path.with_name(f"{path.name}.compact").unlink(missing_ok=True)
+    file = path.open("a+b")
+    size = os.fstat(file.fileno()).st_size
+    file.seek(0)
+    records = []
+    offset = 0
+    for line in file:
+        if not _is_valid_line(line):
+            if offset + len(line) < size:
+                file.close()
+                raise CorruptedLogError(path, offset)
+            logger.warning("Truncating torn last record of %s at offset %d", path, offset)
+            file.truncate(offset)
+            break
+        record = _decode_line(line)
+        records.append((record["id"], record["data"], (offset, len(line))))
+        offset += len(line)
+    return file, records
+
+
+def _append(file: BinaryIO, line: bytes) -> int:
+    offset = file.seek(0, os.SEEK_END)
+    file.write(line)
+    file.flush()
+    return offset
+
+
+def _read_line(file: BinaryIO, position: tuple[int, int]) -> bytes:
+    offset, length = position
+    return os.pread(file.fileno(), length, offset)
+
+
+def _read_lines(file: BinaryIO, positions: list[tuple[int, int]]) -> list[bytes]:
+    return [_read_line(file, position) for position in positions]
+
+
+def _rewrite(
+    path: Path, file: BinaryIO, positions: dict[str, tuple[int, int]]
+) -> tuple[BinaryIO, dict[str, tuple[int, int]]]:
+    compact_path = path.with_name(f"{path.name}.compact")
+    new_positions = {}
+    with compact_path.open("wb") as compact_file:
+        offset = 0
+        for record_id, position in positions.items():
+            line = _read_line(file, position)
+            compact_file.write(line)
+            new_positions[record_id] = (offset, len(line))
+            offset += len(line)
+        compact_file.flush()
+        os.fsync(compact_file.fileno())
+    compact_path.replace(path)
+    fsync_dir(path.parent)
+    return path.open("a+b"), new_positions
@@ -0,0 +1,116 @@
+import logging
+from collections.abc import Mapping
+from dataclasses import asdict
+from datetime import UTC, datetime
+from pathlib import Path
+
+from domain.errors import ConcurrentUpdateError, TransactionNotFoundError
+from domain.models.transaction import Transaction
+from domain.repos.page import Page
+from domain.repos.transaction import TransactionRepo
+from domain.utils import utc_now
+from infra.repos.file.serializers import transaction_from_dict
+from infra.repos.log.store import LogStore, WriteOutcome
+
+logger = logging.getLogger(__name__)
+
+
+class TransactionLogRepo(TransactionRepo):
+    def __init__(self, path: Path = Path("data/transactions.log")) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._store = LogStore(path, indexed_fields=("user_id", "budget_id", "date"), field_defaults={"version": 1})
+
+    async def create(self, transaction: Transaction) -> None:
+        await self._store.put(transaction.id, asdict(transaction))
+        logger.debug("Created transaction %s", transaction.id)
+
+    async def create_many(self, transactions: list[Transaction]) -> None:
+        await self._store.put_many([(transaction.id, asdict(transaction)) for transaction in transactions])
+        logger.debug("Created %d transactions", len(transactions))
+
+    async def get_by_id(self, transaction_id: str) -> Transaction | None:
+        data = await self._store.get(transaction_id)
+        return transaction_from_dict(data) if data else None
+
+    async def get_by_ids(self, transaction_ids: list[str]) -> list[Transaction]:
+        return [transaction_from_dict(data) for data in await self._store.get_many(transaction_ids)]
+
+    async def get_by_user_id(self, user_id: str) -> list[Transaction]:
+        return [transaction_from_dict(data) for data in await self._store.get_many_by("user_id", user_id)]
+
+    async def get_by_budget_id(self, budget_id: str) -> list[Transaction]:
+        return [transaction_from_dict(data) for data in await self._store.get_many_by("budget_id", budget_id)]
+
+    async def get_by_date_range(
+        self, user_id: str, start: datetime, end: datetime, budget_id: str | None = None
+    ) -> list[Transaction]:
+        field, value = ("user_id", user_id) if budget_id is None else ("budget_id", budget_id)
+        records = await self._store.get_range_by(field, value, "date", start.astimezone(UTC), end.astimezone(UTC))
+        return [transaction_from_dict(data) for data in records if data["user_id"] == user_id]
+
+    async def get_page_by_user_id(self, user_id: str, limit: int, cursor: str | None = None) -> Page[Transaction]:
+        records, next_cursor = await self._store.get_page_by("user_id", user_id, limit, cursor)
+        return Page([transaction_from_dict(data) for data in records], next_cursor)
+
+    async def get_page_by_budget_id(self, budget_id: str, limit: int, cursor: str | None = None) -> Page[Transaction]:
+        records, next_cursor = await self._store.get_page_by("budget_id", budget_id, limit, cursor)
+        return Page([transaction_from_dict(data) for data in records], next_cursor)
+
+    async def update(self, transaction: Transaction) -> None:
+        updated_at = utc_now()
+        outcome = await self._store.replace(
+            transaction.id,
+            {**asdict(transaction), "updated_at": updated_at, "version": transaction.version + 1},
+            {"version": transaction.version},
+        )
+        if outcome is WriteOutcome.MISSING:
+            raise TransactionNotFoundError(transaction.id)
+        if outcome is WriteOutcome.CONFLICT:
+            raise ConcurrentUpdateError(transaction.id)
+        transaction.updated_at = updated_at
+        transaction.version += 1
+        logger.debug("Updated transaction %s", transaction.id)
+
+    async def update_many(self, transactions: list[Transaction]) -> None:
+        updated_at = utc_now()
+        failed = await self._store.replace_many(
+            [
+                (
+                    transaction.id,
+                    {**asdict(transaction), "updated_at": updated_at, "version": transaction.version + 1},
+                    {"version": transaction.version},
+                )
+                for transaction in transactions
+            ]
+        )
+        if failed is not None:
+            if failed[1] is WriteOutcome.CONFLICT:
+                raise ConcurrentUpdateError(failed[0])
+            raise TransactionNotFoundError(failed[0])
+        for transaction in transactions:
+            transaction.updated_at = updated_at
+            transaction.version += 1
+        logger.debug("Updated %d transactions", len(transactions))
+
+    async def delete(self, transaction_id: str, expected_version: int | None = None) -> bool:
+        outcome = await self._store.delete(transaction_id, {"version": expected_version})
+        if outcome is WriteOutcome.CONFLICT:
+            raise ConcurrentUpdateError(transaction_id)
+        if outcome is WriteOutcome.MISSING:
+            return False
+        logger.debug("Deleted transaction %s", transaction_id)
+        return True
+
+    async def delete_many(self, transaction_ids: list[str], expected_versions: Mapping[str, int] | None = None) -> None:
+        versions = expected_versions or {}
+        failed = await self._store.delete_many(
+            [(transaction_id, {"version": versions.get(transaction_id)}) for transaction_id in transaction_ids]
+        )
+        if failed is not None:
+            if failed[1] is WriteOutcome.CONFLICT:
+                raise ConcurrentUpdateError(failed[0])
+            raise TransactionNotFoundError(failed[0])
+        logger.debug("Deleted %d transactions", len(transaction_ids))
+
+    async def close(self) -> None:
+        await self._store.close()
@@ -0,0 +1,79 @@
+import logging
+import sqlite3
+from dataclasses import asdict
+
+from domain.models.aggregate import TransactionAggregate
+from domain.repos.aggregate import AggregateRepo
+from infra.repos.file.serializers import aggregate_from_dict
+from infra.repos.sqlite.database import SqliteDatabase, to_params
+
+logger = logging.getLogger(__name__)
+
+_SELECT_ONE = """
+SELECT total, count FROM transaction_aggregates
+WHERE user_id = :user_id AND month = :month AND budget_id = :budget_id AND category_id = :category_id AND type = :type
+"""
+_UPDATE_ONE = """
+UPDATE transaction_aggregates SET total = :total, count = :count
+WHERE user_id = :user_id AND month = :month AND budget_id = :budget_id AND category_id = :category_id AND type = :type
+"""
+_DELETE_ONE = """
+DELETE FROM transaction_aggregates
+WHERE user_id = :user_id AND month = :month AND budget_id = :budget_id AND category_id = :category_id AND type = :type
+"""
+
+
+class AggregateSqliteRepo(AggregateRepo):
+    def __init__(self, database: SqliteDatabase) -> None:
+        self._database = database
+
+    async def add(self, deltas: list[TransactionAggregate]) -> None:
+        # Totals are stored as exact decimal strings, so they are summed in Python inside one transaction
+        await self._database.run_in_transaction(lambda connection: _add(connection, deltas))
+        logger.debug("Applied %d aggregate deltas", len(deltas))
+
+    async def get_by_user_id(self, user_id: str, month: str | None = None) -> list[TransactionAggregate]:
+        if month is None:
+            rows = await self._database.fetch_all("SELECT * FROM transaction_aggregates WHERE user_id = ?", (user_id,))
+        else:
+            rows = await self._database.fetch_all(
+                "SELECT * FROM transaction_aggregates WHERE user_id = ? AND month = ?", (user_id, month)
+            )
+        return [aggregate_from_dict(row) for row in rows]
+
+    async def replace_by_user_id(self, user_id: str, aggregates: list[TransactionAggregate]) -> None:
+        await self._database.run_in_transaction(lambda connection: _replace(connection, user_id, aggregates))
+        logger.info("Replaced aggregates of user %s: %d rows", user_id, len(aggregates))
+
+
+def _add(connection: sqlite3.Connection, deltas: list[TransactionAggregate]) -> None:
+    for delta in deltas:
+        params = to_params(asdict(delta))
+        row = connection.execute(_SELECT_ONE, params).fetchone()
+        if row is None:
+            if delta.count > 0:
+                _insert(connection, delta)
+            continue
+        aggregate = aggregate_from_dict({**asdict(delta), "total": row["total"], "count": row["count"]})
+        aggregate.total += delta.total
+        aggregate.count += delta.count
+        if aggregate.count > 0:
+            connection.execute(_UPDATE_ONE, to_params(asdict(aggregate)))
+        else:
+            connection.execute(_DELETE_ONE, params)
+
+
+def _replace(connection: sqlite3.Connection, user_id: str, aggregates: list[TransactionAggregate]) -> None:
+    connection.execute("DELETE FROM transaction_aggregates WHERE user_id = ?", (user_id,))
+    for aggregate in aggregates:
+        _insert(connection, aggregate)
+
+
+def _insert(connection: sqlite3.Connection, aggregate: TransactionAggregate) -> None:
+    connection.execute(
+        """
+        INSERT INTO transaction_aggregates (user_id, month, budget_id, category_id, type, total, count)
+        VALUES (:user_id, :month, :budget_id, :category_id, :type, :total, :count)
+        """,
+        to_params(asdict(aggregate)),
+    )
@@ -0,0 +1,136 @@
+import logging
+from dataclasses import asdict
+
+from domain.errors import BudgetNotFoundError, ConcurrentUpdateError
+from domain.models.budget import Budget
+from domain.repos.budget import BudgetRepo
+from domain.repos.ordering import Ordering
+from domain.repos.page import Page, keyset_cursor, parse_keyset_cursor
+from domain.utils import utc_now
+from infra.repos.file.serializers import budget_from_dict
+from infra.repos.sqlite.database import SqliteDatabase, page_rows, to_params
+
+logger = logging.getLogger(__name__)
+
+_INSERT = """
+INSERT INTO budgets (id, name, balance, user_id, description, created_at, updated_at, initial_balance, version)
+VALUES (:id, :name, :balance, :user_id, :description, :created_at, :updated_at, :initial_balance, :version)
+"""
+
+_UPDATE = """
+UPDATE budgets
+SET name = :name, balance = :balance, user_id = :user_id, description = :description,
+    updated_at = :updated_at, initial_balance = :initial_balance, version = :version + 1
+WHERE id = :id AND (:expected_version IS NULL OR version = :expected_version)
+"""
+
+_DELETE = """
+DELETE FROM budgets WHERE id = :id AND (:expected_version IS NULL OR version = :expected_version)
+"""
+
+_SELECT_BY_USER_ID = {
+    None: "SELECT * FROM budgets WHERE user_id = ? LIMIT ?",
+    Ordering.OLDEST_FIRST: "SELECT * FROM budgets WHERE user_id = ? ORDER BY created_at, id LIMIT ?",
+    Ordering.NEWEST_FIRST: "SELECT * FROM budgets WHERE user_id = ? ORDER BY created_at DESC, id DESC LIMIT ?",
+}
+
+
+_SELECT_PAGE_BY_USER_ID_AFTER = {
+    Ordering.OLDEST_FIRST: (
+        "SELECT * FROM budgets WHERE user_id = ? AND (created_at, id) > (?, ?) ORDER BY created_at, id LIMIT ?"
+    ),
+    Ordering.NEWEST_FIRST: (
+        "SELECT * FROM budgets WHERE user_id = ? AND (created_at, id) < (?, ?) "
+        "ORDER BY created_at DESC, id DESC LIMIT ?"
+    ),
+}
+
+
+class BudgetSqliteRepo(BudgetRepo):
+    def __init__(self, database: SqliteDatabase) -> None:
+        self._database = database
+
+    async def create(self, budget: Budget) -> None:
+        await self._database.execute(_INSERT, to_params(asdict(budget)))
+        logger.debug("Created budget %s", budget.id)
+
+    async def create_many(self, budgets: list[Budget]) -> None:
+        await self._database.execute_many(_INSERT, [to_params(asdict(budget)) for budget in budgets])
+        logger.debug("Created %d budgets", len(budgets))
+
+    async def get_by_id(self, budget_id: str) -> Budget | None:
+        row = await self._database.fetch_one("SELECT * FROM budgets WHERE id = ?", (budget_id,))
+        return budget_from_dict(row) if row else None
+
+    async def get_by_user_id(
+        self, user_id: str, ordering: Ordering | None = None, limit: int | None = None
+    ) -> list[Budget]:
+        # A negative LIMIT means no limit in SQLite
+        rows = await self._database.fetch_all(_SELECT_BY_USER_ID[ordering], (user_id, -1 if limit is None else limit))
+        return [budget_from_dict(row) for row in rows]
+
+    async def get_page_by_user_id(
+        self, user_id: str, limit: int, cursor: str | None = None, ordering: Ordering | None = None
+    ) -> Page[Budget]:
+        if ordering is None:
+            rows = await self._database.fetch_all(
+                "SELECT * FROM budgets WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?",
+                (user_id, cursor or "", limit + 1),
+            )
+            rows, next_cursor = page_rows(rows, limit)
+            return Page([budget_from_dict(row) for row in rows], next_cursor)
+
+        if cursor is None:
+            rows = await self._database.fetch_all(_SELECT_BY_USER_ID[ordering], (user_id, limit + 1))
+        else:
+            rows = await self._database.fetch_all(
+                _SELECT_PAGE_BY_USER_ID_AFTER[ordering], (user_id, *parse_keyset_cursor(cursor), limit + 1)
+            )
+        page = rows[:limit]
+        next_cursor = keyset_cursor(page[-1]["created_at"], page[-1]["id"]) if len(rows) > limit else None
+        return Page([budget_from_dict(row) for row in page], next_cursor)
+
+    async def update(self, budget: Budget) -> None:
+        updated_at = utc_now()
+        params = to_params({**asdict(budget), "updated_at": updated_at, "expected_version": budget.version})
+        if not await self._database.execute(_UPDATE, params):
+            if await self._database.exists("budgets", budget.id):
+                raise ConcurrentUpdateError(budget.id)
+            raise BudgetNotFoundError(budget_id=budget.id)
+        budget.updated_at = updated_at
+        budget.version += 1
+        logger.debug("Updated budget %s", budget.id)
+
+    async def update_many(self, budgets: list[Budget]) -> None:
+        updated_at = utc_now()
+        params = [
+            to_params({**asdict(budget), "updated_at": updated_at, "expected_version": budget.version})
+            for budget in budgets
+        ]
+        missing, stale = await self._database.execute_many_if_current(
+            "budgets", {budget.id: budget.version for budget in budgets}, _UPDATE, params
+        )
+        if missing:
+            raise BudgetNotFoundError(budget_id=missing[0])
+        if stale:
+            raise ConcurrentUpdateError(stale[0])
+        for budget in budgets:
+            budget.updated_at = updated_at
+            budget.version += 1
+        logger.debug("Updated %d budgets", len(budgets))
+
+    async def delete(self, budget_id: str, expected_version: int | None = None) -> bool:
+        params = {"id": budget_id, "expected_version": expected_version}
+        if not await self._database.execute(_DELETE, params):
+            if expected_version is not None and await self._database.exists("budgets", budget_id):
+                raise ConcurrentUpdateError(budget_id)
+            return False
+        logger.debug("Deleted budget %s", budget_id)
+        return True
+
+    async def delete_many(self, budget_ids: list[str]) -> None:
+        params = [{"id": budget_id, "expected_version": None} for budget_id in budget_ids]
+        missing = await self._database.execute_many_if_exist("budgets", budget_ids, _DELETE, params)
+        if missing:
+            raise BudgetNotFoundError(budget_id=missing[0])
+        logger.debug("Deleted %d budgets", len(budget_ids))
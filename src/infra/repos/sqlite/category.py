@@ -0,0 +1,121 @@
+import logging
+from dataclasses import asdict
+
+from domain.errors import CategoryNotFoundError, ConcurrentUpdateError
+from domain.models.category import Category
+from domain.models.transaction import TransactionType
+from domain.repos.category import CategoryRepo
+from domain.repos.page import Page
+from domain.utils import utc_now
+from infra.repos.file.serializers import category_from_dict
+from infra.repos.sqlite.database import SqliteDatabase, page_rows, to_params
+
+logger = logging.getLogger(__name__)
+
+_INSERT = """
+INSERT INTO categories (id, name, user_id, transaction_type, description, created_at, updated_at, version)
+VALUES (:id, :name, :user_id, :transaction_type, :description, :created_at, :updated_at, :version)
+"""
+
+_UPDATE = """
+UPDATE categories
+SET name = :name, user_id = :user_id, transaction_type = :transaction_type,
+    description = :description, updated_at = :updated_at, version = :version + 1
+WHERE id = :id AND (:expected_version IS NULL OR version = :expected_version)
+"""
+
+_DELETE = """
+DELETE FROM categories WHERE id = :id AND (:expected_version IS NULL OR version = :expected_version)
+"""
+
+
+class CategorySqliteRepo(CategoryRepo):
+    def __init__(self, database: SqliteDatabase) -> None:
+        self._database = database
+
+    async def create(self, category: Category) -> None:
+        await self._database.execute(_INSERT, to_params(asdict(category)))
+        logger.debug("Created category %s", category.id)
+
+    async def create_many(self, categories: list[Category]) -> None:
+        await self._database.execute_many(_INSERT, [to_params(asdict(category)) for category in categories])
+        logger.debug("Created %d categories", len(categories))
+
+    async def get_by_id(self, category_id: str) -> Category | None:
+        row = await self._database.fetch_one("SELECT * FROM categories WHERE id = ?", (category_id,))
+        return category_from_dict(row) if row else None
+
+    async def get_by_user_id(self, user_id: str, transaction_type: TransactionType | None = None) -> list[Category]:
+        if transaction_type is None:
+            rows = await self._database.fetch_all("SELECT * FROM categories WHERE user_id = ?", (user_id,))
+        else:
+            rows = await self._database.fetch_all(
+                "SELECT * FROM categories WHERE user_id = ? AND transaction_type = ?",
+                (user_id, transaction_type.value),
+            )
+        return [category_from_dict(row) for row in rows]
+
+    async def get_page_by_user_id(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: str | None = None,
+        transaction_type: TransactionType | None = None,
+    ) -> Page[Category]:
+        if transaction_type is None:
+            rows = await self._database.fetch_all(
+                "SELECT * FROM categories WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?",
+                (user_id, cursor or "", limit + 1),
+            )
+        else:
+            rows = await self._database.fetch_all(
+                "SELECT * FROM categories WHERE user_id = ? AND transaction_type = ? AND id > ? ORDER BY id LIMIT ?",
+                (user_id, transaction_type.value, cursor or "", limit + 1),
+            )
+        rows, next_cursor = page_rows(rows, limit)
+        return Page([category_from_dict(row) for row in rows], next_cursor)
+
+    async def update(self, category: Category) -> None:
+        updated_at = utc_now()
+        params = to_params({**asdict(category), "updated_at": updated_at, "expected_version": category.version})
+        if not await self._database.execute(_UPDATE, params):
+            if await self._database.exists("categories", category.id):
+                raise ConcurrentUpdateError(category.id)
+            raise CategoryNotFoundError(category.id)
+        category.updated_at = updated_at
+        category.version += 1
+        logger.debug("Updated category %s", category.id)
+
+    async def update_many(self, categories: list[Category]) -> None:
+        updated_at = utc_now()
+        params = [
+            to_params({**asdict(category), "updated_at": updated_at, "expected_version": category.version})
+            for category in categories
+        ]
+        missing, stale = await self._database.execute_many_if_current(
+            "categories", {category.id: category.version for category in categories}, _UPDATE, params
+        )
+        if missing:
+            raise CategoryNotFoundError(missing[0])
+        if stale:
+            raise ConcurrentUpdateError(stale[0])
+        for category in categories:
+            category.updated_at = updated_at
+            category.version += 1
+        logger.debug("Updated %d categories", len(categories))
+
+    async def delete(self, category_id: str, expected_version: int | None = None) -> bool:
+        params = {"id": category_id, "expected_version": expected_version}
+        if not await self._database.execute(_DELETE, params):
+            if expected_version is not None and await self._database.exists("categories", category_id):
+                raise ConcurrentUpdateError(category_id)
+            return False
+        logger.debug("Deleted category %s", category_id)
+        return True
+
+    async def delete_many(self, category_ids: list[str]) -> None:
+        params = [{"id": category_id, "expected_version": None} for category_id in category_ids]
+        missing = await self._database.execute_many_if_exist("categories", category_ids, _DELETE, params)
+        if missing:
+            raise CategoryNotFoundError(missing[0])
+        logger.debug("Deleted %d categories", len(category_ids))
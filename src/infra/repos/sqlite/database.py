@@ -0,0 +1,221 @@
+import asyncio
+import json
+import logging
+import sqlite3
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from infra.repos.file.serializers import to_primitive
+
+logger = logging.getLogger(__name__)
+
+type SqlValue = str | bytes | int | float | None
+type SqlParams = Sequence[SqlValue] | Mapping[str, SqlValue]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS budgets (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    balance TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    description TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    initial_balance TEXT,
+    version INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS budgets_user_id_id ON budgets (user_id, id);
+CREATE INDEX IF NOT EXISTS budgets_user_id_created_at_id ON budgets (user_id, created_at, id);
+
+CREATE TABLE IF NOT EXISTS categories (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    transaction_type TEXT,
+    description TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    version INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS categories_user_id_transaction_type_id ON categories (user_id, transaction_type, id);
+CREATE INDEX IF NOT EXISTS categories_user_id_id ON categories (user_id, id);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT PRIMARY KEY,
+    budget_id TEXT NOT NULL,
+    category_id TEXT NOT NULL,
+    amount TEXT NOT NULL,
+    type TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    description TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    target_budget_id TEXT,
+    version INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_user_id_id ON transactions (user_id, id);
+CREATE INDEX IF NOT EXISTS transactions_budget_id_id ON transactions (budget_id, id);
+CREATE INDEX IF NOT EXISTS transactions_user_id_date_id ON transactions (user_id, date, id);
+CREATE INDEX IF NOT EXISTS transactions_budget_id_date_id ON transactions (budget_id, date, id);
+
+CREATE TABLE IF NOT EXISTS transaction_aggregates (
+    user_id TEXT NOT NULL,
+    month TEXT NOT NULL,
+    budget_id TEXT NOT NULL,
+    category_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    total TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (user_id, month, budget_id, category_id, type)
+);
+"""
+
+
+class SqliteDatabase:
+    """
+    One sqlite3 connection in WAL mode, shared by the SQLite repos.
+
+    The connection is created and used only by a dedicated worker thread, so queries never block the event loop
+    and never need cross-thread locking.
+    """
+
+    def __init__(self, path: Path = Path("data/rashodomer.sqlite3")) -> None:
+        self._path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self._connection: sqlite3.Connection | None = None
+
+    async def execute(self, sql: str, params: SqlParams = ()) -> int:
+        """Run a write statement in its own transaction and return the number of affected rows."""
+        return await self._run(lambda connection: _execute(connection, sql, params))
+
+    async def fetch_all(self, sql: str, params: SqlParams = ()) -> list[dict[str, Any]]:
+        return await self._run(lambda connection: [dict(row) for row in connection.execute(sql, params)])
+
+    async def fetch_one(self, sql: str, params: SqlParams = ()) -> dict[str, Any] | None:
+        rows = await self.fetch_all(sql, params)
+        return rows[0] if rows else None
+
+    async def exists(self, table: str, record_id: str) -> bool:
+        row = await self.fetch_one(f"SELECT 1 FROM {table} WHERE id = ?", (record_id,))  # noqa: S608 - table is a constant
+        return row is not None
+
+    async def execute_many(self, sql: str, params: Sequence[SqlParams]) -> None:
+        """Run a write statement once per set of `params`, all in one transaction."""
+        await self.run_in_transaction(lambda connection: connection.executemany(sql, params))
+
+    async def execute_many_if_exist(
+        self, table: str, ids: list[str], sql: str, params: Sequence[SqlParams]
+    ) -> list[str]:
+        """
+        Like `execute_many`, but only if every id in `ids` has a row in `table`.
+
+        Otherwise nothing is changed and the missing ids are returned. The check is one query whatever the number of
+        ids, and runs in the same transaction as the writes.
+        """
+        return await self.run_in_transaction(
+            lambda connection: _execute_many_if_exist(connection, table, ids, sql, params)
+        )
+
+    async def execute_many_if_current(
+        self, table: str, versions: Mapping[str, int], sql: str, params: Sequence[SqlParams]
+    ) -> tuple[list[str], list[str]]:
+        """
+        Like `execute_many_if_exist`, but also only if each row still has the version `versions` gives for its id.
+
+        Otherwise nothing is changed and the missing ids and the ids with another version are returned.
+        """
+        return await self.run_in_transaction(
+            lambda connection: _execute_many_if_current(connection, table, versions, sql, params)
+        )
+
+    async def run_in_transaction[T](self, work: Callable[[sqlite3.Connection], T]) -> T:
+        """Run `work` on the worker thread inside one transaction, for writes that span several statements."""
+        return await self._run(lambda connection: _in_transaction(connection, work))
+
+    async def close(self) -> None:
+        await self._run_raw(self._close)
+        self._executor.shutdown()
+
+    async def _run[T](self, query: Callable[[sqlite3.Connection], T]) -> T:
+        return await self._run_raw(lambda: query(self._connect()))
+
+    async def _run_raw[T](self, call: Callable[[], T]) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self._path)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+            logger.debug("Opened SQLite database %s", self._path)
+        return self._connection
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def page_rows(rows: list[dict[str, Any]], limit: int) -> tuple[list[dict[str, Any]], str | None]:
+    """Split the result of a keyset query fetched with `LIMIT limit + 1` into the page and its next cursor."""
+    page = rows[:limit]
+    return page, page[-1]["id"] if len(rows) > limit else None
+
+
+def to_params(data: Mapping[str, Any]) -> dict[str, Any]:
+    """Convert entity fields (`dataclasses.asdict` output) to values sqlite3 can bind."""
+    return {key: to_primitive(value) for key, value in data.items()}
+
+
+def _in_transaction[T](connection: sqlite3.Connection, work: Callable[[sqlite3.Connection], T]) -> T:
+    with connection:
+        return work(connection)
+
+
+def _execute(connection: sqlite3.Connection, sql: str, params: SqlParams) -> int:
+    with connection:
+        return connection.execute(sql, params).rowcount
+
+
+def _execute_many_if_exist(
+    connection: sqlite3.Connection,
+    table: str,
+    ids: list[str],
+    sql: str,
+    params: Sequence[SqlParams],
+) -> list[str]:
+    missing = [
+        row[0]
+        for row in connection.execute(
+            f"SELECT value FROM json_each(?) WHERE value NOT IN (SELECT id FROM {table})",  # noqa: S608 - table is a constant
+            (json.dumps(ids),),
+        )
+    ]
+    if not missing:
+        connection.executemany(sql, params)
+    return missing
+
+
+def _execute_many_if_current(
+    connection: sqlite3.Connection,
+    table: str,
+    versions: Mapping[str, int],
+    sql: str,
+    params: Sequence[SqlParams],
+) -> tuple[list[str], list[str]]:
+    rows = connection.execute(
+        f"SELECT ids.key, rows.version FROM json_each(?) AS ids LEFT JOIN {table} AS rows ON rows.id = ids.key",  # noqa: S608 - table is a constant
+        (json.dumps(versions),),
+    ).fetchall()
+    missing = [entity_id for entity_id, version in rows if version is None]
+    stale = [entity_id for entity_id, version in rows if version is not None and version != versions[entity_id]]
+    if not missing and not stale:
+        connection.executemany(sql, params)
+    return missing, stale
@@ -0,0 +1,159 @@
+import json
+import logging
+from collections.abc import Mapping
+from dataclasses import asdict
+from datetime import UTC, datetime
+
+from domain.errors import ConcurrentUpdateError, TransactionNotFoundError
+from domain.models.transaction import Transaction
+from domain.repos.page import Page
+from domain.repos.transaction import TransactionRepo
+from domain.utils import utc_now
+from infra.repos.file.serializers import transaction_from_dict
+from infra.repos.sqlite.database import SqliteDatabase, page_rows, to_params
+
+logger = logging.getLogger(__name__)
+
+_INSERT = """
+INSERT INTO transactions (
+    id, budget_id, category_id, amount, type, user_id, date, description, target_budget_id, created_at, updated_at,
+    version
+)
+VALUES (
+    :id, :budget_id, :category_id, :amount, :type, :user_id, :date, :description, :target_budget_id,
+    :created_at, :updated_at, :version
+)
+"""
+
+_UPDATE = """
+UPDATE transactions
+SET budget_id = :budget_id, category_id = :category_id, amount = :amount, type = :type,
+    user_id = :user_id, date = :date, description = :description, target_budget_id = :target_budget_id,
+    updated_at = :updated_at, version = :version + 1
+WHERE id = :id AND (:expected_version IS NULL OR version = :expected_version)
+"""
+
+_DELETE = """
+DELETE FROM transactions WHERE id = :id AND (:expected_version IS NULL OR version = :expected_version)
+"""
+
+
+class TransactionSqliteRepo(TransactionRepo):
+    def __init__(self, database: SqliteDatabase) -> None:
+        self._database = database
+
+    async def create(self, transaction: Transaction) -> None:
+        await self._database.execute(_INSERT, to_params(asdict(transaction)))
+        logger.debug("Created transaction %s", transaction.id)
+
+    async def create_many(self, transactions: list[Transaction]) -> None:
+        params = [to_params(asdict(transaction)) for transaction in transactions]
+        await self._database.execute_many(_INSERT, params)
+        logger.debug("Created %d transactions", len(transactions))
+
+    async def get_by_id(self, transaction_id: str) -> Transaction | None:
+        row = await self._database.fetch_one("SELECT * FROM transactions WHERE id = ?", (transaction_id,))
+        return transaction_from_dict(row) if row else None
+
+    async def get_by_ids(self, transaction_ids: list[str]) -> list[Transaction]:
+        rows = await self._database.fetch_all(
+            "SELECT * FROM transactions WHERE id IN (SELECT value FROM json_each(?))", (json.dumps(transaction_ids),)
+        )
+        return [transaction_from_dict(row) for row in rows]
+
+    async def get_by_user_id(self, user_id: str) -> list[Transaction]:
+        rows = await self._database.fetch_all("SELECT * FROM transactions WHERE user_id = ?", (user_id,))
+        return [transaction_from_dict(row) for row in rows]
+
+    async def get_by_budget_id(self, budget_id: str) -> list[Transaction]:
+        rows = await self._database.fetch_all("SELECT * FROM transactions WHERE budget_id = ?", (budget_id,))
+        return [transaction_from_dict(row) for row in rows]
+
+    async def get_by_date_range(
+        self, user_id: str, start: datetime, end: datetime, budget_id: str | None = None
+    ) -> list[Transaction]:
+        bounds = (start.astimezone(UTC).isoformat(), end.astimezone(UTC).isoformat())
+        if budget_id is None:
+            rows = await self._database.fetch_all(
+                "SELECT * FROM transactions WHERE user_id = ? AND date >= ? AND date < ? ORDER BY date, id",
+                (user_id, *bounds),
+            )
+        else:
+            rows = await self._database.fetch_all(
+                """
+                SELECT * FROM transactions
+                WHERE budget_id = ? AND user_id = ? AND date >= ? AND date < ?
+                ORDER BY date, id
+                """,
+                (budget_id, user_id, *bounds),
+            )
+        return [transaction_from_dict(row) for row in rows]
+
+    async def get_page_by_user_id(self, user_id: str, limit: int, cursor: str | None = None) -> Page[Transaction]:
+        rows = await self._database.fetch_all(
+            "SELECT * FROM transactions WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?",
+            (user_id, cursor or "", limit + 1),
+        )
+        rows, next_cursor = page_rows(rows, limit)
+        return Page([transaction_from_dict(row) for row in rows], next_cursor)
+
+    async def get_page_by_budget_id(self, budget_id: str, limit: int, cursor: str | None = None) -> Page[Transaction]:
+        rows = await self._database.fetch_all(
+            "SELECT * FROM transactions WHERE budget_id = ? AND id > ? ORDER BY id LIMIT ?",
+            (budget_id, cursor or "", limit + 1),
+        )
+        rows, next_cursor = page_rows(rows, limit)
+        return Page([transaction_from_dict(row) for row in rows], next_cursor)
+
+    async def update(self, transaction: Transaction) -> None:
+        updated_at = utc_now()
+        params = to_params({**asdict(transaction), "updated_at": updated_at, "expected_version": transaction.version})
+        if not await self._database.execute(_UPDATE, params):
+            if await self._database.exists("transactions", transaction.id):
+                raise ConcurrentUpdateError(transaction.id)
+            raise TransactionNotFoundError(transaction.id)
+        transaction.updated_at = updated_at
+        transaction.version += 1
+        logger.debug("Updated transaction %s", transaction.id)
+
+    async def update_many(self, transactions: list[Transaction]) -> None:
+        updated_at = utc_now()
+        params = [
+            to_params({**asdict(transaction), "updated_at": updated_at, "expected_version": transaction.version})
+            for transaction in transactions
+        ]
+        missing, stale = await self._database.execute_many_if_current(
+            "transactions", {transaction.id: transaction.version for transaction in transactions}, _UPDATE, params
+        )
+        if missing:
+            raise TransactionNotFoundError(missing[0])
+        if stale:
+            raise ConcurrentUpdateError(stale[0])
+        for transaction in transactions:
+            transaction.updated_at = updated_at
+            transaction.version += 1
+        logger.debug("Updated %d transactions", len(transactions))
+
+    async def delete(self, transaction_id: str, expected_version: int | None = None) -> bool:
+        params = {"id": transaction_id, "expected_version": expected_version}
+        if not await self._database.execute(_DELETE, params):
+            if expected_version is not None and await self._database.exists("transactions", transaction_id):
+                raise ConcurrentUpdateError(transaction_id)
+            return False
+        logger.debug("Deleted transaction %s", transaction_id)
+        return True
+
+    async def delete_many(self, transaction_ids: list[str], expected_versions: Mapping[str, int] | None = None) -> None:
+        if expected_versions is None:
+            params = [{"id": transaction_id, "expected_version": None} for transaction_id in transaction_ids]
+            missing = await self._database.execute_many_if_exist("transactions", transaction_ids, _DELETE, params)
+            stale = []
+        else:
+            versions = {transaction_id: expected_versions[transaction_id] for transaction_id in transaction_ids}
+            params = [{"id": entity_id, "expected_version": version} for entity_id, version in versions.items()]
+            missing, stale = await self._database.execute_many_if_current("transactions", versions, _DELETE, params)
+        if missing:
+            raise TransactionNotFoundError(missing[0])
+        if stale:
+            raise ConcurrentUpdateError(stale[0])
+        logger.debug("Deleted %d transactions", len(transaction_ids))
@@ -1,19 +1,66 @@
+import asyncio
 import logging
+import os
+from pathlib import Path
 
-from nicegui import ui
+from nicegui import app, ui
 
-from app_ui.dependencies import build_budget_controller
+from app_api.router import build_api_router
+from app_ui.constants import LEGACY_USER_ID
+from app_ui.dependencies import (
+    StorageBackend,
+    build_budget_repo,
+    build_category_repo,
+    build_user_sessions,
+    claim_legacy_user,
+    load_storage_secret,
+)
 from app_ui.pages.budgets import render_budgets_page
+from domain.models.budget import Budget
+from domain.use_cases.feed import ChangeFeed
+from domain.utils import uuid4_str
+from infra.repos.cached.channel import ChangeChannel
 
 logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
-budget_controller = build_budget_controller()
+# Multi-worker mode: start one process per core over the same `data/`, each with its own RASHODOMER_PORT and the
+# same RASHODOMER_CHANNEL_DIR, behind a proxy with sticky sessions (every NiceGUI client keeps a websocket open)
+channel_dir = os.environ.get("RASHODOMER_CHANNEL_DIR")
+channel = ChangeChannel(Path(channel_dir)) if channel_dir else None
+if channel is not None:
+    app.on_shutdown(channel.close)
+
+data_dir = Path("data")
+budget_repo = build_budget_repo(data_dir, StorageBackend.FILE, channel)
+budget_feed = ChangeFeed[Budget]()
+sessions = build_user_sessions(budget_repo, budget_feed, channel)
+category_repo = build_category_repo(data_dir, StorageBackend.FILE, channel)
+app.include_router(build_api_router(budget_repo, category_repo, budget_feed, channel))
+
+
+async def new_user_id() -> str:
+    if await asyncio.to_thread(claim_legacy_user, data_dir):
+        logger.info("Handing the data of %s to a new browser", LEGACY_USER_ID)
+        return LEGACY_USER_ID
+    return uuid4_str()
 
 
 @ui.page("/")
 async def budgets_page() -> None:
-    await render_budgets_page(budget_controller)
+    # Until there are accounts to log in to, every browser is a user of its own, kept by its session cookie
+    user_id = app.storage.user.get("user_id")
+    if user_id is None:
+        user_id = app.storage.user["user_id"] = await new_user_id()
+    controller = sessions.open(user_id)
+    ui.context.client.on_delete(lambda: sessions.close(user_id))
+    await render_budgets_page(controller)
 
 
 if __name__ in {"__main__", "__mp_main__"}:
-    ui.run(title="Rashodomer")
\ No newline at end of file
+    ui.run(
+        title="Rashodomer",
+        port=int(os.environ.get("RASHODOMER_PORT", "8080")),
+        reload=channel is None,
+        storage_secret=os.environ.get("RASHODOMER_STORAGE_SECRET") or load_storage_secret(data_dir),
+    )
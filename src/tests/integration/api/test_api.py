@@ -0,0 +1,158 @@
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+
+from app_api.router import build_api_router
+from domain.models.budget import Budget
+from domain.use_cases.feed import ChangeFeed
+from infra.repos.file.budget import BudgetFileRepo
+from infra.repos.file.category import CategoryFileRepo
+
+ALICE = {"X-User-Id": "5f0c6c1e-8a53-4b8e-9a5d-2f3c1b7e4a10"}
+BOB = {"X-User-Id": "b0b3a1f2-4c6d-4e8f-9a1b-3c5d7e9f1a2b"}
+
+
+@pytest.fixture
+def budget_feed() -> ChangeFeed[Budget]:
+    return ChangeFeed[Budget]()
+
+
+@pytest_asyncio.fixture
+async def client(tmp_path: Path, budget_feed: ChangeFeed[Budget]) -> AsyncIterator[httpx.AsyncClient]:
+    app = FastAPI()
+    app.include_router(
+        build_api_router(
+            BudgetFileRepo(base_dir=tmp_path / "budgets"),
+            CategoryFileRepo(base_dir=tmp_path / "categories"),
+            budget_feed,
+        )
+    )
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_budget_crud_with_versions(client: httpx.AsyncClient, budget_feed: ChangeFeed[Budget]) -> None:
+    pushed: list[str] = []
+    budget_feed.subscribe(lambda change: pushed.append(change.kind))
+
+    created = await client.post("/api/budgets", json={"name": "Card", "balance": "100.50"}, headers=ALICE)
+    assert created.status_code == 201
+    budget = created.json()
+    assert budget["balance"] == "100.50"
+    assert created.headers["ETag"] == '"1"'
+
+    stale = {**ALICE, "If-Match": '"1"'}
+    updated = await client.patch(f"/api/budgets/{budget['id']}", json={"name": "Main card"}, headers=stale)
+    assert updated.json()["name"] == "Main card"
+    assert updated.json()["version"] == 2
+    assert (await client.patch(f"/api/budgets/{budget['id']}", json={"name": "Lost"}, headers=stale)).status_code == 412
+    assert (await client.delete(f"/api/budgets/{budget['id']}", headers=stale)).status_code == 412
+
+    assert (await client.get(f"/api/budgets/{budget['id']}", headers=BOB)).status_code == 404
+    assert (await client.patch(f"/api/budgets/{budget['id']}", json={"name": None}, headers=ALICE)).status_code == 422
+    assert (await client.patch(f"/api/budgets/{budget['id']}", json={"balance": -1}, headers=ALICE)).status_code == 422
+    assert (
+        await client.delete(f"/api/budgets/{budget['id']}", headers={**ALICE, "If-Match": '"2"'})
+    ).status_code == 204
+    assert (await client.get(f"/api/budgets/{budget['id']}", headers=ALICE)).status_code == 404
+    assert pushed == ["upserted", "upserted", "deleted"]
+
+
+@pytest.mark.asyncio
+async def test_ids_unfit_for_file_names_are_not_found(client: httpx.AsyncClient) -> None:
+    assert (await client.get("/api/budgets/b%00", headers=ALICE)).status_code == 404
+    assert (await client.delete("/api/categories/c%00", headers=ALICE)).status_code == 404
+    batch = await client.post("/api/budgets/batch", json={"delete": ["b\u0000"]}, headers=ALICE)
+    assert batch.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_lists_revalidate_with_etags(client: httpx.AsyncClient) -> None:
+    await client.post("/api/budgets", json={"name": "Card", "balance": 10}, headers=ALICE)
+
+    listed = await client.get("/api/budgets", headers=ALICE)
+    etag = listed.headers["ETag"]
+    assert len(listed.json()["items"]) == 1
+
+    cached = await client.get("/api/budgets", headers={**ALICE, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    await client.post("/api/budgets", json={"name": "Cash", "balance": 5}, headers=ALICE)
+    changed = await client.get("/api/budgets", headers={**ALICE, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert len(changed.json()["items"]) == 2
+    assert (await client.get("/api/budgets", headers=BOB)).json() == {"items": [], "next_cursor": None}
+
+
+@pytest.mark.asyncio
+async def test_batch_is_all_or_nothing(client: httpx.AsyncClient) -> None:
+    batch = await client.post(
+        "/api/categories/batch",
+        json={"create": [{"name": "Food", "transaction_type": "expense"}, {"name": "Salary"}]},
+        headers=ALICE,
+    )
+    created = batch.json()["created"]
+    assert [category["name"] for category in created] == ["Food", "Salary"]
+
+    refused = await client.post(
+        "/api/categories/batch", json={"create": [{"name": "Rent"}], "delete": [created[0]["id"]]}, headers=BOB
+    )
+    assert refused.status_code == 404
+    invalid = await client.post(
+        "/api/categories/batch", json={"create": [{"name": "Rent"}, {"name": " "}]}, headers=ALICE
+    )
+    assert invalid.status_code == 422
+
+    deleted = await client.post("/api/categories/batch", json={"delete": [created[0]["id"]]}, headers=ALICE)
+    assert deleted.json() == {"created": [], "deleted": [created[0]["id"]]}
+    expenses = await client.get("/api/categories", params={"transaction_type": "expense"}, headers=ALICE)
+    assert expenses.json()["items"] == []
+    assert [category["name"] for category in (await client.get("/api/categories", headers=ALICE)).json()["items"]] == [
+        "Salary"
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("user_id", ["alice", "..", "../budgets", "5F0C6C1E-8A53-4B8E-9A5D-2F3C1B7E4A10"])
+async def test_user_ids_other_than_uuids_are_refused(client: httpx.AsyncClient, tmp_path: Path, user_id: str) -> None:
+    headers = {"X-User-Id": user_id}
+
+    assert (await client.get("/api/budgets", headers=headers)).status_code == 422
+    assert (await client.post("/api/budgets", json={"name": "Card", "balance": 1}, headers=headers)).status_code == 422
+    assert (await client.get("/api/budgets")).status_code == 422
+    assert not (tmp_path / "budgets" / "_index").exists()
+
+
+@pytest.mark.asyncio
+async def test_batch_undoes_creates_when_deletes_fail(
+    client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    kept = (await client.post("/api/budgets", json={"name": "Card", "balance": 1}, headers=ALICE)).json()
+    delete_many = BudgetFileRepo.delete_many
+    calls: list[list[str]] = []
+
+    async def fail_once(repo: BudgetFileRepo, budget_ids: list[str]) -> None:
+        calls.append(budget_ids)
+        if len(calls) == 1:
+            msg = "disk full"
+            raise OSError(msg)
+        await delete_many(repo, budget_ids)
+
+    monkeypatch.setattr(BudgetFileRepo, "delete_many", fail_once)
+
+    with pytest.raises(OSError, match="disk full"):
+        await client.post(
+            "/api/budgets/batch",
+            json={"create": [{"name": "Cash", "balance": 2}], "delete": [kept["id"]]},
+            headers=ALICE,
+        )
+
+    assert [budget["id"] for budget in (await client.get("/api/budgets", headers=ALICE)).json()["items"]] == [
+        kept["id"]
+    ]
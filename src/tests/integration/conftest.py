@@ -1,74 +1,220 @@
+from collections.abc import AsyncIterator
 from pathlib import Path
 
 import pytest
-
+import pytest_asyncio
+
+from app_ui.dependencies import StorageBackend
+from domain.repos.aggregate import AggregateRepo
+from domain.repos.budget import BudgetRepo
+from domain.repos.category import CategoryRepo
+from domain.repos.transaction import TransactionRepo
+from domain.use_cases.aggregate import GetMonthlyAggregates, RebuildAggregates
 from domain.use_cases.budget import CreateBudget, DeleteBudget, GetBudget, ListBudgets, UpdateBudget
 from domain.use_cases.category import CreateCategory, DeleteCategory, GetCategory, ListCategories, UpdateCategory
+from domain.use_cases.transaction import (
+    CreateTransaction,
+    DeleteTransaction,
+    GetTransaction,
+    ImportTransactions,
+    ListTransactions,
+    UpdateTransaction,
+    VerifyBudgetBalance,
+)
+from infra.repos.file.aggregate import AggregateFileRepo
 from infra.repos.file.budget import BudgetFileRepo
 from infra.repos.file.category import CategoryFileRepo
 from infra.repos.file.transaction import TransactionFileRepo
+from infra.repos.log.aggregate import AggregateLogRepo
+from infra.repos.log.budget import BudgetLogRepo
+from infra.repos.log.category import CategoryLogRepo
+from infra.repos.log.transaction import TransactionLogRepo
+from infra.repos.sqlite.aggregate import AggregateSqliteRepo
+from infra.repos.sqlite.budget import BudgetSqliteRepo
+from infra.repos.sqlite.category import CategorySqliteRepo
+from infra.repos.sqlite.database import SqliteDatabase
+from infra.repos.sqlite.transaction import TransactionSqliteRepo
+
+
+@pytest.fixture(params=list(StorageBackend))
+def storage_backend(request: pytest.FixtureRequest) -> StorageBackend:
+    return request.param
+
+
+@pytest_asyncio.fixture
+async def sqlite_database(tmp_path: Path) -> AsyncIterator[SqliteDatabase]:
+    database = SqliteDatabase(tmp_path / "rashodomer.sqlite3")
+    yield database
+    await database.close()
+
+
+@pytest_asyncio.fixture
+async def budget_repo(
+    tmp_path: Path, storage_backend: StorageBackend, sqlite_database: SqliteDatabase
+) -> AsyncIterator[BudgetRepo]:
+    match storage_backend:
+        case StorageBackend.FILE:
+            yield BudgetFileRepo(base_dir=tmp_path / "budgets")
+        case StorageBackend.LOG:
+            repo = BudgetLogRepo(path=tmp_path / "budgets.log")
+            yield repo
+            await repo.close()
+        case StorageBackend.SQLITE:
+            yield BudgetSqliteRepo(sqlite_database)
+
+
+@pytest_asyncio.fixture
+async def category_repo(
+    tmp_path: Path, storage_backend: StorageBackend, sqlite_database: SqliteDatabase
+) -> AsyncIterator[CategoryRepo]:
+    match storage_backend:
+        case StorageBackend.FILE:
+            yield CategoryFileRepo(base_dir=tmp_path / "categories")
+        case StorageBackend.LOG:
+            repo = CategoryLogRepo(path=tmp_path / "categories.log")
+            yield repo
+            await repo.close()
+        case StorageBackend.SQLITE:
+            yield CategorySqliteRepo(sqlite_database)
+
+
+@pytest_asyncio.fixture
+async def transaction_repo(
+    tmp_path: Path, storage_backend: StorageBackend, sqlite_database: SqliteDatabase
+) -> AsyncIterator[TransactionRepo]:
+    match storage_backend:
+        case StorageBackend.FILE:
+            yield TransactionFileRepo(base_dir=tmp_path / "transactions")
+        case StorageBackend.LOG:
+            repo = TransactionLogRepo(path=tmp_path / "transactions.log")
+            yield repo
+            await repo.close()
+        case StorageBackend.SQLITE:
+            yield TransactionSqliteRepo(sqlite_database)
+
+
+@pytest_asyncio.fixture
+async def aggregate_repo(
+    tmp_path: Path, storage_backend: StorageBackend, sqlite_database: SqliteDatabase
+) -> AsyncIterator[AggregateRepo]:
+    match storage_backend:
+        case StorageBackend.FILE:
+            yield AggregateFileRepo(base_dir=tmp_path / "aggregates")
+        case StorageBackend.LOG:
+            repo = AggregateLogRepo(path=tmp_path / "aggregates.log")
+            yield repo
+            await repo.close()
+        case StorageBackend.SQLITE:
+            yield AggregateSqliteRepo(sqlite_database)
 
 
 @pytest.fixture
-def budget_repo(tmp_path: Path) -> BudgetFileRepo:
-    return BudgetFileRepo(base_dir=tmp_path / "budgets")
-
-
-@pytest.fixture
-def category_repo(tmp_path: Path) -> CategoryFileRepo:
-    return CategoryFileRepo(base_dir=tmp_path / "categories")
-
-
-@pytest.fixture
-def transaction_repo(tmp_path: Path) -> TransactionFileRepo:
-    return TransactionFileRepo(base_dir=tmp_path / "transactions")
-
-
-@pytest.fixture
-def create_budget(budget_repo: BudgetFileRepo) -> CreateBudget:
+def create_budget(budget_repo: BudgetRepo) -> CreateBudget:
     return CreateBudget(budget_repo)
 
 
 @pytest.fixture
-def get_budget(budget_repo: BudgetFileRepo) -> GetBudget:
+def get_budget(budget_repo: BudgetRepo) -> GetBudget:
     return GetBudget(budget_repo)
 
 
 @pytest.fixture
-def list_budgets(budget_repo: BudgetFileRepo) -> ListBudgets:
+def list_budgets(budget_repo: BudgetRepo) -> ListBudgets:
     return ListBudgets(budget_repo)
 
 
 @pytest.fixture
-def update_budget(budget_repo: BudgetFileRepo) -> UpdateBudget:
+def update_budget(budget_repo: BudgetRepo) -> UpdateBudget:
     return UpdateBudget(budget_repo)
 
 
 @pytest.fixture
-def delete_budget(budget_repo: BudgetFileRepo) -> DeleteBudget:
+def delete_budget(budget_repo: BudgetRepo) -> DeleteBudget:
     return DeleteBudget(budget_repo)
 
 
 @pytest.fixture
-def create_category(category_repo: CategoryFileRepo) -> CreateCategory:
+def create_category(category_repo: CategoryRepo) -> CreateCategory:
     return CreateCategory(category_repo)
 
 
 @pytest.fixture
-def get_category(category_repo: CategoryFileRepo) -> GetCategory:
+def get_category(category_repo: CategoryRepo) -> GetCategory:
     return GetCategory(category_repo)
 
 
 @pytest.fixture
-def list_categories(category_repo: CategoryFileRepo) -> ListCategories:
+def list_categories(category_repo: CategoryRepo) -> ListCategories:
     return ListCategories(category_repo)
 
 
 @pytest.fixture
-def update_category(category_repo: CategoryFileRepo) -> UpdateCategory:
+def update_category(category_repo: CategoryRepo) -> UpdateCategory:
     return UpdateCategory(category_repo)
 
 
 @pytest.fixture
-def delete_category(category_repo: CategoryFileRepo) -> DeleteCategory:
+def delete_category(category_repo: CategoryRepo) -> DeleteCategory:
     return DeleteCategory(category_repo)
+
+
+@pytest.fixture
+def create_transaction(
+    transaction_repo: TransactionRepo,
+    budget_repo: BudgetRepo,
+    category_repo: CategoryRepo,
+    aggregate_repo: AggregateRepo,
+) -> CreateTransaction:
+    return CreateTransaction(transaction_repo, budget_repo, category_repo, aggregate_repo)
+
+
+@pytest.fixture
+def get_transaction(transaction_repo: TransactionRepo) -> GetTransaction:
+    return GetTransaction(transaction_repo)
+
+
+@pytest.fixture
+def list_transactions(transaction_repo: TransactionRepo) -> ListTransactions:
+    return ListTransactions(transaction_repo)
+
+
+@pytest.fixture
+def update_transaction(
+    transaction_repo: TransactionRepo,
+    budget_repo: BudgetRepo,
+    category_repo: CategoryRepo,
+    aggregate_repo: AggregateRepo,
+) -> UpdateTransaction:
+    return UpdateTransaction(transaction_repo, budget_repo, category_repo, aggregate_repo)
+
+
+@pytest.fixture
+def delete_transaction(
+    transaction_repo: TransactionRepo, budget_repo: BudgetRepo, aggregate_repo: AggregateRepo
+) -> DeleteTransaction:
+    return DeleteTransaction(transaction_repo, budget_repo, aggregate_repo)
+
+
+@pytest.fixture
+def import_transactions(
+    transaction_repo: TransactionRepo,
+    budget_repo: BudgetRepo,
+    category_repo: CategoryRepo,
+    aggregate_repo: AggregateRepo,
+) -> ImportTransactions:
+    return ImportTransactions(transaction_repo, budget_repo, category_repo, aggregate_repo)
+
+
+@pytest.fixture
+def verify_budget_balance(budget_repo: BudgetRepo, transaction_repo: TransactionRepo) -> VerifyBudgetBalance:
+    return VerifyBudgetBalance(budget_repo, transaction_repo)
+
+
+@pytest.fixture
+def get_monthly_aggregates(aggregate_repo: AggregateRepo) -> GetMonthlyAggregates:
+    return GetMonthlyAggregates(aggregate_repo)
+
+
+@pytest.fixture
+def rebuild_aggregates(aggregate_repo: AggregateRepo, transaction_repo: TransactionRepo) -> RebuildAggregates:
+    return RebuildAggregates(aggregate_repo, transaction_repo)
@@ -0,0 +1,66 @@
+"""Straightforward `Decimal` implementations of the reports in `domain.analytics.columnar`, to check and time them."""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import datetime
+from decimal import Decimal
+
+from domain.analytics.report import GroupBy, Period, PeriodComparison
+from domain.models.aggregate import month_of
+from domain.models.transaction import Transaction, TransactionType
+
+
+def group_sums(
+    transactions: Iterable[Transaction], by: GroupBy, transaction_type: TransactionType | None = None
+) -> dict[str, Decimal]:
+    sums: defaultdict[str, Decimal] = defaultdict(Decimal)
+    for transaction in transactions:
+        if transaction_type is None or transaction.type is transaction_type:
+            sums[_group_label(transaction, by)] += transaction.amount
+    return dict(sums)
+
+
+def running_balance(
+    transactions: Iterable[Transaction], budget_id: str, initial_balance: Decimal
+) -> list[tuple[datetime, Decimal]]:
+    balance = initial_balance
+    balances = []
+    for transaction in sorted(transactions, key=lambda transaction: (transaction.date, transaction.id)):
+        if transaction.budget_id == budget_id:
+            balance += transaction.amount if transaction.type is TransactionType.INCOME else -transaction.amount
+        elif transaction.target_budget_id == budget_id and transaction.type is TransactionType.TRANSFER:
+            balance += transaction.amount
+        else:
+            continue
+        balances.append((transaction.date, balance))
+    return balances
+
+
+def compare_periods(
+    transactions: Iterable[Transaction],
+    by: GroupBy,
+    previous: Period,
+    current: Period,
+    transaction_type: TransactionType | None = None,
+) -> dict[str, PeriodComparison]:
+    transactions = list(transactions)
+    previous_sums = group_sums(_within(transactions, previous), by, transaction_type)
+    current_sums = group_sums(_within(transactions, current), by, transaction_type)
+    return {
+        label: PeriodComparison(previous_sums.get(label, Decimal(0)), current_sums.get(label, Decimal(0)))
+        for label in previous_sums.keys() | current_sums.keys()
+    }
+
+
+def _within(transactions: list[Transaction], period: Period) -> list[Transaction]:
+    return [transaction for transaction in transactions if period.start <= transaction.date < period.end]
+
+
+def _group_label(transaction: Transaction, by: GroupBy) -> str:
+    match by:
+        case GroupBy.BUDGET:
+            return transaction.budget_id
+        case GroupBy.CATEGORY:
+            return transaction.category_id
+        case GroupBy.MONTH:
+            return month_of(transaction.date)
@@ -0,0 +1,108 @@
+import random
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from domain.analytics import columnar
+from domain.analytics.report import GroupBy, Period
+from domain.errors import InexactAmountError
+from domain.models.transaction import Transaction, TransactionType
+from tests.integration.domain.analytics import reference
+
+BUDGET_IDS = ["b_1", "b_2", "b_3"]
+START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _random_transactions(count: int, seed: int = 42) -> list[Transaction]:
+    rng = random.Random(seed)  # noqa: S311 - deterministic test data
+    transactions = []
+    for number in range(count):
+        transaction_type = rng.choice(list(TransactionType))
+        budget_id = rng.choice(BUDGET_IDS)
+        target_budget_id = None
+        if transaction_type is TransactionType.TRANSFER:
+            target_budget_id = rng.choice([other for other in BUDGET_IDS if other != budget_id])
+        transactions.append(
+            Transaction(
+                id=f"t_{number:05d}",
+                budget_id=budget_id,
+                category_id=f"c_{rng.randrange(5)}",
+                amount=Decimal(rng.randrange(1, 10_000_000)).scaleb(-2),
+                type=transaction_type,
+                user_id="u_1",
+                date=START + timedelta(minutes=rng.randrange(2 * 365 * 24 * 60)),
+                target_budget_id=target_budget_id,
+            )
+        )
+    return transactions
+
+
+@pytest.mark.parametrize("by", list(GroupBy))
+@pytest.mark.parametrize("transaction_type", [None, *TransactionType])
+def test_group_sums_match_reference(by: GroupBy, transaction_type: TransactionType | None) -> None:
+    transactions = _random_transactions(2000)
+    columns = columnar.build_columns(transactions)
+
+    assert columnar.group_sums(columns, by, transaction_type) == reference.group_sums(
+        transactions, by, transaction_type
+    )
+
+
+@pytest.mark.parametrize("budget_id", [*BUDGET_IDS, "b_missing"])
+def test_running_balance_matches_reference(budget_id: str) -> None:
+    transactions = _random_transactions(2000)
+    columns = columnar.build_columns(transactions)
+    initial_balance = Decimal("1234.56")
+
+    assert columnar.running_balance(columns, budget_id, initial_balance) == reference.running_balance(
+        transactions, budget_id, initial_balance
+    )
+
+
+def test_compare_periods_matches_reference() -> None:
+    transactions = _random_transactions(2000)
+    columns = columnar.build_columns(transactions)
+    previous = Period(datetime(2024, 1, 1, tzinfo=UTC), datetime(2025, 1, 1, tzinfo=UTC))
+    current = Period(datetime(2025, 1, 1, tzinfo=UTC), datetime(2026, 1, 1, tzinfo=UTC))
+
+    comparison = columnar.compare_periods(columns, GroupBy.CATEGORY, previous, current, TransactionType.EXPENSE)
+
+    assert comparison == reference.compare_periods(
+        transactions, GroupBy.CATEGORY, previous, current, TransactionType.EXPENSE
+    )
+    assert all(result.change == result.current - result.previous for result in comparison.values())
+
+
+def test_sums_stay_exact_beyond_float_precision() -> None:
+    amount = Decimal("90071992547409.93")
+    transactions = [
+        Transaction(
+            id=f"t_{number}",
+            budget_id="b_1",
+            category_id="c_1",
+            amount=amount,
+            type=TransactionType.INCOME,
+            user_id="u_1",
+            date=START,
+        )
+        for number in range(3)
+    ]
+
+    sums = columnar.group_sums(columnar.build_columns(transactions), GroupBy.BUDGET)
+
+    assert sums == {"b_1": amount * 3}
+
+
+def test_sub_cent_amounts_are_rejected() -> None:
+    transaction = Transaction(
+        id="t_1",
+        budget_id="b_1",
+        category_id="c_1",
+        amount=Decimal("0.001"),
+        type=TransactionType.EXPENSE,
+        user_id="u_1",
+    )
+
+    with pytest.raises(InexactAmountError):
+        columnar.build_columns([transaction])
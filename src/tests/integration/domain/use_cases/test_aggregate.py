@@ -0,0 +1,90 @@
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+
+from domain.errors import InvalidMonthError
+from domain.models.aggregate import TransactionAggregate
+from domain.models.category import Category
+from domain.models.transaction import TransactionType
+from domain.repos.aggregate import AggregateRepo
+from domain.repos.category import CategoryRepo
+from domain.use_cases.aggregate import GetMonthlyAggregates, RebuildAggregates
+from domain.use_cases.budget import CreateBudget
+from domain.use_cases.transaction import CreateTransaction, DeleteTransaction, UpdateTransaction
+
+USER_ID = "user-1"
+MARCH = datetime(2025, 3, 10, tzinfo=UTC)
+APRIL = datetime(2025, 4, 2, tzinfo=UTC)
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def categories(category_repo: CategoryRepo) -> None:
+    await category_repo.create_many(
+        [Category(id=category_id, name=category_id, user_id=USER_ID) for category_id in ("food", "salary")]
+    )
+
+
+def _summary(aggregates: list[TransactionAggregate]) -> set[tuple[str, TransactionType, Decimal, int]]:
+    return {(aggregate.category_id, aggregate.type, aggregate.total, aggregate.count) for aggregate in aggregates}
+
+
+@pytest.mark.asyncio
+async def test_transaction_writes_update_aggregates(
+    create_budget: CreateBudget,
+    create_transaction: CreateTransaction,
+    update_transaction: UpdateTransaction,
+    delete_transaction: DeleteTransaction,
+    get_monthly_aggregates: GetMonthlyAggregates,
+) -> None:
+    budget = await create_budget.execute(name="Main", balance=Decimal(1000), user_id=USER_ID)
+    food = await create_transaction.execute(
+        budget.id, "food", Decimal(10), TransactionType.EXPENSE, USER_ID, date=MARCH
+    )
+    await create_transaction.execute(budget.id, "food", Decimal(5), TransactionType.EXPENSE, USER_ID, date=MARCH)
+    salary = await create_transaction.execute(
+        budget.id, "salary", Decimal(300), TransactionType.INCOME, USER_ID, date=MARCH
+    )
+    await create_transaction.execute(budget.id, "food", Decimal(7), TransactionType.EXPENSE, USER_ID, date=APRIL)
+
+    assert _summary(await get_monthly_aggregates.execute(USER_ID, 2025, 3)) == {
+        ("food", TransactionType.EXPENSE, Decimal(15), 2),
+        ("salary", TransactionType.INCOME, Decimal(300), 1),
+    }
+
+    await update_transaction.execute(food.id, date=APRIL, amount=Decimal(3))
+    await delete_transaction.execute(salary.id)
+
+    assert _summary(await get_monthly_aggregates.execute(USER_ID, 2025, 3)) == {
+        ("food", TransactionType.EXPENSE, Decimal(5), 1),
+    }
+    assert _summary(await get_monthly_aggregates.execute(USER_ID, 2025, 4)) == {
+        ("food", TransactionType.EXPENSE, Decimal(10), 2),
+    }
+
+
+@pytest.mark.asyncio
+async def test_rebuild_aggregates_from_transactions(
+    create_budget: CreateBudget,
+    create_transaction: CreateTransaction,
+    rebuild_aggregates: RebuildAggregates,
+    aggregate_repo: AggregateRepo,
+) -> None:
+    budget = await create_budget.execute(name="Main", balance=Decimal(1000), user_id=USER_ID)
+    await create_transaction.execute(budget.id, "food", Decimal(10), TransactionType.EXPENSE, USER_ID, date=MARCH)
+    await create_transaction.execute(budget.id, "food", Decimal(7), TransactionType.EXPENSE, USER_ID, date=APRIL)
+    expected = _summary(await aggregate_repo.get_by_user_id(USER_ID))
+    await aggregate_repo.replace_by_user_id(USER_ID, [])
+    assert await aggregate_repo.get_by_user_id(USER_ID) == []
+
+    rebuilt = await rebuild_aggregates.execute(USER_ID)
+
+    assert _summary(rebuilt) == expected
+    assert _summary(await aggregate_repo.get_by_user_id(USER_ID)) == expected
+
+
+@pytest.mark.asyncio
+async def test_get_monthly_aggregates_invalid_month(get_monthly_aggregates: GetMonthlyAggregates) -> None:
+    with pytest.raises(InvalidMonthError):
+        await get_monthly_aggregates.execute(USER_ID, 2025, 13)
@@ -1,9 +1,20 @@
+import asyncio
 from decimal import Decimal
 
 import pytest
 
-from domain.errors import BudgetNotFoundError, EmptyNameError, NegativeBalanceError
+from domain.errors import (
+    BudgetNotFoundError,
+    ConcurrentUpdateError,
+    EmptyNameError,
+    InvalidPageLimitError,
+    NegativeBalanceError,
+)
+from domain.models.budget import Budget, BudgetDraft
+from domain.repos.budget import BudgetRepo
+from domain.repos.ordering import Ordering
 from domain.use_cases.budget import CreateBudget, DeleteBudget, GetBudget, ListBudgets, UpdateBudget
+from domain.use_cases.feed import ChangeFeed
 
 
 @pytest.mark.asyncio
@@ -33,6 +44,21 @@ async def test_create_budget_empty_name(create_budget: CreateBudget) -> None:
         await create_budget.execute(name="   ", balance=Decimal(100), user_id="user-123")
 
 
+@pytest.mark.asyncio
+async def test_create_many_budgets_is_all_or_nothing(create_budget: CreateBudget, list_budgets: ListBudgets) -> None:
+    with pytest.raises(NegativeBalanceError):
+        await create_budget.execute_many(
+            [BudgetDraft("Card", Decimal(10)), BudgetDraft("Debt", Decimal(-1))], user_id="user-1"
+        )
+    assert await list_budgets.execute("user-1") == []
+
+    created = await create_budget.execute_many(
+        [BudgetDraft("Card", Decimal(10)), BudgetDraft("Cash", Decimal(5), "Wallet")], user_id="user-1"
+    )
+
+    assert sorted(await list_budgets.execute("user-1"), key=lambda budget: budget.name) == created
+
+
 @pytest.mark.asyncio
 async def test_create_budget_negative_balance(create_budget: CreateBudget) -> None:
     with pytest.raises(NegativeBalanceError, match="Balance cannot be negative: -50"):
@@ -74,6 +100,69 @@ async def test_list_budgets_multiple(list_budgets: ListBudgets, create_budget: C
     assert budget2 in budgets
 
 
+@pytest.mark.asyncio
+async def test_list_budgets_latest(list_budgets: ListBudgets, create_budget: CreateBudget) -> None:
+    user_id = "user-latest"
+    created = [await create_budget.execute(name=f"Budget {n}", balance=Decimal(n), user_id=user_id) for n in range(3)]
+
+    latest = await list_budgets.execute(user_id, Ordering.NEWEST_FIRST, limit=2)
+
+    expected = sorted(created, key=lambda budget: (budget.created_at, budget.id), reverse=True)[:2]
+    assert latest == expected
+
+
+@pytest.mark.asyncio
+async def test_list_budgets_page_and_stream(list_budgets: ListBudgets, create_budget: CreateBudget) -> None:
+    user_id = "user-paged"
+    created = [await create_budget.execute(name=f"Budget {n}", balance=Decimal(n), user_id=user_id) for n in range(3)]
+    expected_ids = sorted(budget.id for budget in created)
+
+    first = await list_budgets.execute_page(user_id, limit=2)
+    rest = await list_budgets.execute_page(user_id, limit=2, cursor=first.next_cursor)
+    streamed = [budget async for budget in list_budgets.stream(user_id)]
+
+    assert [budget.id for budget in first.items + rest.items] == expected_ids
+    assert rest.next_cursor is None
+    assert [budget.id for budget in streamed] == expected_ids
+
+
+@pytest.mark.asyncio
+async def test_list_budgets_pages_newest_first(list_budgets: ListBudgets, create_budget: CreateBudget) -> None:
+    user_id = "user-paged-latest"
+    created = [await create_budget.execute(name=f"Budget {n}", balance=Decimal(n), user_id=user_id) for n in range(5)]
+    expected = sorted(created, key=lambda budget: (budget.created_at, budget.id), reverse=True)
+
+    pages = [await list_budgets.execute_page(user_id, limit=2, ordering=Ordering.NEWEST_FIRST)]
+    while pages[-1].next_cursor is not None:
+        pages.append(await list_budgets.execute_page(user_id, 2, pages[-1].next_cursor, Ordering.NEWEST_FIRST))
+    oldest = await list_budgets.execute_page(user_id, limit=10, ordering=Ordering.OLDEST_FIRST)
+
+    assert [budget for page in pages for budget in page.items] == expected
+    assert len(pages) == 3
+    assert oldest.items == expected[::-1]
+
+
+@pytest.mark.asyncio
+async def test_list_budgets_page_invalid_limit(list_budgets: ListBudgets) -> None:
+    with pytest.raises(InvalidPageLimitError):
+        await list_budgets.execute_page("user-1", limit=0)
+
+
+@pytest.mark.asyncio
+async def test_list_budgets_shares_reads_until_a_write(budget_repo: BudgetRepo) -> None:
+    feed = ChangeFeed[Budget]()
+    list_budgets, create_budget = ListBudgets(budget_repo, feed), CreateBudget(budget_repo, feed)
+    await create_budget.execute(name="First", balance=Decimal(10), user_id="user-1")
+
+    first, second = await asyncio.gather(list_budgets.execute("user-1"), list_budgets.execute("user-1"))
+    assert first is second
+    assert await list_budgets.execute("user-1") is first
+
+    await create_budget.execute(name="Second", balance=Decimal(20), user_id="user-1")
+
+    assert len(await list_budgets.execute("user-1")) == 2
+
+
 @pytest.mark.asyncio
 async def test_update_budget_full_update(update_budget: UpdateBudget, create_budget: CreateBudget) -> None:
     budget = await create_budget.execute(
@@ -168,3 +257,74 @@ async def test_delete_budget_success(
 async def test_delete_budget_not_found(delete_budget: DeleteBudget) -> None:
     with pytest.raises(BudgetNotFoundError, match="Budget with id 'missing' not found"):
         await delete_budget.execute("missing")
+
+
+@pytest.mark.asyncio
+async def test_delete_many_budgets(
+    delete_budget: DeleteBudget, create_budget: CreateBudget, get_budget: GetBudget
+) -> None:
+    first = await create_budget.execute(name="First", balance=Decimal(0), user_id="user-123")
+    second = await create_budget.execute(name="Second", balance=Decimal(0), user_id="user-123")
+
+    with pytest.raises(BudgetNotFoundError):
+        await delete_budget.execute_many([first.id, "missing"])
+    await delete_budget.execute_many([first.id, second.id])
+
+    with pytest.raises(BudgetNotFoundError):
+        await get_budget.execute(first.id)
+    with pytest.raises(BudgetNotFoundError):
+        await get_budget.execute(second.id)
+
+
+@pytest.mark.asyncio
+async def test_update_many_budgets_is_all_or_nothing(
+    update_budget: UpdateBudget, create_budget: CreateBudget, get_budget: GetBudget
+) -> None:
+    card = await create_budget.execute(name="Card", balance=Decimal(100), user_id="user-123")
+    cash = await create_budget.execute(name="Cash", balance=Decimal(10), user_id="user-123")
+
+    with pytest.raises(EmptyNameError):
+        await update_budget.execute_many(
+            [(card, BudgetDraft("Card", Decimal(50))), (cash, BudgetDraft(" ", Decimal(0)))]
+        )
+    assert await get_budget.execute(card.id) == card
+
+    updated = await update_budget.execute_many(
+        [(card, BudgetDraft("Card", Decimal(50))), (cash, BudgetDraft("Wallet", Decimal(10), "Coins"))]
+    )
+
+    assert [await get_budget.execute(budget.id) for budget in (card, cash)] == updated
+    assert (updated[0].balance, updated[0].initial_balance) == (Decimal(50), Decimal(50))
+    assert (updated[1].name, updated[1].description) == ("Wallet", "Coins")
+    assert card.name == "Card"
+    assert card.balance == Decimal(100)
+    with pytest.raises(ConcurrentUpdateError):
+        await update_budget.execute_many([(card, BudgetDraft("Stale", Decimal(1)))])
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_budget_detect_stale_version(
+    update_budget: UpdateBudget, delete_budget: DeleteBudget, create_budget: CreateBudget
+) -> None:
+    budget = await create_budget.execute(name="Main", balance=Decimal(100), user_id="user-123")
+    await update_budget.execute(budget_id=budget.id, name="Edited elsewhere", expected_version=budget.version)
+
+    with pytest.raises(ConcurrentUpdateError):
+        await update_budget.execute(budget_id=budget.id, name="Stale edit", expected_version=budget.version)
+    with pytest.raises(ConcurrentUpdateError):
+        await delete_budget.execute(budget.id, expected_version=budget.version)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_budget_updates_are_retried(
+    update_budget: UpdateBudget, create_budget: CreateBudget, get_budget: GetBudget
+) -> None:
+    budget = await create_budget.execute(name="Main", balance=Decimal(100), user_id="user-123")
+
+    await asyncio.gather(
+        update_budget.execute(budget_id=budget.id, name="Renamed"),
+        update_budget.execute(budget_id=budget.id, description="Described"),
+    )
+
+    updated = await get_budget.execute(budget.id)
+    assert (updated.name, updated.description, updated.version) == ("Renamed", "Described", 3)
@@ -1,6 +1,7 @@
 import pytest
 
 from domain.errors import CategoryNotFoundError, EmptyNameError
+from domain.models.category import CategoryDraft
 from domain.models.transaction import TransactionType
 from domain.use_cases.category import (
     CreateCategory,
@@ -100,6 +101,23 @@ async def test_list_categories_filtered_by_type(
     assert all(c.transaction_type == TransactionType.EXPENSE for c in expense_cats)
 
 
+@pytest.mark.asyncio
+async def test_list_categories_page_and_stream(
+    list_categories: ListCategories, create_category: CreateCategory
+) -> None:
+    user_id = "user-paged"
+    await create_category.execute(name="Food", user_id=user_id, transaction_type=TransactionType.EXPENSE)
+    await create_category.execute(name="Salary", user_id=user_id, transaction_type=TransactionType.INCOME)
+    await create_category.execute(name="Transport", user_id=user_id, transaction_type=TransactionType.EXPENSE)
+
+    page = await list_categories.execute_page(user_id, limit=5, transaction_type=TransactionType.EXPENSE)
+    streamed = [category async for category in list_categories.stream(user_id)]
+
+    assert sorted(category.name for category in page.items) == ["Food", "Transport"]
+    assert page.next_cursor is None
+    assert sorted(category.name for category in streamed) == ["Food", "Salary", "Transport"]
+
+
 @pytest.mark.asyncio
 async def test_update_category_full_update(update_category: UpdateCategory, create_category: CreateCategory) -> None:
     category = await create_category.execute(
@@ -171,6 +189,26 @@ async def test_update_category_not_found(update_category: UpdateCategory) -> Non
         await update_category.execute(category_id="missing", name="New Name")
 
 
+@pytest.mark.asyncio
+async def test_update_many_categories_is_all_or_nothing(
+    update_category: UpdateCategory, create_category: CreateCategory, get_category: GetCategory
+) -> None:
+    food = await create_category.execute(name="Food", user_id="user-123")
+    salary = await create_category.execute(name="Salary", user_id="user-123")
+
+    with pytest.raises(EmptyNameError):
+        await update_category.execute_many([(food, CategoryDraft("Groceries")), (salary, CategoryDraft(""))])
+    assert await get_category.execute(food.id) == food
+
+    updated = await update_category.execute_many(
+        [(food, CategoryDraft("Groceries", TransactionType.EXPENSE)), (salary, CategoryDraft("Salary", None, "Job"))]
+    )
+
+    assert [await get_category.execute(category.id) for category in (food, salary)] == updated
+    assert (updated[0].name, updated[0].transaction_type) == ("Groceries", TransactionType.EXPENSE)
+    assert updated[1].description == "Job"
+
+
 @pytest.mark.asyncio
 async def test_delete_category_success(
     delete_category: DeleteCategory, create_category: CreateCategory, get_category: GetCategory
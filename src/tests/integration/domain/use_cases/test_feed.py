@@ -0,0 +1,85 @@
+from decimal import Decimal
+
+import pytest
+
+from domain.errors import EmptyNameError
+from domain.models.budget import Budget
+from domain.models.change import Change, ChangeKind
+from domain.models.transaction import TransactionType
+from domain.repos.aggregate import AggregateRepo
+from domain.repos.budget import BudgetRepo
+from domain.repos.category import CategoryRepo
+from domain.repos.transaction import TransactionRepo
+from domain.use_cases.budget import CreateBudget, DeleteBudget, UpdateBudget
+from domain.use_cases.category import CreateCategory
+from domain.use_cases.feed import ChangeFeed
+from domain.use_cases.transaction import CreateTransaction
+
+USER_ID = "user-1"
+
+
+@pytest.mark.asyncio
+async def test_budget_writes_are_published(budget_repo: BudgetRepo) -> None:
+    feed = ChangeFeed[Budget]()
+    changes: list[Change[Budget]] = []
+    feed.subscribe(changes.append)
+    create, update, delete = (
+        CreateBudget(budget_repo, feed),
+        UpdateBudget(budget_repo, feed),
+        DeleteBudget(budget_repo, feed),
+    )
+
+    budget = await create.execute(name="Main", balance=Decimal(100), user_id=USER_ID)
+    with pytest.raises(EmptyNameError):
+        await update.execute(budget.id, name=" ")
+    await update.execute(budget.id, name="Renamed")
+    await delete.execute(budget.id)
+
+    assert [(change.kind, change.entity_id) for change in changes] == [
+        (ChangeKind.UPSERTED, budget.id),
+        (ChangeKind.UPSERTED, budget.id),
+        (ChangeKind.DELETED, budget.id),
+    ]
+    assert changes[1].entity is not None
+    assert changes[1].entity.name == "Renamed"
+    assert changes[1].entity.version == 2
+    assert changes[2].entity is None
+
+
+@pytest.mark.asyncio
+async def test_balance_moves_are_published(
+    transaction_repo: TransactionRepo,
+    budget_repo: BudgetRepo,
+    category_repo: CategoryRepo,
+    aggregate_repo: AggregateRepo,
+) -> None:
+    feed = ChangeFeed[Budget]()
+    changes: list[Change[Budget]] = []
+    budget = await CreateBudget(budget_repo).execute(name="Main", balance=Decimal(100), user_id=USER_ID)
+    category = await CreateCategory(category_repo).execute(name="Food", user_id=USER_ID)
+    feed.subscribe(changes.append)
+    create_transaction = CreateTransaction(
+        transaction_repo, budget_repo, category_repo, aggregate_repo, budget_feed=feed
+    )
+
+    await create_transaction.execute(budget.id, category.id, Decimal(30), TransactionType.EXPENSE, USER_ID)
+
+    assert len(changes) == 1
+    assert changes[0].entity is not None
+    assert changes[0].entity.balance == Decimal(70)
+
+
+def test_failing_subscriber_does_not_stop_the_others() -> None:
+    feed = ChangeFeed[str]()
+    received: list[str] = []
+
+    def fail(change: Change[str]) -> None:
+        raise RuntimeError(change.entity_id)
+
+    feed.subscribe(fail)
+    unsubscribe = feed.subscribe(lambda change: received.append(change.entity_id))
+    feed.upserted("b_1", "first")
+    unsubscribe()
+    feed.deleted("b_1")
+
+    assert received == ["b_1"]
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from domain.use_cases.single_flight import SingleFlight
+
+
+class _Source:
+    def __init__(self) -> None:
+        self.reads = 0
+        self.release = asyncio.Event()
+
+    async def read(self) -> int:
+        self.reads += 1
+        number = self.reads
+        await self.release.wait()
+        return number
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_share_one_fetch_and_its_result() -> None:
+    reads: SingleFlight[str, int] = SingleFlight(ttl_seconds=60)
+    source = _Source()
+
+    pending = [asyncio.create_task(reads.run("u_1", source.read)) for _ in range(5)]
+    await asyncio.sleep(0)
+    source.release.set()
+
+    assert await asyncio.gather(*pending) == [1] * 5
+    assert await reads.run("u_1", source.read) == 1
+    assert await reads.run("u_2", source.read) == 2
+    assert source.reads == 2
+    assert (reads.stats.fetched, reads.stats.coalesced, reads.stats.cached) == (2, 4, 1)
+
+
+@pytest.mark.asyncio
+async def test_invalidate_detaches_reads_in_flight() -> None:
+    reads: SingleFlight[str, int] = SingleFlight(ttl_seconds=60)
+    source = _Source()
+
+    stale = asyncio.create_task(reads.run("u_1", source.read))
+    await asyncio.sleep(0)
+    reads.invalidate()
+    fresh = asyncio.create_task(reads.run("u_1", source.read))
+    await asyncio.sleep(0)
+    source.release.set()
+
+    assert await stale == 1
+    assert await fresh == 2
+    assert await reads.run("u_1", source.read) == 2
+    assert source.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_results_expire_and_cancelled_callers_leave_the_fetch_running() -> None:
+    reads: SingleFlight[str, int] = SingleFlight(ttl_seconds=0)
+    source = _Source()
+
+    cancelled = asyncio.create_task(reads.run("u_1", source.read))
+    waiting = asyncio.create_task(reads.run("u_1", source.read))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    source.release.set()
+
+    assert await waiting == 1
+    assert await reads.run("u_1", source.read) == 2
@@ -0,0 +1,403 @@
+import asyncio
+from datetime import UTC, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+
+from domain.errors import (
+    BudgetNotFoundError,
+    CategoryNotFoundError,
+    CategoryTypeMismatchError,
+    ConcurrentUpdateError,
+    InexactAmountError,
+    InvalidAmountError,
+    InvalidTransferTargetError,
+    NegativeBalanceError,
+    NonPositiveAmountError,
+    TransactionNotFoundError,
+)
+from domain.models.budget import Budget
+from domain.models.category import Category
+from domain.models.transaction import Transaction, TransactionType
+from domain.repos.budget import BudgetRepo
+from domain.repos.category import CategoryRepo
+from domain.repos.transaction import TransactionRepo
+from domain.use_cases.budget import CreateBudget, GetBudget, UpdateBudget
+from domain.use_cases.category import CreateCategory
+from domain.use_cases.transaction import (
+    CreateTransaction,
+    DeleteTransaction,
+    GetTransaction,
+    ListTransactions,
+    UpdateTransaction,
+    VerifyBudgetBalance,
+)
+
+USER_ID = "user-1"
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def categories(category_repo: CategoryRepo) -> None:
+    await category_repo.create_many(
+        [Category(id=category_id, name=category_id, user_id=USER_ID) for category_id in ("c_1", "c_2")]
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_income_and_expense(
+    create_transaction: CreateTransaction, create_budget: CreateBudget, get_budget: GetBudget
+) -> None:
+    budget = await create_budget.execute(name="Main", balance=Decimal(100), user_id=USER_ID)
+
+    await create_transaction.execute(budget.id, "c_1", Decimal(50), TransactionType.INCOME, USER_ID)
+    await create_transaction.execute(budget.id, "c_2", Decimal("30.50"), TransactionType.EXPENSE, USER_ID)
+
+    assert (await get_budget.execute(budget.id)).balance == Decimal("119.50")
+
+
+@pytest.mark.asyncio
+async def test_create_transfer_moves_money_between_budgets(
+    create_transaction: CreateTransaction, create_budget: CreateBudget, get_budget: GetBudget
+) -> None:
+    source = await create_budget.execute(name="Card", balance=Decimal(100), user_id=USER_ID)
+    target = await create_budget.execute(name="Savings", balance=Decimal(0), user_id=USER_ID)
+
+    await create_transaction.execute(
+        source.id, "c_1", Decimal(40), TransactionType.TRANSFER, USER_ID, target_budget_id=target.id
+    )
+
+    assert (await get_budget.execute(source.id)).balance == Decimal(60)
+    assert (await get_budget.execute(target.id)).balance == Decimal(40)
+
+
+@pytest.mark.asyncio
+async def test_create_rejects_invalid_transactions(
+    create_transaction: CreateTransaction, create_budget: CreateBudget, get_budget: GetBudget
+) -> None:
+    budget = await create_budget.execute(name="Main", balance=Decimal(10), user_id=USER_ID)
+
+    with pytest.raises(NonPositiveAmountError):
+        await create_transaction.execute(budget.id, "c_1", Decimal(0), TransactionType.INCOME, USER_ID)
+    with pytest.raises(InexactAmountError):
+        await create_transaction.execute(budget.id, "c_1", Decimal("0.001"), TransactionType.INCOME, USER_ID)
+    for amount in ("NaN", "Infinity"):
+        with pytest.raises(InvalidAmountError):
+            await create_transaction.execute(budget.id, "c_1", Decimal(amount), TransactionType.INCOME, USER_ID)
+    with pytest.raises(InvalidTransferTargetError):
+        await create_transaction.execute(budget.id, "c_1", Decimal(1), TransactionType.TRANSFER, USER_ID)
+    with pytest.raises(InvalidTransferTargetError):
+        await create_transaction.execute(
+            budget.id, "c_1", Decimal(1), TransactionType.EXPENSE, USER_ID, target_budget_id="other"
+        )
+    with pytest.raises(NegativeBalanceError):
+        await create_transaction.execute(budget.id, "c_1", Decimal(11), TransactionType.EXPENSE, USER_ID)
+    with pytest.raises(BudgetNotFoundError):
+        await create_transaction.execute(budget.id, "c_1", Decimal(1), TransactionType.EXPENSE, "someone-else")
+
+    assert (await get_budget.execute(budget.id)).balance == Decimal(10)
+
+
+@pytest.mark.asyncio
+async def test_create_and_update_check_the_category(
+    create_transaction: CreateTransaction,
+    update_transaction: UpdateTransaction,
+    create_budget: CreateBudget,
+    create_category: CreateCategory,
+    get_budget: GetBudget,
+) -> None:
+    budget = await create_budget.execute(name="Main", balance=Decimal(10), user_id=USER_ID)
+    food = await create_category.execute(name="Food", user_id=USER_ID, transaction_type=TransactionType.EXPENSE)
+    foreign = await create_category.execute(name="Food", user_id="someone-else")
+
+    with pytest.raises(CategoryNotFoundError):
+        await create_transaction.execute(budget.id, "missing", Decimal(1), TransactionType.EXPENSE, USER_ID)
+    with pytest.raises(CategoryNotFoundError):
+        await create_transaction.execute(budget.id, foreign.id, Decimal(1), TransactionType.EXPENSE, USER_ID)
+    with pytest.raises(CategoryTypeMismatchError):
+        await create_transaction.execute(budget.id, food.id, Decimal(1), TransactionType.INCOME, USER_ID)
+    transaction = await create_transaction.execute(budget.id, food.id, Decimal(1), TransactionType.EXPENSE, USER_ID)
+    with pytest.raises(CategoryTypeMismatchError):
+        await update_transaction.execute(transaction.id, transaction_type=TransactionType.INCOME)
+    with pytest.raises(CategoryNotFoundError):
+        await update_transaction.execute(transaction.id, category_id=foreign.id)
+
+    assert (await get_budget.execute(budget.id)).balance == Decimal(9)
+
+
+@pytest.mark.asyncio
+async def test_failed_transaction_write_undoes_balances(
+    create_transaction: CreateTransaction,
+    create_budget: CreateBudget,
+    get_budget: GetBudget,
+    transaction_repo: TransactionRepo,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    source = await create_budget.execute(name="Card", balance=Decimal(100), user_id=USER_ID)
+    target = await create_budget.execute(name="Savings", balance=Decimal(0), user_id=USER_ID)
+
+    async def fail(_: Transaction) -> None:
+        raise OSError
+
+    monkeypatch.setattr(transaction_repo, "create", fail)
+    with pytest.raises(OSError):  # noqa: PT011 - any write failure
+        await create_transaction.execute(
+            source.id, "c_1", Decimal(40), TransactionType.TRANSFER, USER_ID, target_budget_id=target.id
+        )
+
+    assert (await get_budget.execute(source.id)).balance == Decimal(100)
+    assert (await get_budget.execute(target.id)).balance == Decimal(0)
+    assert await transaction_repo.get_by_user_id(USER_ID) == []
+
+
+@pytest.mark.asyncio
+async def test_failed_balance_write_undoes_the_other_budget(
+    create_transaction: CreateTransaction,
+    create_budget: CreateBudget,
+    get_budget: GetBudget,
+    budget_repo: BudgetRepo,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    source = await create_budget.execute(name="Card", balance=Decimal(100), user_id=USER_ID)
+    target = await create_budget.execute(name="Savings", balance=Decimal(0), user_id=USER_ID)
+    update = budget_repo.update
+
+    async def conflict_on_target(budget: Budget) -> None:
+        if budget.id == target.id:
+            raise ConcurrentUpdateError(budget.id)
+        await update(budget)
+
+    monkeypatch.setattr(budget_repo, "update", conflict_on_target)
+    with pytest.raises(ConcurrentUpdateError):
+        await create_transaction.execute(
+            source.id, "c_1", Decimal(40), TransactionType.TRANSFER, USER_ID, target_budget_id=target.id
+        )
+
+    assert (await get_budget.execute(source.id)).balance == Decimal(100)
+    assert (await get_budget.execute(target.id)).balance == Decimal(0)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_transactions_do_not_lose_balance_updates(
+    create_transaction: CreateTransaction, create_budget: CreateBudget, get_budget: GetBudget
+) -> None:
+    budget = await create_budget.execute(name="Main", balance=Decimal(100), user_id=USER_ID)
+
+    await asyncio.gather(
+        *(
+            create_transaction.execute(budget.id, "c_1", Decimal(amount), TransactionType.EXPENSE, USER_ID)
+            for amount in (10, 20, 30)
+        )
+    )
+
+    assert (await get_budget.execute(budget.id)).balance == Decimal(40)
+
+
+@pytest.mark.asyncio
+async def test_get_and_list_transactions(
+    create_transaction: CreateTransaction,
+    get_transaction: GetTransaction,
+    list_transactions: ListTransactions,
+    create_budget: CreateBudget,
+) -> None:
+    budget = await create_budget.execute(name="Main", balance=Decimal(0), user_id=USER_ID)
+    transaction = await create_transaction.execute(budget.id, "c_1", Decimal(5), TransactionType.INCOME, USER_ID)
+
+    assert await get_transaction.execute(transaction.id) == transaction
+    assert await list_transactions.execute(budget.id) == [transaction]
+    with pytest.raises(TransactionNotFoundError):
+        await get_transaction.execute("non-existent-id")
+
+
+@pytest.mark.asyncio
+async def test_list_in_date_range_normalizes_offsets(
+    create_transaction: CreateTransaction, list_transactions: ListTransactions, create_budget: CreateBudget
+) -> None:
+    budget = await create_budget.execute(name="Main", balance=Decimal(0), user_id=USER_ID)
+    moscow = timezone(timedelta(hours=3))
+    late = await create_transaction.execute(
+        budget.id, "c_1", Decimal(1), TransactionType.INCOME, USER_ID, date=datetime(2025, 1, 1, 2, tzinfo=moscow)
+    )
+    early = await create_transaction.execute(
+        budget.id, "c_1", Decimal(2), TransactionType.INCOME, USER_ID, date=datetime(2024, 12, 31, 22, tzinfo=UTC)
+    )
+
+    listed = await list_transactions.execute_in_date_range(
+        USER_ID, datetime(2024, 12, 31, 22, 30, tzinfo=UTC), datetime(2025, 1, 1, 3, tzinfo=moscow), budget_id=budget.id
+    )
+
+    assert late.date.tzinfo is UTC
+    assert [transaction.id for transaction in listed] == [late.id]
+    assert early.date < late.date
+
+
+@pytest.mark.asyncio
+async def test_update_applies_only_the_difference(
+    create_transaction: CreateTransaction,
+    update_transaction: UpdateTransaction,
+    create_budget: CreateBudget,
+    get_budget: GetBudget,
+) -> None:
+    first = await create_budget.execute(name="First", balance=Decimal(100), user_id=USER_ID)
+    second = await create_budget.execute(name="Second", balance=Decimal(100), user_id=USER_ID)
+    transaction = await create_transaction.execute(first.id, "c_1", Decimal(30), TransactionType.EXPENSE, USER_ID)
+
+    await update_transaction.execute(transaction.id, amount=Decimal(20))
+    assert (await get_budget.execute(first.id)).balance == Decimal(80)
+
+    await update_transaction.execute(transaction.id, budget_id=second.id, transaction_type=TransactionType.INCOME)
+    assert (await get_budget.execute(first.id)).balance == Decimal(100)
+    assert (await get_budget.execute(second.id)).balance == Decimal(120)
+
+
+@pytest.mark.asyncio
+async def test_update_invalid_leaves_balances_untouched(
+    create_transaction: CreateTransaction,
+    update_transaction: UpdateTransaction,
+    create_budget: CreateBudget,
+    get_budget: GetBudget,
+) -> None:
+    budget = await create_budget.execute(name="Main", balance=Decimal(10), user_id=USER_ID)
+    transaction = await create_transaction.execute(budget.id, "c_1", Decimal(5), TransactionType.EXPENSE, USER_ID)
+
+    with pytest.raises(NegativeBalanceError):
+        await update_transaction.execute(transaction.id, amount=Decimal(50))
+    with pytest.raises(TransactionNotFoundError):
+        await update_transaction.execute("non-existent-id", amount=Decimal(1))
+
+    assert (await get_budget.execute(budget.id)).balance == Decimal(5)
+
+
+@pytest.mark.asyncio
+async def test_delete_reverts_balances(
+    create_transaction: CreateTransaction,
+    delete_transaction: DeleteTransaction,
+    create_budget: CreateBudget,
+    get_budget: GetBudget,
+) -> None:
+    source = await create_budget.execute(name="Card", balance=Decimal(100), user_id=USER_ID)
+    target = await create_budget.execute(name="Savings", balance=Decimal(0), user_id=USER_ID)
+    transfer = await create_transaction.execute(
+        source.id, "c_1", Decimal(25), TransactionType.TRANSFER, USER_ID, target_budget_id=target.id
+    )
+
+    await delete_transaction.execute(transfer.id)
+
+    assert (await get_budget.execute(source.id)).balance == Decimal(100)
+    assert (await get_budget.execute(target.id)).balance == Decimal(0)
+    with pytest.raises(TransactionNotFoundError):
+        await delete_transaction.execute(transfer.id)
+
+
+@pytest.mark.asyncio
+async def test_transactions_of_a_deleted_budget_can_still_be_changed(
+    create_transaction: CreateTransaction,
+    update_transaction: UpdateTransaction,
+    delete_transaction: DeleteTransaction,
+    create_budget: CreateBudget,
+    budget_repo: BudgetRepo,
+) -> None:
+    source = await create_budget.execute(name="Card", balance=Decimal(100), user_id=USER_ID)
+    target = await create_budget.execute(name="Savings", balance=Decimal(0), user_id=USER_ID)
+    transfer = await create_transaction.execute(
+        source.id, "c_1", Decimal(25), TransactionType.TRANSFER, USER_ID, target_budget_id=target.id
+    )
+    expense = await create_transaction.execute(target.id, "c_1", Decimal(5), TransactionType.EXPENSE, USER_ID)
+    await budget_repo.delete(target.id)
+
+    with pytest.raises(BudgetNotFoundError):
+        await update_transaction.execute(transfer.id, amount=Decimal(20))
+    await update_transaction.execute(expense.id, budget_id=source.id)
+    await delete_transaction.execute(transfer.id)
+
+    remaining = await budget_repo.get_by_id(source.id)
+    assert remaining is not None
+    assert remaining.balance == Decimal(95)
+
+
+@pytest.mark.asyncio
+async def test_delete_many_reverts_balances_once(
+    create_transaction: CreateTransaction,
+    delete_transaction: DeleteTransaction,
+    create_budget: CreateBudget,
+    get_budget: GetBudget,
+) -> None:
+    budget = await create_budget.execute(name="Card", balance=Decimal(100), user_id=USER_ID)
+    income = await create_transaction.execute(budget.id, "c_1", Decimal(50), TransactionType.INCOME, USER_ID)
+    expense = await create_transaction.execute(budget.id, "c_1", Decimal(30), TransactionType.EXPENSE, USER_ID)
+    kept = await create_transaction.execute(budget.id, "c_1", Decimal(5), TransactionType.EXPENSE, USER_ID)
+
+    with pytest.raises(TransactionNotFoundError):
+        await delete_transaction.execute_many([income.id, "missing"])
+    await delete_transaction.execute_many([income.id, expense.id, income.id])
+
+    assert (await get_budget.execute(budget.id)).balance == Decimal(95)
+    with pytest.raises(TransactionNotFoundError):
+        await delete_transaction.execute(income.id)
+    await delete_transaction.execute(kept.id)
+
+
+@pytest.mark.asyncio
+async def test_delete_many_retries_when_a_transaction_changes_meanwhile(
+    create_transaction: CreateTransaction,
+    update_transaction: UpdateTransaction,
+    delete_transaction: DeleteTransaction,
+    budget_repo: BudgetRepo,
+    transaction_repo: TransactionRepo,
+) -> None:
+    budget = await CreateBudget(budget_repo).execute(name="Card", balance=Decimal(100), user_id=USER_ID)
+    expense = await create_transaction.execute(budget.id, "c_1", Decimal(30), TransactionType.EXPENSE, USER_ID)
+    get_by_ids = transaction_repo.get_by_ids
+    reads: list[list[Transaction]] = []
+
+    async def read_then_update(transaction_ids: list[str]) -> list[Transaction]:
+        reads.append(await get_by_ids(transaction_ids))
+        if len(reads) == 1:
+            await update_transaction.execute(expense.id, amount=Decimal(10))
+        return reads[-1]
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(transaction_repo, "get_by_ids", read_then_update)
+        await delete_transaction.execute_many([expense.id])
+
+    assert len(reads) == 2
+    assert (await GetBudget(budget_repo).execute(budget.id)).balance == Decimal(100)
+
+
+@pytest.mark.asyncio
+async def test_verify_budget_balance(
+    create_transaction: CreateTransaction,
+    verify_budget_balance: VerifyBudgetBalance,
+    create_budget: CreateBudget,
+    update_budget: UpdateBudget,
+) -> None:
+    source = await create_budget.execute(name="Card", balance=Decimal(100), user_id=USER_ID)
+    target = await create_budget.execute(name="Savings", balance=Decimal(10), user_id=USER_ID)
+    await create_transaction.execute(source.id, "c_1", Decimal(15), TransactionType.EXPENSE, USER_ID)
+    await create_transaction.execute(
+        source.id, "c_1", Decimal(5), TransactionType.TRANSFER, USER_ID, target_budget_id=target.id
+    )
+    await update_budget.execute(target.id, balance=Decimal(50))
+
+    source_check = await verify_budget_balance.execute(source.id)
+    target_check = await verify_budget_balance.execute(target.id)
+
+    assert source_check.is_consistent
+    assert source_check.expected == Decimal(80)
+    assert target_check.is_consistent
+    assert target_check.expected == Decimal(50)
+
+
+@pytest.mark.asyncio
+async def test_verify_budget_balance_detects_drift(
+    verify_budget_balance: VerifyBudgetBalance, create_budget: CreateBudget, budget_repo: BudgetRepo
+) -> None:
+    budget = await create_budget.execute(name="Main", balance=Decimal(100), user_id=USER_ID)
+    budget.balance = Decimal(90)
+    await budget_repo.update(budget)
+
+    check = await verify_budget_balance.execute(budget.id)
+
+    assert not check.is_consistent
+    assert check.stored == Decimal(90)
+    assert check.expected == Decimal(100)
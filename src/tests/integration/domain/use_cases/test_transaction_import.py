@@ -0,0 +1,115 @@
+from decimal import Decimal
+
+import pytest
+
+from domain.errors import MissingImportColumnsError
+from domain.models.transaction import TransactionType
+from domain.use_cases.aggregate import GetMonthlyAggregates
+from domain.use_cases.budget import CreateBudget, GetBudget
+from domain.use_cases.category import CreateCategory
+from domain.use_cases.transaction import ImportTransactions
+
+USER_ID = "user-1"
+HEADER = "date,budget_id,category_id,amount,type,description,target_budget_id"
+
+
+@pytest.mark.asyncio
+async def test_import_writes_transactions_balances_and_aggregates(
+    import_transactions: ImportTransactions,
+    create_budget: CreateBudget,
+    create_category: CreateCategory,
+    get_budget: GetBudget,
+    get_monthly_aggregates: GetMonthlyAggregates,
+) -> None:
+    card = await create_budget.execute(name="Card", balance=Decimal(100), user_id=USER_ID)
+    savings = await create_budget.execute(name="Savings", balance=Decimal(0), user_id=USER_ID)
+    category = await create_category.execute(name="Food", user_id=USER_ID)
+    lines = [
+        HEADER,
+        f"2025-01-05T10:00:00,{card.id},{category.id},12.50,expense,Lunch,",
+        f'2025-01-06T10:00:00+03:00,{card.id},{category.id},200,income,"Salary, January",',
+        f"2025-01-07,{card.id},{category.id},50,transfer,,{savings.id}",
+        f"2025-01-08,{card.id},{category.id},7,expense,,",
+    ]
+
+    report = await import_transactions.execute(USER_ID, lines, batch_size=2)
+
+    assert report.imported == 4
+    assert report.rejected == []
+    assert report.rows_per_second > 0
+    assert (await get_budget.execute(card.id)).balance == Decimal("230.50")
+    assert (await get_budget.execute(savings.id)).balance == Decimal(50)
+    assert sum(aggregate.count for aggregate in await get_monthly_aggregates.execute(USER_ID, 2025, 1)) == 4
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_invalid_rows_and_overdrawing_batches(
+    import_transactions: ImportTransactions,
+    create_budget: CreateBudget,
+    create_category: CreateCategory,
+    get_budget: GetBudget,
+) -> None:
+    budget = await create_budget.execute(name="Card", balance=Decimal(10), user_id=USER_ID)
+    category = await create_category.execute(name="Food", user_id=USER_ID)
+    lines = [
+        HEADER,
+        f"2025-01-01,{budget.id},{category.id},5,income,,",
+        f"2025-01-01,unknown,{category.id},5,income,,",
+        f"2025-01-01,{budget.id},unknown,5,income,,",
+        f"2025-01-01,{budget.id},{category.id},abc,income,,",
+        f"2025-01-01,{budget.id},{category.id},NaN,income,,",
+        f"2025-01-01,{budget.id},{category.id},Infinity,income,,",
+        f"not-a-date,{budget.id},{category.id},5,income,,",
+        f"2025-01-01,{budget.id},{category.id},-5,income,,",
+        f"2025-01-01,{budget.id},{category.id},5,refund,,",
+        f"2025-01-01,{budget.id},{category.id},100,expense,,",
+        f"2025-01-01,{budget.id},{category.id},1,expense,,",
+    ]
+
+    report = await import_transactions.execute(USER_ID, lines, batch_size=7)
+
+    assert report.imported == 1
+    assert [row.line for row in report.rejected] == [3, 4, 5, 6, 7, 8, 9, 10, 11, 12]
+    assert [row.reason for row in report.rejected[2:5]] == [
+        "Amount is not a finite number: 'abc'",
+        "Amount is not a finite number: 'NaN'",
+        "Amount is not a finite number: 'Infinity'",
+    ]
+    assert (await get_budget.execute(budget.id)).balance == Decimal(15)
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_rows_of_another_category_type(
+    import_transactions: ImportTransactions, create_budget: CreateBudget, create_category: CreateCategory
+) -> None:
+    budget = await create_budget.execute(name="Card", balance=Decimal(10), user_id=USER_ID)
+    food = await create_category.execute(name="Food", user_id=USER_ID, transaction_type=TransactionType.EXPENSE)
+
+    report = await import_transactions.execute(
+        USER_ID,
+        [HEADER, f"2025-01-01,{budget.id},{food.id},5,income,,", f"2025-01-01,{budget.id},{food.id},5,expense,,"],
+    )
+
+    assert report.imported == 1
+    assert [row.line for row in report.rejected] == [2]
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_amounts_finer_than_cents(
+    import_transactions: ImportTransactions, create_budget: CreateBudget, create_category: CreateCategory
+) -> None:
+    budget = await create_budget.execute(name="Card", balance=Decimal(10), user_id=USER_ID)
+    category = await create_category.execute(name="Food", user_id=USER_ID)
+
+    report = await import_transactions.execute(
+        USER_ID, [HEADER, f"2025-01-01,{budget.id},{category.id},0.001,income,,"]
+    )
+
+    assert report.imported == 0
+    assert [row.reason for row in report.rejected] == ["Amount 0.001 has more precision than whole cents"]
+
+
+@pytest.mark.asyncio
+async def test_import_requires_all_columns(import_transactions: ImportTransactions) -> None:
+    with pytest.raises(MissingImportColumnsError):
+        await import_transactions.execute(USER_ID, ["date,budget_id,amount"])
@@ -0,0 +1,258 @@
+import os
+import socket
+import tempfile
+from collections.abc import Iterator
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from domain.models.budget import Budget
+from domain.models.category import Category
+from domain.models.transaction import Transaction, TransactionType
+from domain.use_cases.budget import CreateBudget, ListBudgets
+from domain.use_cases.feed import ChangeFeed
+from infra.repos.cached.budget import CachedBudgetRepo
+from infra.repos.cached.category import CachedCategoryRepo
+from infra.repos.cached.channel import ChangeChannel
+from infra.repos.cached.transaction import CachedTransactionRepo
+from infra.repos.file.budget import BudgetFileRepo
+from infra.repos.file.category import CategoryFileRepo
+from infra.repos.file.transaction import TransactionFileRepo
+
+
+@pytest.fixture
+def channel_dir() -> Iterator[Path]:
+    # Unix socket paths are limited to about 100 bytes, which pytest's tmp_path can exceed
+    with tempfile.TemporaryDirectory(prefix="channel-") as path:
+        yield Path(path)
+
+
+def _entries(directory: Path, pattern: str = "*") -> list[Path]:
+    return list(directory.glob(pattern))
+
+
+def _bump_mtime(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def budgets_dir(tmp_path: Path) -> Path:
+    return tmp_path / "budgets"
+
+
+@pytest.fixture
+def cached_budget_repo(budgets_dir: Path) -> CachedBudgetRepo:
+    return CachedBudgetRepo(BudgetFileRepo(base_dir=budgets_dir), watch_dir=budgets_dir)
+
+
+@pytest.mark.asyncio
+async def test_reads_are_served_from_memory(cached_budget_repo: CachedBudgetRepo, budgets_dir: Path) -> None:
+    budget = Budget(id="b_1", name="B1", balance=Decimal(0), user_id="u_1")
+    await cached_budget_repo.create(budget)
+    assert await cached_budget_repo.get_by_user_id("u_1") == [budget]
+
+    (budgets_dir / "b_1.json").write_text("not json")
+
+    assert await cached_budget_repo.get_by_id("b_1") == budget
+    assert await cached_budget_repo.get_by_user_id("u_1") == [budget]
+
+
+@pytest.mark.asyncio
+async def test_writes_go_through(cached_budget_repo: CachedBudgetRepo, budgets_dir: Path) -> None:
+    budget = Budget(id="b_1", name="B1", balance=Decimal(0), user_id="u_1")
+    await cached_budget_repo.create(budget)
+    await cached_budget_repo.get_by_user_id("u_1")
+
+    budget.name = "Renamed"
+    await cached_budget_repo.update(budget)
+
+    assert await cached_budget_repo.get_by_user_id("u_1") == [budget]
+    assert await BudgetFileRepo(base_dir=budgets_dir).get_by_id("b_1") == budget
+
+    await cached_budget_repo.delete("b_1")
+
+    assert await cached_budget_repo.get_by_id("b_1") is None
+    assert await cached_budget_repo.get_by_user_id("u_1") == []
+
+
+@pytest.mark.asyncio
+async def test_returned_entities_are_copies(cached_budget_repo: CachedBudgetRepo) -> None:
+    await cached_budget_repo.create(Budget(id="b_1", name="B1", balance=Decimal(0), user_id="u_1"))
+
+    fetched = await cached_budget_repo.get_by_id("b_1")
+    assert fetched is not None
+    fetched.name = "Mutated"
+
+    cached = await cached_budget_repo.get_by_id("b_1")
+    assert cached is not None
+    assert cached.name == "B1"
+
+
+@pytest.mark.asyncio
+async def test_external_change_invalidates_cache(cached_budget_repo: CachedBudgetRepo, budgets_dir: Path) -> None:
+    await cached_budget_repo.create(Budget(id="b_1", name="B1", balance=Decimal(0), user_id="u_1"))
+    assert len(await cached_budget_repo.get_by_user_id("u_1")) == 1
+
+    await BudgetFileRepo(base_dir=budgets_dir).create(Budget(id="b_2", name="B2", balance=Decimal(0), user_id="u_1"))
+    _bump_mtime(budgets_dir)
+
+    assert len(await cached_budget_repo.get_by_user_id("u_1")) == 2
+
+
+@pytest.mark.asyncio
+async def test_change_made_during_own_write_is_not_missed(budgets_dir: Path) -> None:
+    other_process = BudgetFileRepo(base_dir=budgets_dir)
+    external = Budget(id="b_1", name="B1", balance=Decimal(0), user_id="u_1")
+    await other_process.create(external)
+
+    class RacedRepo(BudgetFileRepo):
+        async def create(self, budget: Budget) -> None:
+            await super().create(budget)
+            external.name = "Renamed elsewhere"
+            await other_process.update(external)
+
+    repo = CachedBudgetRepo(RacedRepo(base_dir=budgets_dir), watch_dir=budgets_dir)
+    assert await repo.get_by_id("b_1") is not None
+    await repo.create(Budget(id="b_2", name="B2", balance=Decimal(0), user_id="u_1"))
+
+    fetched = await repo.get_by_id("b_1")
+    assert fetched is not None
+    assert fetched.name == "Renamed elsewhere"
+
+
+@pytest.mark.asyncio
+async def test_size_bound_evicts_least_recently_used(budgets_dir: Path) -> None:
+    repo = CachedBudgetRepo(BudgetFileRepo(base_dir=budgets_dir), max_size=1, watch_dir=budgets_dir)
+    await repo.create(Budget(id="b_1", name="B1", balance=Decimal(0), user_id="u_1"))
+    await repo.create(Budget(id="b_2", name="B2", balance=Decimal(0), user_id="u_1"))
+    await repo.get_by_id("b_2")
+
+    for budget_id in ("b_1", "b_2"):
+        path = budgets_dir / f"{budget_id}.json"
+        path.write_text(path.read_text().replace('"name": "B', '"name": "Edited B'))
+
+    cached = await repo.get_by_id("b_2")
+    evicted = await repo.get_by_id("b_1")
+    assert evicted is not None
+    assert evicted.name == "Edited B1"
+    assert cached is not None
+    assert cached.name == "B2"
+
+
+@pytest.mark.asyncio
+async def test_evict_user_drops_only_that_users_budgets(
+    cached_budget_repo: CachedBudgetRepo, budgets_dir: Path
+) -> None:
+    await cached_budget_repo.create(Budget(id="b_1", name="B1", balance=Decimal(0), user_id="u_1"))
+    await cached_budget_repo.create(Budget(id="b_2", name="B2", balance=Decimal(0), user_id="u_2"))
+    await cached_budget_repo.get_by_user_id("u_1")
+    await cached_budget_repo.get_by_user_id("u_2")
+    for budget_id in ("b_1", "b_2"):
+        path = budgets_dir / f"{budget_id}.json"
+        path.write_text(path.read_text().replace('"name": "B', '"name": "Edited B'))
+
+    cached_budget_repo.evict_user("u_1")
+
+    assert [budget.name for budget in await cached_budget_repo.get_by_user_id("u_1")] == ["Edited B1"]
+    assert [budget.name for budget in await cached_budget_repo.get_by_user_id("u_2")] == ["B2"]
+
+
+@pytest.mark.asyncio
+async def test_category_lists_are_cached_per_type(tmp_path: Path) -> None:
+    repo = CachedCategoryRepo(CategoryFileRepo(base_dir=tmp_path))
+    food = Category(id="c_1", name="Food", user_id="u_1", transaction_type=TransactionType.EXPENSE)
+    salary = Category(id="c_2", name="Salary", user_id="u_1", transaction_type=TransactionType.INCOME)
+    await repo.create(food)
+    await repo.create(salary)
+
+    assert await repo.get_by_user_id("u_1", TransactionType.EXPENSE) == [food]
+    assert await repo.get_by_user_id("u_1", TransactionType.INCOME) == [salary]
+
+
+@pytest.mark.asyncio
+async def test_transaction_lists_follow_writes(tmp_path: Path) -> None:
+    repo = CachedTransactionRepo(TransactionFileRepo(base_dir=tmp_path))
+    transaction = Transaction(
+        id="t_1", budget_id="b_1", category_id="c_1", amount=Decimal(10), type=TransactionType.EXPENSE, user_id="u_1"
+    )
+    await repo.create(transaction)
+    assert await repo.get_by_budget_id("b_1") == [transaction]
+
+    transaction.budget_id = "b_2"
+    await repo.update(transaction)
+
+    assert await repo.get_by_budget_id("b_1") == []
+    assert await repo.get_by_budget_id("b_2") == [transaction]
+    assert await repo.get_by_user_id("u_1") == [transaction]
+
+
+@pytest.mark.asyncio
+async def test_channel_evicts_only_what_other_workers_changed(budgets_dir: Path, channel_dir: Path) -> None:
+    first_channel, second_channel = ChangeChannel(channel_dir), ChangeChannel(channel_dir)
+    first = CachedBudgetRepo(BudgetFileRepo(base_dir=budgets_dir), channel=first_channel)
+    second = CachedBudgetRepo(BudgetFileRepo(base_dir=budgets_dir), channel=second_channel)
+    changed = Budget(id="b_1", name="B1", balance=Decimal(0), user_id="u_1")
+    untouched = Budget(id="b_2", name="B2", balance=Decimal(0), user_id="u_1")
+    await first.create_many([changed, untouched])
+    assert await second.get_by_user_id("u_1") == [changed, untouched]
+
+    changed.name = "Renamed"
+    await first.update(changed)
+    (budgets_dir / "b_2.json").write_text("not json")
+
+    assert await second.get_by_id("b_1") == changed
+    assert await second.get_by_id("b_2") == untouched
+    first_channel.close()
+    second_channel.close()
+
+
+@pytest.mark.asyncio
+async def test_channel_drops_budget_lists_other_workers_changed(budgets_dir: Path, channel_dir: Path) -> None:
+    first_channel, second_channel = ChangeChannel(channel_dir), ChangeChannel(channel_dir)
+    first_repo = CachedBudgetRepo(BudgetFileRepo(base_dir=budgets_dir), channel=first_channel)
+    second_repo = CachedBudgetRepo(BudgetFileRepo(base_dir=budgets_dir), channel=second_channel)
+    list_budgets = ListBudgets(first_repo, ChangeFeed[Budget](), first_channel)
+    create_budget = CreateBudget(second_repo, ChangeFeed[Budget]())
+    await create_budget.execute(name="First", balance=Decimal(0), user_id="u_1")
+    listed = await list_budgets.execute("u_1")
+    assert await list_budgets.execute("u_1") is listed
+
+    await create_budget.execute(name="Second", balance=Decimal(0), user_id="u_1")
+
+    assert len(await list_budgets.execute("u_1")) == 2
+    assert len((await list_budgets.execute_page("u_1", limit=10)).items) == 2
+    first_channel.close()
+    second_channel.close()
+
+
+@pytest.mark.asyncio
+async def test_channel_overflow_drops_everything(budgets_dir: Path, channel_dir: Path) -> None:
+    writer_channel, reader_channel = ChangeChannel(channel_dir), ChangeChannel(channel_dir)
+    reader = CachedBudgetRepo(BudgetFileRepo(base_dir=budgets_dir), channel=reader_channel)
+    budget = Budget(id="b_1", name="B1", balance=Decimal(0), user_id="u_1")
+    await reader.create(budget)
+    assert await reader.get_by_id("b_1") == budget
+
+    # Far more messages than the reader's socket can queue while it is not polling
+    for number in range(5000):
+        await writer_channel.publish("categories", [f"c_{number}"])
+    await BudgetFileRepo(base_dir=budgets_dir).update(budget)
+
+    assert await reader.get_by_id("b_1") == budget
+    writer_channel.close()
+    reader_channel.close()
+
+
+@pytest.mark.asyncio
+async def test_channel_removes_sockets_of_stopped_workers(channel_dir: Path) -> None:
+    channel = ChangeChannel(channel_dir)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as crashed:
+        crashed.bind(str(channel_dir / "1-crashed.sock"))
+
+    await channel.publish("budgets", ["b_1"])
+
+    assert len(_entries(channel_dir, "*.sock")) == 1
+    channel.close()
+    assert _entries(channel_dir) == []
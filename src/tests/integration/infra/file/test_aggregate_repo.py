@@ -0,0 +1,49 @@
+import asyncio
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from domain.models.aggregate import TransactionAggregate
+from domain.models.transaction import TransactionType
+from infra.repos.file.aggregate import AggregateFileRepo
+from infra.repos.file.locks import LOCK_DIR_NAME
+
+
+def _delta(month: str, total: int = 1, user_id: str = "u_1") -> TransactionAggregate:
+    return TransactionAggregate(user_id, "b_1", "c_1", month, TransactionType.EXPENSE, Decimal(total), 1)
+
+
+def _entry_names(directory: Path) -> list[str]:
+    return sorted(path.name for path in directory.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_writers_sharing_a_directory_do_not_lose_updates(tmp_path: Path) -> None:
+    first = AggregateFileRepo(base_dir=tmp_path, inter_process_locks=True)
+    second = AggregateFileRepo(base_dir=tmp_path, inter_process_locks=True)
+
+    await asyncio.gather(*((first, second)[number % 2].add([_delta("2025-01", number)]) for number in range(20)))
+
+    [aggregate] = await second.get_by_user_id("u_1", "2025-01")
+    assert aggregate.count == 20
+    assert aggregate.total == sum(range(20))
+
+
+@pytest.mark.asyncio
+async def test_replace_swaps_in_the_new_months_whole(tmp_path: Path) -> None:
+    repo = AggregateFileRepo(base_dir=tmp_path, inter_process_locks=True)
+    await repo.add([_delta("2025-01"), _delta("2025-02"), _delta("2025-01", user_id="u_2")])
+
+    await asyncio.gather(
+        repo.replace_by_user_id("u_1", [_delta("2025-03", 5)]),
+        repo.add([_delta("2025-03", 2)]),
+    )
+
+    aggregates = await repo.get_by_user_id("u_1")
+    assert [(aggregate.month, aggregate.total) for aggregate in aggregates] in (
+        [("2025-03", Decimal(5))],
+        [("2025-03", Decimal(7))],
+    )
+    assert len(await repo.get_by_user_id("u_2")) == 1
+    assert _entry_names(tmp_path) == [LOCK_DIR_NAME, "u_1", "u_2"]
@@ -1,13 +1,21 @@
+from datetime import UTC, datetime, timedelta
 from decimal import Decimal
+from pathlib import Path
 
 import pytest
 
+from domain.errors import BudgetNotFoundError, ConcurrentUpdateError
 from domain.models.budget import Budget
+from domain.repos.budget import BudgetRepo
+from domain.repos.ordering import Ordering
+from infra.repos.file import budget as budget_module
+from infra.repos.file import stamps as stamps_module
 from infra.repos.file.budget import BudgetFileRepo
+from infra.repos.file.stamps import FileStamp, load_stamped_from_file
 
 
 @pytest.mark.asyncio
-async def test_create_and_get_by_id(budget_repo: BudgetFileRepo) -> None:
+async def test_create_and_get_by_id(budget_repo: BudgetRepo) -> None:
     budget = Budget(
         id="b_1",
         name="Main Budget",
@@ -22,13 +30,13 @@ async def test_create_and_get_by_id(budget_repo: BudgetFileRepo) -> None:
 
 
 @pytest.mark.asyncio
-async def test_get_by_id_not_found(budget_repo: BudgetFileRepo) -> None:
+async def test_get_by_id_not_found(budget_repo: BudgetRepo) -> None:
     result = await budget_repo.get_by_id("non_existent")
     assert result is None
 
 
 @pytest.mark.asyncio
-async def test_get_by_user_id(budget_repo: BudgetFileRepo) -> None:
+async def test_get_by_user_id(budget_repo: BudgetRepo) -> None:
     budget1 = Budget(id="b_1", name="B1", balance=Decimal(0), user_id="u_1")
     budget2 = Budget(id="b_2", name="B2", balance=Decimal(0), user_id="u_1")
     budget3 = Budget(id="b_3", name="B3", balance=Decimal(0), user_id="u_2")
@@ -48,7 +56,54 @@ async def test_get_by_user_id(budget_repo: BudgetFileRepo) -> None:
 
 
 @pytest.mark.asyncio
-async def test_update(budget_repo: BudgetFileRepo) -> None:
+async def test_get_by_user_id_ordered_with_limit(budget_repo: BudgetRepo) -> None:
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    for budget_id, days in [("b_a", 2), ("b_b", 0), ("b_c", 3), ("b_d", 1)]:
+        await budget_repo.create(
+            Budget(
+                id=budget_id,
+                name=budget_id,
+                balance=Decimal(0),
+                user_id="u_1",
+                created_at=start + timedelta(days=days),
+            )
+        )
+
+    newest = await budget_repo.get_by_user_id("u_1", Ordering.NEWEST_FIRST, limit=2)
+    oldest = await budget_repo.get_by_user_id("u_1", Ordering.OLDEST_FIRST)
+
+    assert [budget.id for budget in newest] == ["b_c", "b_a"]
+    assert [budget.id for budget in oldest] == ["b_b", "b_d", "b_a", "b_c"]
+
+
+@pytest.mark.asyncio
+async def test_get_page_by_user_id(budget_repo: BudgetRepo) -> None:
+    for budget_id in ["b_3", "b_1", "b_5", "b_2", "b_4"]:
+        await budget_repo.create(Budget(id=budget_id, name=budget_id, balance=Decimal(0), user_id="u_1"))
+    await budget_repo.create(Budget(id="b_0", name="Other", balance=Decimal(0), user_id="u_2"))
+
+    first = await budget_repo.get_page_by_user_id("u_1", limit=2)
+    second = await budget_repo.get_page_by_user_id("u_1", limit=2, cursor=first.next_cursor)
+    last = await budget_repo.get_page_by_user_id("u_1", limit=2, cursor=second.next_cursor)
+
+    assert [budget.id for budget in first.items] == ["b_1", "b_2"]
+    assert [budget.id for budget in second.items] == ["b_3", "b_4"]
+    assert [budget.id for budget in last.items] == ["b_5"]
+    assert last.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_iter_by_user_id(budget_repo: BudgetRepo) -> None:
+    for budget_id in ["b_3", "b_1", "b_2"]:
+        await budget_repo.create(Budget(id=budget_id, name=budget_id, balance=Decimal(0), user_id="u_1"))
+
+    budget_ids = [budget.id async for budget in budget_repo.iter_by_user_id("u_1", batch_size=2)]
+
+    assert budget_ids == ["b_1", "b_2", "b_3"]
+
+
+@pytest.mark.asyncio
+async def test_update(budget_repo: BudgetRepo) -> None:
     budget = Budget(id="b_1", name="Old Name", balance=Decimal(0), user_id="u_1")
     await budget_repo.create(budget)
 
@@ -63,7 +118,7 @@ async def test_update(budget_repo: BudgetFileRepo) -> None:
 
 
 @pytest.mark.asyncio
-async def test_delete(budget_repo: BudgetFileRepo) -> None:
+async def test_delete(budget_repo: BudgetRepo) -> None:
     budget = Budget(id="b_1", name="To Delete", balance=Decimal(0), user_id="u_1")
     await budget_repo.create(budget)
 
@@ -71,3 +126,99 @@ async def test_delete(budget_repo: BudgetFileRepo) -> None:
     deleted_budget = await budget_repo.get_by_id("b_1")
 
     assert deleted_budget is None
+
+
+@pytest.mark.asyncio
+async def test_batch_create_update_delete(budget_repo: BudgetRepo) -> None:
+    budgets = [
+        Budget(id=f"b_{number}", name=f"Budget {number}", balance=Decimal(number), user_id="u_1") for number in range(3)
+    ]
+    await budget_repo.create_many(budgets)
+
+    budgets[0].name = "Renamed"
+    budgets[1].user_id = "u_2"
+    await budget_repo.update_many(budgets[:2])
+
+    assert await budget_repo.get_by_id("b_0") == budgets[0]
+    assert [budget.id for budget in await budget_repo.get_by_user_id("u_1", Ordering.OLDEST_FIRST)] == ["b_0", "b_2"]
+    assert [budget.id for budget in await budget_repo.get_by_user_id("u_2")] == ["b_1"]
+
+    await budget_repo.delete_many(["b_0", "b_1"])
+
+    assert [budget.id for budget in await budget_repo.get_by_user_id("u_1")] == ["b_2"]
+    assert await budget_repo.get_by_user_id("u_2") == []
+
+
+@pytest.mark.asyncio
+async def test_batch_update_and_delete_change_nothing_if_one_is_missing(budget_repo: BudgetRepo) -> None:
+    budget = Budget(id="b_1", name="Main", balance=Decimal(10), user_id="u_1")
+    await budget_repo.create(budget)
+    renamed = Budget(id="b_1", name="Renamed", balance=Decimal(10), user_id="u_1")
+
+    with pytest.raises(BudgetNotFoundError):
+        await budget_repo.update_many([renamed, Budget(id="b_missing", name="X", balance=Decimal(0), user_id="u_1")])
+    with pytest.raises(BudgetNotFoundError):
+        await budget_repo.delete_many(["b_1", "b_missing"])
+
+    assert await budget_repo.get_by_id("b_1") == budget
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_compare_and_swap_versions(budget_repo: BudgetRepo) -> None:
+    budget = Budget(id="b_1", name="Main", balance=Decimal(10), user_id="u_1")
+    await budget_repo.create(budget)
+    stale = await budget_repo.get_by_id("b_1")
+    assert stale is not None
+
+    budget.name = "Renamed"
+    await budget_repo.update(budget)
+    assert budget.version == 2
+    stale.name = "Lost update"
+    with pytest.raises(ConcurrentUpdateError):
+        await budget_repo.update(stale)
+    with pytest.raises(ConcurrentUpdateError):
+        await budget_repo.delete("b_1", expected_version=stale.version)
+    other = Budget(id="b_2", name="Other", balance=Decimal(0), user_id="u_1")
+    await budget_repo.create(other)
+    with pytest.raises(ConcurrentUpdateError):
+        await budget_repo.update_many([other, stale])
+
+    assert await budget_repo.get_by_id("b_1") == budget
+    assert await budget_repo.get_by_id("b_2") == other
+    assert other.version == 1
+    assert await budget_repo.delete("b_1", expected_version=budget.version) is True
+    assert await budget_repo.delete("b_1") is False
+    with pytest.raises(BudgetNotFoundError):
+        await budget_repo.update(budget)
+
+
+@pytest.mark.asyncio
+async def test_reads_reuse_an_unchanged_file_but_writes_read_it_again(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo, other_repo = BudgetFileRepo(base_dir=tmp_path), BudgetFileRepo(base_dir=tmp_path)
+    await repo.create(Budget(id="b_1", name="Main", balance=Decimal(10), user_id="u_1"))
+    budget = await repo.get_by_id("b_1")
+    with monkeypatch.context() as patch:
+        patch.setattr(budget_module, "load_stamped_from_file", None)
+        assert await repo.get_by_id("b_1") == budget
+
+    # Every file looks unchanged, as a replacement that got the old inode, size and mtime would
+    async def load_with_old_stamp(path: Path) -> tuple[dict, FileStamp] | None:
+        stamped = await load_stamped_from_file(path)
+        return None if stamped is None else (stamped[0], (1, 1, 1))
+
+    monkeypatch.setattr(budget_module, "load_stamped_from_file", load_with_old_stamp)
+    monkeypatch.setattr(stamps_module, "_read_stamp", lambda _: (1, 1, 1))
+    stale = await repo.get_by_id("b_1")
+    other = await other_repo.get_by_id("b_1")
+    assert stale is not None
+    assert other is not None
+    other.name = "Renamed elsewhere"
+    await other_repo.update(other)
+
+    stale.name = "Stale"
+    with pytest.raises(ConcurrentUpdateError):
+        await repo.update(stale)
+    with pytest.raises(ConcurrentUpdateError):
+        await repo.delete("b_1", expected_version=stale.version)
@@ -1,12 +1,15 @@
+from dataclasses import replace
+
 import pytest
 
+from domain.errors import CategoryNotFoundError, ConcurrentUpdateError
 from domain.models.category import Category
 from domain.models.transaction import TransactionType
-from infra.repos.file.category import CategoryFileRepo
+from domain.repos.category import CategoryRepo
 
 
 @pytest.mark.asyncio
-async def test_create_and_get_by_id(category_repo: CategoryFileRepo) -> None:
+async def test_create_and_get_by_id(category_repo: CategoryRepo) -> None:
     category = Category(
         id="c_1",
         name="Groceries",
@@ -21,7 +24,7 @@ async def test_create_and_get_by_id(category_repo: CategoryFileRepo) -> None:
 
 
 @pytest.mark.asyncio
-async def test_get_by_user_id_without_type(category_repo: CategoryFileRepo) -> None:
+async def test_get_by_user_id_without_type(category_repo: CategoryRepo) -> None:
     cat1 = Category(id="c_1", name="Food", user_id="u_1", transaction_type=TransactionType.EXPENSE)
     cat2 = Category(id="c_2", name="Salary", user_id="u_1", transaction_type=TransactionType.INCOME)
     cat3 = Category(id="c_3", name="Other", user_id="u_2", transaction_type=TransactionType.EXPENSE)
@@ -38,7 +41,7 @@ async def test_get_by_user_id_without_type(category_repo: CategoryFileRepo) -> N
 
 
 @pytest.mark.asyncio
-async def test_get_by_user_id_with_type(category_repo: CategoryFileRepo) -> None:
+async def test_get_by_user_id_with_type(category_repo: CategoryRepo) -> None:
     cat1 = Category(id="c_1", name="Food", user_id="u_1", transaction_type=TransactionType.EXPENSE)
     cat2 = Category(id="c_2", name="Transport", user_id="u_1", transaction_type=TransactionType.EXPENSE)
     cat3 = Category(id="c_3", name="Salary", user_id="u_1", transaction_type=TransactionType.INCOME)
@@ -56,7 +59,27 @@ async def test_get_by_user_id_with_type(category_repo: CategoryFileRepo) -> None
 
 
 @pytest.mark.asyncio
-async def test_update(category_repo: CategoryFileRepo) -> None:
+async def test_get_page_by_user_id_with_type(category_repo: CategoryRepo) -> None:
+    types = [TransactionType.EXPENSE, TransactionType.INCOME, TransactionType.EXPENSE, TransactionType.INCOME]
+    for number, transaction_type in enumerate(types, start=1):
+        await category_repo.create(
+            Category(id=f"c_{number}", name=f"C{number}", user_id="u_1", transaction_type=transaction_type)
+        )
+
+    first = await category_repo.get_page_by_user_id("u_1", limit=1, transaction_type=TransactionType.INCOME)
+    second = await category_repo.get_page_by_user_id(
+        "u_1", limit=1, cursor=first.next_cursor, transaction_type=TransactionType.INCOME
+    )
+    everything = await category_repo.get_page_by_user_id("u_1", limit=10)
+
+    assert [category.id for category in first.items] == ["c_2"]
+    assert [category.id for category in second.items] == ["c_4"]
+    assert [category.id for category in everything.items] == ["c_1", "c_2", "c_3", "c_4"]
+    assert everything.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_update(category_repo: CategoryRepo) -> None:
     category = Category(id="c_1", name="Old", user_id="u_1")
     await category_repo.create(category)
 
@@ -71,10 +94,49 @@ async def test_update(category_repo: CategoryFileRepo) -> None:
 
 
 @pytest.mark.asyncio
-async def test_delete(category_repo: CategoryFileRepo) -> None:
+async def test_delete(category_repo: CategoryRepo) -> None:
     category = Category(id="c_1", name="Del", user_id="u_1")
     await category_repo.create(category)
 
     await category_repo.delete("c_1")
 
     assert await category_repo.get_by_id("c_1") is None
+
+
+@pytest.mark.asyncio
+async def test_batch_create_update_delete(category_repo: CategoryRepo) -> None:
+    categories = [Category(id=f"c_{number}", name=f"Category {number}", user_id="u_1") for number in range(3)]
+    await category_repo.create_many(categories)
+
+    categories[0].transaction_type = TransactionType.INCOME
+    categories[1].user_id = "u_2"
+    await category_repo.update_many(categories[:2])
+
+    assert await category_repo.get_by_user_id("u_1", TransactionType.INCOME) == [categories[0]]
+    assert await category_repo.get_by_user_id("u_2") == [categories[1]]
+    with pytest.raises(ConcurrentUpdateError):
+        await category_repo.update_many([categories[2], replace(categories[0], name="Stale", version=1)])
+    assert await category_repo.get_by_id("c_0") == categories[0]
+
+    with pytest.raises(CategoryNotFoundError):
+        await category_repo.delete_many(["c_0", "c_missing"])
+    await category_repo.delete_many(["c_0", "c_1"])
+
+    assert [category.id for category in await category_repo.get_by_user_id("u_1")] == ["c_2"]
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_compare_and_swap_versions(category_repo: CategoryRepo) -> None:
+    category = Category(id="c_1", name="Food", user_id="u_1")
+    await category_repo.create(category)
+    stale = Category(id="c_1", name="Lost update", user_id="u_1")
+
+    category.name = "Groceries"
+    await category_repo.update(category)
+
+    with pytest.raises(ConcurrentUpdateError):
+        await category_repo.update(stale)
+    with pytest.raises(ConcurrentUpdateError):
+        await category_repo.delete("c_1", expected_version=stale.version)
+    assert await category_repo.delete("c_1", expected_version=category.version) is True
+    assert await category_repo.delete("c_1") is False
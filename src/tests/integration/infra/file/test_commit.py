@@ -0,0 +1,70 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from infra.repos.file import commit
+from infra.repos.file.commit import Durability, FileCommitter
+from infra.repos.file.serializers import load_from_file, save_to_file
+
+
+def _list_names(path: Path) -> list[str]:
+    return sorted(child.name for child in path.iterdir())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("durability", list(Durability))
+async def test_save_replaces_file_without_leftovers(tmp_path: Path, durability: Durability) -> None:
+    committer = FileCommitter(durability)
+    path = tmp_path / "record.json"
+
+    await save_to_file(path, {"version": 1}, committer)
+    await save_to_file(path, {"version": 2}, committer)
+
+    assert await load_from_file(path) == {"version": 2}
+    assert _list_names(tmp_path) == ["record.json"]
+
+
+@pytest.mark.asyncio
+async def test_failed_write_keeps_previous_content(tmp_path: Path) -> None:
+    path = tmp_path / "record.json"
+    await save_to_file(path, {"version": 1})
+
+    with pytest.raises(TypeError):
+        await save_to_file(path, {"version": object()})
+
+    assert await load_from_file(path) == {"version": 1}
+
+
+@pytest.mark.asyncio
+async def test_group_commit_batches_directory_fsyncs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    synced_dirs: list[Path] = []
+    fsync_dir = commit.fsync_dir
+
+    def record_fsync_dir(path: Path) -> None:
+        synced_dirs.append(path)
+        fsync_dir(path)
+
+    monkeypatch.setattr(commit, "fsync_dir", record_fsync_dir)
+    committer = FileCommitter(Durability.GROUP_COMMIT)
+
+    await asyncio.gather(
+        *(save_to_file(tmp_path / f"r_{number}.json", {"n": number}, committer) for number in range(20))
+    )
+
+    assert len(synced_dirs) < 20
+    for number in range(20):
+        assert json.loads((tmp_path / f"r_{number}.json").read_text()) == {"n": number}
+
+
+@pytest.mark.asyncio
+async def test_group_commit_propagates_errors(tmp_path: Path) -> None:
+    committer = FileCommitter(Durability.GROUP_COMMIT)
+    missing_dir = tmp_path / "missing"
+    tmp_file = tmp_path / "tmp"
+    os.close(os.open(tmp_file, os.O_CREAT | os.O_WRONLY))
+
+    with pytest.raises(FileNotFoundError):
+        await committer.commit(tmp_file, missing_dir / "record.json")
@@ -0,0 +1,188 @@
+import asyncio
+import shutil
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from domain.models.budget import Budget
+from domain.repos.budget import BudgetRepo
+from domain.repos.ordering import Ordering
+from domain.repos.page import slice_page
+from infra.repos.file import index as index_module
+from infra.repos.file.budget import BudgetFileRepo
+from infra.repos.file.index import INDEX_DIR_NAME, FileIndex
+from infra.repos.file.paths import UnsafePathError
+from infra.repos.file.serializers import save_to_file
+
+
+@pytest.mark.asyncio
+async def test_add_get_remove(tmp_path: Path) -> None:
+    index = FileIndex(tmp_path, field="user_id")
+
+    await index.add("u_1", "r_2")
+    await index.add("u_1", "r_1")
+    await index.add("u_1", "r_1")
+    await index.add("u_2", "r_3")
+
+    assert await index.get("u_1") == ["r_1", "r_2"]
+    assert await index.get("u_2") == ["r_3"]
+    assert await index.get("u_missing") == []
+
+    await index.remove("u_1", "r_1")
+    await index.remove("u_2", "r_3")
+
+    assert await index.get("u_1") == ["r_2"]
+    assert await index.get("u_2") == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("key", ["..", "../u_1", "/etc/u_1", ""])
+async def test_keys_cannot_leave_the_index_directory(tmp_path: Path, key: str) -> None:
+    index = FileIndex(tmp_path / "records", field="user_id")
+
+    with pytest.raises(UnsafePathError):
+        await index.add(key, "r_1")
+    with pytest.raises(UnsafePathError):
+        await index.get(key)
+
+
+@pytest.mark.asyncio
+async def test_ordered_index_sorts_by_order_field(tmp_path: Path) -> None:
+    index = FileIndex(tmp_path, field="user_id", order_field="created_at")
+
+    await index.add("u_1", "r_1", "2025-01-03")
+    await index.add("u_1", "r_2", "2025-01-01")
+    await index.add("u_1", "r_3", "2025-01-02")
+    await index.add("u_1", "r_1", "2025-01-00")
+    await index.remove("u_1", "r_1", "2025-01-03")
+    await index.remove("u_1", "r_3", "2025-01-02")
+
+    assert await index.get("u_1") == ["r_1", "r_2"]
+
+    shutil.rmtree(tmp_path / INDEX_DIR_NAME)
+    await save_to_file(tmp_path / "r_4.json", {"user_id": "u_1", "created_at": "2025-01-05"})
+    await save_to_file(tmp_path / "r_5.json", {"user_id": "u_1", "created_at": "2025-01-04"})
+    rebuilt = FileIndex(tmp_path, field="user_id", order_field="created_at")
+
+    assert await rebuilt.get("u_1") == ["r_5", "r_4"]
+
+
+@pytest.mark.asyncio
+async def test_get_range_bisects_order_values(tmp_path: Path) -> None:
+    index = FileIndex(tmp_path, field="user_id", order_field="date")
+    for day in (4, 1, 3, 2):
+        await index.add("u_1", f"r_{day}", f"2025-01-0{day}")
+
+    assert await index.get_range("u_1", "2025-01-02", "2025-01-04") == ["r_2", "r_3"]
+    assert await index.get_range("u_1", "2025-01-05", "2025-01-09") == []
+    assert await index.get_range("u_missing", "2025-01-01", "2025-01-09") == []
+
+
+@pytest.mark.asyncio
+async def test_chunked_key_pages_and_ranges_match_full_reads(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(index_module, "CHUNK_SIZE", 3)
+    index = FileIndex(tmp_path, field="user_id")
+    dated_index = FileIndex(tmp_path, field="user_id", order_field="date")
+    await index.add_many([("u_1", f"r_{number:02}", None) for number in range(0, 20, 2)])
+    for number in range(1, 20, 2):
+        await index.add("u_1", f"r_{number:02}")
+        await dated_index.add("u_1", f"r_{number:02}", f"2025-01-{number:02}")
+    await index.remove_many([("u_1", "r_04", None), ("u_1", "r_05", None), ("u_1", "r_06", None)])
+
+    ids = await index.get("u_1")
+    assert ids == sorted(f"r_{number:02}" for number in range(20) if number not in {4, 5, 6})
+    assert len(list((tmp_path / INDEX_DIR_NAME / "user_id" / "u_1").iterdir())) > len(ids) // 3
+    for cursor in [None, *ids]:
+        assert await index.get_page("u_1", 4, cursor) == slice_page(ids, 4, cursor)
+    assert await dated_index.get_range("u_1", "2025-01-04", "2025-01-12") == ["r_05", "r_07", "r_09", "r_11"]
+    dated_ids = await dated_index.get("u_1")
+    for descending in [False, True]:
+        expected = dated_ids[::-1] if descending else dated_ids
+        paged, cursor = [], None
+        while True:
+            page_ids, cursor = await dated_index.get_page("u_1", 4, cursor, descending=descending)
+            paged.extend(page_ids)
+            if cursor is None:
+                break
+        assert paged == expected
+
+    await index.remove_many([("u_1", record_id, None) for record_id in ids])
+
+    assert await index.get("u_1") == []
+    assert not (tmp_path / INDEX_DIR_NAME / "user_id" / "u_1").exists()
+
+
+@pytest.mark.asyncio
+async def test_writers_sharing_a_directory_do_not_lose_entries(tmp_path: Path) -> None:
+    first = FileIndex(tmp_path, field="user_id", inter_process_locks=True)
+    second = FileIndex(tmp_path, field="user_id", inter_process_locks=True)
+
+    await asyncio.gather(*(index.add("u_1", f"r_{number:02}") for number in range(20) for index in (first, second)))
+    await asyncio.gather(*((first, second)[number % 2].add("u_1", f"r_{number:02}") for number in range(20, 40)))
+
+    assert await second.get("u_1") == [f"r_{number:02}" for number in range(40)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_rebuilds_replace_the_index_whole(tmp_path: Path) -> None:
+    for number in range(3):
+        await save_to_file(tmp_path / f"r_{number}.json", {"id": f"r_{number}", "user_id": "u_1"})
+    first = FileIndex(tmp_path, field="user_id", inter_process_locks=True)
+    second = FileIndex(tmp_path, field="user_id", inter_process_locks=True)
+    await first.add("u_2", "r_dangling")
+
+    await asyncio.gather(first.rebuild(), second.rebuild(), first.rebuild())
+
+    assert await second.get("u_1") == ["r_0", "r_1", "r_2"]
+    assert await second.get("u_2") == []
+    assert [path.name for path in (tmp_path / INDEX_DIR_NAME).iterdir()] == ["user_id"]
+
+
+@pytest.mark.asyncio
+async def test_missing_index_is_rebuilt_from_records(tmp_path: Path) -> None:
+    await save_to_file(tmp_path / "r_1.json", {"id": "r_1", "user_id": "u_1"})
+    await save_to_file(tmp_path / "r_2.json", {"id": "r_2", "user_id": "u_2"})
+    await save_to_file(tmp_path / "r_3.json", {"id": "r_3", "user_id": "u_1"})
+
+    index = FileIndex(tmp_path, field="user_id")
+
+    assert sorted(await index.get("u_1")) == ["r_1", "r_3"]
+    assert await index.get("u_2") == ["r_2"]
+
+
+@pytest.mark.asyncio
+async def test_repo_lookup_survives_index_loss(tmp_path: Path) -> None:
+    base_dir = tmp_path / "budgets"
+    budget = Budget(id="b_1", name="B1", balance=Decimal(0), user_id="u_1")
+    await BudgetFileRepo(base_dir=base_dir).create(budget)
+
+    shutil.rmtree(base_dir / INDEX_DIR_NAME)
+
+    assert await BudgetFileRepo(base_dir=base_dir).get_by_user_id("u_1") == [budget]
+
+
+@pytest.mark.asyncio
+async def test_repo_lookup_skips_dangling_ids(tmp_path: Path) -> None:
+    budget_repo = BudgetFileRepo(base_dir=tmp_path)
+    budget = Budget(id="b_1", name="B1", balance=Decimal(0), user_id="u_1")
+    await budget_repo.create(budget)
+    await budget_repo.create(Budget(id="b_2", name="B2", balance=Decimal(0), user_id="u_1"))
+
+    (tmp_path / "b_2.json").unlink()
+
+    assert await budget_repo.get_by_user_id("u_1") == [budget]
+
+
+@pytest.mark.asyncio
+async def test_update_moves_record_between_users(budget_repo: BudgetRepo) -> None:
+    budget = Budget(id="b_1", name="B1", balance=Decimal(0), user_id="u_1")
+    await budget_repo.create(budget)
+
+    budget.user_id = "u_2"
+    await budget_repo.update(budget)
+
+    assert await budget_repo.get_by_user_id("u_1") == []
+    assert await budget_repo.get_by_user_id("u_2") == [budget]
+    assert await budget_repo.get_by_user_id("u_1", Ordering.NEWEST_FIRST) == []
+    assert await budget_repo.get_by_user_id("u_2", Ordering.NEWEST_FIRST) == [budget]
@@ -0,0 +1,89 @@
+import asyncio
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from domain.models.budget import Budget
+from infra.repos.file.budget import BudgetFileRepo
+from infra.repos.file.locks import LockManager
+
+
+async def _hold_until(locks: LockManager, entity_id: str, release: asyncio.Event, held: asyncio.Event) -> None:
+    async with locks.hold(entity_id):
+        held.set()
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_same_id_waits_while_other_ids_proceed() -> None:
+    locks = LockManager()
+    release, held = asyncio.Event(), asyncio.Event()
+    holder = asyncio.create_task(_hold_until(locks, "b_1", release, held))
+    await held.wait()
+
+    async with asyncio.timeout(1), locks.hold("b_2"):
+        pass
+    waiter_held = asyncio.Event()
+    waiter = asyncio.create_task(_hold_until(locks, "b_1", asyncio.Event(), waiter_held))
+    await asyncio.sleep(0.01)
+    assert not waiter_held.is_set()
+
+    release.set()
+    await holder
+    await waiter_held.wait()
+    waiter.cancel()
+    assert locks.stats.acquisitions == 3
+    assert locks.stats.contended == 1
+    assert locks.stats.wait_seconds > 0
+
+
+@pytest.mark.asyncio
+async def test_overlapping_batches_do_not_deadlock() -> None:
+    locks = LockManager(stripes=4)
+    ids = [f"b_{number}" for number in range(10)]
+
+    async def hold(entity_ids: list[str]) -> None:
+        async with locks.hold(*entity_ids):
+            await asyncio.sleep(0.001)
+
+    async with asyncio.timeout(1):
+        await asyncio.gather(hold(ids), hold(ids[::-1]), hold(ids[3:6]))
+
+    assert locks.stats.acquisitions == 3
+
+
+@pytest.mark.asyncio
+async def test_file_lock_excludes_other_managers(tmp_path: Path) -> None:
+    # Two managers stand in for two processes: flocks on separate open files exclude each other
+    first, second = LockManager(lock_dir=tmp_path), LockManager(lock_dir=tmp_path)
+    release, held = asyncio.Event(), asyncio.Event()
+    holder = asyncio.create_task(_hold_until(first, "b_1", release, held))
+    await held.wait()
+
+    waiter_held = asyncio.Event()
+    waiter = asyncio.create_task(_hold_until(second, "b_1", asyncio.Event(), waiter_held))
+    await asyncio.sleep(0.01)
+    assert not waiter_held.is_set()
+
+    release.set()
+    await holder
+    async with asyncio.timeout(1):
+        await waiter_held.wait()
+    waiter.cancel()
+    assert second.stats.contended == 1
+
+
+@pytest.mark.asyncio
+async def test_repo_writes_take_entity_locks(tmp_path: Path) -> None:
+    repo = BudgetFileRepo(base_dir=tmp_path, inter_process_locks=True)
+    budgets = [Budget(id=f"b_{number}", name="Budget", balance=Decimal(number), user_id="u_1") for number in range(3)]
+    await repo.create_many(budgets)
+
+    for budget in budgets:
+        budget.balance += 1
+    await asyncio.gather(*(repo.update(budget) for budget in budgets))
+    await repo.delete_many([budget.id for budget in budgets])
+
+    assert repo.lock_stats.acquisitions == 4
+    assert await repo.get_by_user_id("u_1") == []
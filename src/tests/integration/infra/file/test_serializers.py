@@ -0,0 +1,62 @@
+from dataclasses import asdict
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from domain.models.budget import Budget
+from domain.models.transaction import Transaction, TransactionType
+from infra.repos.file.budget import BudgetFileRepo
+from infra.repos.file.serializers import (
+    Codec,
+    budget_from_dict,
+    decode_record,
+    encode_record,
+    load_from_file,
+    save_to_file,
+    transaction_from_dict,
+)
+
+
+@pytest.mark.parametrize("codec", list(Codec))
+def test_codecs_round_trip_entities(codec: Codec) -> None:
+    budget = Budget(id="b_1", name="Бюджет", balance=Decimal("10.50"), user_id="u_1", description=None)
+    transaction = Transaction(
+        id="t_1", budget_id="b_1", category_id="c_1", amount=Decimal("0.01"), type=TransactionType.INCOME, user_id="u_1"
+    )
+
+    assert budget_from_dict(decode_record(encode_record(asdict(budget), codec))) == budget
+    assert transaction_from_dict(decode_record(encode_record(asdict(transaction), codec))) == transaction
+
+
+def test_compact_codecs_are_smaller() -> None:
+    data = asdict(Budget(id="b_1", name="Main", balance=Decimal(100), user_id="u_1"))
+
+    pretty_size = len(encode_record(data, Codec.PRETTY_JSON))
+
+    assert len(encode_record(data, Codec.COMPACT_JSON)) < pretty_size
+    assert len(encode_record(data, Codec.BINARY)) < pretty_size
+
+
+@pytest.mark.asyncio
+async def test_codec_is_detected_when_reading(tmp_path: Path) -> None:
+    for codec in Codec:
+        await save_to_file(tmp_path / f"{codec}.json", {"codec": codec.value}, codec=codec)
+
+    for codec in Codec:
+        assert await load_from_file(tmp_path / f"{codec}.json") == {"codec": codec.value}
+
+
+@pytest.mark.asyncio
+async def test_repo_reads_records_written_with_another_codec(tmp_path: Path) -> None:
+    old_budget = Budget(id="b_1", name="Old", balance=Decimal(1), user_id="u_1")
+    await BudgetFileRepo(base_dir=tmp_path, codec=Codec.PRETTY_JSON).create(old_budget)
+
+    repo = BudgetFileRepo(base_dir=tmp_path, codec=Codec.BINARY)
+    new_budget = Budget(id="b_2", name="New", balance=Decimal(2), user_id="u_1")
+    await repo.create(new_budget)
+
+    budgets = await repo.get_by_user_id("u_1")
+    assert len(budgets) == 2
+    assert old_budget in budgets
+    assert new_budget in budgets
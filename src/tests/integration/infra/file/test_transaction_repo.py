@@ -1,13 +1,20 @@
+from dataclasses import asdict, replace
+from datetime import UTC, datetime
 from decimal import Decimal
+from pathlib import Path
 
 import pytest
 
+from domain.errors import ConcurrentUpdateError, TransactionNotFoundError
 from domain.models.transaction import Transaction, TransactionType
+from domain.repos.transaction import TransactionRepo
+from infra.repos.cached.transaction import CachedTransactionRepo
+from infra.repos.file.serializers import save_to_file
 from infra.repos.file.transaction import TransactionFileRepo
 
 
 @pytest.mark.asyncio
-async def test_create_and_get_by_id(transaction_repo: TransactionFileRepo) -> None:
+async def test_create_and_get_by_id(transaction_repo: TransactionRepo) -> None:
     transaction = Transaction(
         id="t_1",
         budget_id="b_1",
@@ -25,7 +32,28 @@ async def test_create_and_get_by_id(transaction_repo: TransactionFileRepo) -> No
 
 
 @pytest.mark.asyncio
-async def test_get_by_user_id(transaction_repo: TransactionFileRepo) -> None:
+async def test_get_by_ids_skips_missing(transaction_repo: TransactionRepo) -> None:
+    transactions = [
+        Transaction(
+            id=f"t_{number}",
+            budget_id="b_1",
+            category_id="c_1",
+            amount=Decimal(number),
+            type=TransactionType.EXPENSE,
+            user_id="u_1",
+        )
+        for number in (1, 2)
+    ]
+    await transaction_repo.create_many(transactions)
+    cached_repo = CachedTransactionRepo(transaction_repo)
+
+    for repo in (transaction_repo, cached_repo, cached_repo):
+        found = await repo.get_by_ids(["t_2", "missing", "t_1"])
+        assert sorted(found, key=lambda transaction: transaction.id) == transactions
+
+
+@pytest.mark.asyncio
+async def test_get_by_user_id(transaction_repo: TransactionRepo) -> None:
     tx1 = Transaction(
         id="t_1", budget_id="b_1", category_id="c_1", amount=Decimal(10), type=TransactionType.EXPENSE, user_id="u_1"
     )
@@ -43,7 +71,7 @@ async def test_get_by_user_id(transaction_repo: TransactionFileRepo) -> None:
 
 
 @pytest.mark.asyncio
-async def test_get_by_budget_id(transaction_repo: TransactionFileRepo) -> None:
+async def test_get_by_budget_id(transaction_repo: TransactionRepo) -> None:
     tx1 = Transaction(
         id="t_1", budget_id="b_1", category_id="c_1", amount=Decimal(10), type=TransactionType.EXPENSE, user_id="u_1"
     )
@@ -66,7 +94,29 @@ async def test_get_by_budget_id(transaction_repo: TransactionFileRepo) -> None:
 
 
 @pytest.mark.asyncio
-async def test_update(transaction_repo: TransactionFileRepo) -> None:
+async def test_iter_by_budget_id(transaction_repo: TransactionRepo) -> None:
+    for number in range(5):
+        await transaction_repo.create(
+            Transaction(
+                id=f"t_{number}",
+                budget_id="b_1" if number % 2 == 0 else "b_2",
+                category_id="c_1",
+                amount=Decimal(number),
+                type=TransactionType.EXPENSE,
+                user_id="u_1",
+            )
+        )
+
+    transaction_ids = [transaction.id async for transaction in transaction_repo.iter_by_budget_id("b_1", batch_size=2)]
+    page = await transaction_repo.get_page_by_user_id("u_1", limit=3)
+
+    assert transaction_ids == ["t_0", "t_2", "t_4"]
+    assert [transaction.id for transaction in page.items] == ["t_0", "t_1", "t_2"]
+    assert page.next_cursor == "t_2"
+
+
+@pytest.mark.asyncio
+async def test_update(transaction_repo: TransactionRepo) -> None:
     transaction = Transaction(
         id="t_1", budget_id="b_1", category_id="c_1", amount=Decimal(10), type=TransactionType.EXPENSE, user_id="u_1"
     )
@@ -83,7 +133,7 @@ async def test_update(transaction_repo: TransactionFileRepo) -> None:
 
 
 @pytest.mark.asyncio
-async def test_delete(transaction_repo: TransactionFileRepo) -> None:
+async def test_delete(transaction_repo: TransactionRepo) -> None:
     transaction = Transaction(
         id="t_1", budget_id="b_1", category_id="c_1", amount=Decimal(10), type=TransactionType.EXPENSE, user_id="u_1"
     )
@@ -92,3 +142,151 @@ async def test_delete(transaction_repo: TransactionFileRepo) -> None:
     await transaction_repo.delete("t_1")
 
     assert await transaction_repo.get_by_id("t_1") is None
+
+
+@pytest.mark.asyncio
+async def test_update_moves_transaction_between_budgets(transaction_repo: TransactionRepo) -> None:
+    transaction = Transaction(
+        id="t_1", budget_id="b_1", category_id="c_1", amount=Decimal(10), type=TransactionType.EXPENSE, user_id="u_1"
+    )
+    await transaction_repo.create(transaction)
+
+    transaction.budget_id = "b_2"
+    await transaction_repo.update(transaction)
+
+    assert await transaction_repo.get_by_budget_id("b_1") == []
+    assert await transaction_repo.get_by_budget_id("b_2") == [transaction]
+
+
+@pytest.mark.asyncio
+async def test_get_by_budget_id_migrates_flat_directory(tmp_path: Path) -> None:
+    transaction = Transaction(
+        id="t_1", budget_id="b_1", category_id="c_1", amount=Decimal(10), type=TransactionType.EXPENSE, user_id="u_1"
+    )
+    await save_to_file(tmp_path / "t_1.json", asdict(transaction))
+
+    repo = TransactionFileRepo(base_dir=tmp_path)
+
+    assert await repo.get_by_budget_id("b_1") == [transaction]
+    assert await repo.get_by_budget_id("b_2") == []
+
+
+@pytest.mark.asyncio
+async def test_get_by_date_range(transaction_repo: TransactionRepo) -> None:
+    for day, budget_id, user_id in [
+        (3, "b_1", "u_1"),
+        (1, "b_2", "u_1"),
+        (2, "b_1", "u_1"),
+        (5, "b_1", "u_1"),
+        (2, "b_1", "u_2"),
+    ]:
+        await transaction_repo.create(
+            Transaction(
+                id=f"t_{day}_{user_id}",
+                budget_id=budget_id,
+                category_id="c_1",
+                amount=Decimal(day),
+                type=TransactionType.EXPENSE,
+                user_id=user_id,
+                date=datetime(2025, 1, day, tzinfo=UTC),
+            )
+        )
+    start, end = datetime(2025, 1, 1, tzinfo=UTC), datetime(2025, 1, 5, tzinfo=UTC)
+
+    in_range = await transaction_repo.get_by_date_range("u_1", start, end)
+    in_budget = await transaction_repo.get_by_date_range("u_1", start, end, budget_id="b_1")
+
+    assert [transaction.id for transaction in in_range] == ["t_1_u_1", "t_2_u_1", "t_3_u_1"]
+    assert [transaction.id for transaction in in_budget] == ["t_2_u_1", "t_3_u_1"]
+
+    moved = await transaction_repo.get_by_id("t_5_u_1")
+    assert moved is not None
+    moved.date = datetime(2025, 1, 4, tzinfo=UTC)
+    await transaction_repo.update(moved)
+    await transaction_repo.delete("t_3_u_1")
+
+    in_range = await transaction_repo.get_by_date_range("u_1", start, end)
+    assert [transaction.id for transaction in in_range] == ["t_1_u_1", "t_2_u_1", "t_5_u_1"]
+    assert await transaction_repo.get_by_date_range("u_1", end, datetime(2025, 1, 6, tzinfo=UTC)) == []
+
+
+@pytest.mark.asyncio
+async def test_create_many(transaction_repo: TransactionRepo) -> None:
+    transactions = [
+        Transaction(
+            id=f"t_{number}",
+            budget_id=f"b_{number % 2}",
+            category_id="c_1",
+            amount=Decimal(number + 1),
+            type=TransactionType.EXPENSE,
+            user_id="u_1",
+            date=datetime(2025, 1, 10 - number, tzinfo=UTC),
+        )
+        for number in range(5)
+    ]
+
+    await transaction_repo.create_many(transactions)
+
+    assert await transaction_repo.get_by_id("t_3") == transactions[3]
+    budget_transactions = await transaction_repo.get_by_budget_id("b_1")
+    assert sorted(transaction.id for transaction in budget_transactions) == ["t_1", "t_3"]
+    in_range = await transaction_repo.get_by_date_range(
+        "u_1", datetime(2025, 1, 7, tzinfo=UTC), datetime(2025, 1, 10, tzinfo=UTC)
+    )
+    assert [transaction.id for transaction in in_range] == ["t_3", "t_2", "t_1"]
+
+
+@pytest.mark.asyncio
+async def test_batch_update_and_delete(transaction_repo: TransactionRepo) -> None:
+    transactions = [
+        Transaction(
+            id=f"t_{number}",
+            budget_id="b_1",
+            category_id="c_1",
+            amount=Decimal(number + 1),
+            type=TransactionType.EXPENSE,
+            user_id="u_1",
+            date=datetime(2025, 1, number + 1, tzinfo=UTC),
+        )
+        for number in range(3)
+    ]
+    await transaction_repo.create_many(transactions)
+
+    transactions[0].budget_id = "b_2"
+    transactions[1].date = datetime(2025, 2, 1, tzinfo=UTC)
+    await transaction_repo.update_many(transactions[:2])
+
+    assert await transaction_repo.get_by_budget_id("b_2") == [transactions[0]]
+    january = await transaction_repo.get_by_date_range(
+        "u_1", datetime(2025, 1, 1, tzinfo=UTC), datetime(2025, 2, 1, tzinfo=UTC), budget_id="b_1"
+    )
+    assert january == [transactions[2]]
+
+    with pytest.raises(TransactionNotFoundError):
+        await transaction_repo.delete_many(["t_0", "t_missing"])
+    await transaction_repo.delete_many(["t_0", "t_2"])
+
+    assert await transaction_repo.get_by_user_id("u_1") == [transactions[1]]
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_compare_and_swap_versions(transaction_repo: TransactionRepo) -> None:
+    transaction = Transaction(
+        id="t_1", budget_id="b_1", category_id="c_1", amount=Decimal(10), type=TransactionType.EXPENSE, user_id="u_1"
+    )
+    await transaction_repo.create(transaction)
+
+    transaction.amount = Decimal(20)
+    await transaction_repo.update(transaction)
+    await transaction_repo.update_many([transaction])
+
+    assert transaction.version == 3
+    with pytest.raises(ConcurrentUpdateError):
+        await transaction_repo.update_many([replace(transaction, version=2)])
+    with pytest.raises(ConcurrentUpdateError):
+        await transaction_repo.delete("t_1", expected_version=2)
+    with pytest.raises(ConcurrentUpdateError):
+        await transaction_repo.delete_many(["t_1"], {"t_1": 2})
+    assert await transaction_repo.get_by_id("t_1") == transaction
+    assert await transaction_repo.delete("t_1", expected_version=3) is True
+    assert await transaction_repo.delete("t_1") is False
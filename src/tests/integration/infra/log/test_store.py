@@ -0,0 +1,150 @@
+from pathlib import Path
+
+import pytest
+
+from infra.repos.log.store import CorruptedLogError, LogStore, WriteOutcome
+
+
+def _line_count(path: Path) -> int:
+    return path.read_bytes().count(b"\n")
+
+
+def _read_bytes(path: Path) -> bytes:
+    return path.read_bytes()
+
+
+def _contains_bytes(path: Path, data: bytes) -> bool:
+    return data in path.read_bytes()
+
+
+def _replace_bytes(path: Path, old: bytes, new: bytes) -> None:
+    path.write_bytes(path.read_bytes().replace(old, new))
+
+
+def _append_bytes(path: Path, data: bytes) -> None:
+    with path.open("ab") as file:
+        file.write(data)
+
+
+@pytest.fixture
+def log_path(tmp_path: Path) -> Path:
+    return tmp_path / "records.log"
+
+
+@pytest.mark.asyncio
+async def test_records_survive_reopen(log_path: Path) -> None:
+    store = LogStore(log_path, indexed_fields=("user_id",))
+    await store.put("r_1", {"id": "r_1", "user_id": "u_1", "name": "first"})
+    await store.put("r_2", {"id": "r_2", "user_id": "u_1", "name": "second"})
+    await store.put("r_1", {"id": "r_1", "user_id": "u_2", "name": "moved"})
+    assert await store.delete("r_2") is WriteOutcome.WRITTEN
+    assert await store.delete("r_missing") is WriteOutcome.MISSING
+    await store.close()
+
+    reopened = LogStore(log_path, indexed_fields=("user_id",))
+
+    assert await reopened.get("r_1") == {"id": "r_1", "user_id": "u_2", "name": "moved"}
+    assert await reopened.get("r_2") is None
+    assert await reopened.get_many_by("user_id", "u_1") == []
+    assert await reopened.get_many_by("user_id", "u_2") == [{"id": "r_1", "user_id": "u_2", "name": "moved"}]
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_torn_tail_is_truncated_on_recovery(log_path: Path) -> None:
+    store = LogStore(log_path, indexed_fields=())
+    await store.put("r_1", {"id": "r_1"})
+    await store.close()
+    _append_bytes(log_path, b'0badc0de {"id": "r_2", "da')
+
+    recovered = LogStore(log_path, indexed_fields=())
+
+    assert await recovered.get("r_1") == {"id": "r_1"}
+    assert await recovered.get("r_2") is None
+    assert not _contains_bytes(log_path, b"r_2")
+    await recovered.put("r_3", {"id": "r_3"})
+    assert await recovered.get("r_3") == {"id": "r_3"}
+    await recovered.close()
+
+
+@pytest.mark.asyncio
+async def test_corrupted_record_is_truncated_on_recovery(log_path: Path) -> None:
+    store = LogStore(log_path, indexed_fields=())
+    await store.put("r_1", {"id": "r_1", "name": "intact"})
+    await store.put("r_2", {"id": "r_2", "name": "flipped"})
+    await store.close()
+    _replace_bytes(log_path, b"flipped", b"flopped")
+
+    recovered = LogStore(log_path, indexed_fields=())
+
+    assert await recovered.get("r_1") == {"id": "r_1", "name": "intact"}
+    assert await recovered.get("r_2") is None
+    await recovered.close()
+
+
+@pytest.mark.asyncio
+async def test_corrupted_record_followed_by_others_is_refused(log_path: Path) -> None:
+    store = LogStore(log_path, indexed_fields=())
+    for number in range(1, 6):
+        await store.put(f"r_{number}", {"id": f"r_{number}", "name": f"name {number}"})
+    await store.close()
+    _replace_bytes(log_path, b"name 2", b"name X")
+    corrupted = _read_bytes(log_path)
+
+    recovered = LogStore(log_path, indexed_fields=())
+
+    with pytest.raises(CorruptedLogError):
+        await recovered.get("r_1")
+    assert _read_bytes(log_path) == corrupted
+
+
+@pytest.mark.asyncio
+async def test_compaction_drops_superseded_records(log_path: Path) -> None:
+    store = LogStore(log_path, indexed_fields=("user_id",), compaction_min_bytes=0)
+    for version in range(10):
+        await store.put("r_1", {"id": "r_1", "user_id": "u_1", "version": version})
+    await store.put("r_2", {"id": "r_2", "user_id": "u_1", "version": 0})
+
+    assert _line_count(log_path) < 11
+    await store.compact()
+    assert _line_count(log_path) == 2
+    assert await store.get("r_1") == {"id": "r_1", "user_id": "u_1", "version": 9}
+    assert len(await store.get_many_by("user_id", "u_1")) == 2
+    await store.close()
+
+    reopened = LogStore(log_path, indexed_fields=())
+    assert await reopened.get("r_2") == {"id": "r_2", "user_id": "u_1", "version": 0}
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_replace_and_delete_check_expected_values(log_path: Path) -> None:
+    store = LogStore(log_path, indexed_fields=())
+    await store.put("r_1", {"id": "r_1", "version": 1})
+
+    assert await store.replace("r_1", {"id": "r_1", "version": 2}, {"version": 1}) is WriteOutcome.WRITTEN
+    assert await store.replace("r_1", {"id": "r_1", "version": 3}, {"version": 1}) is WriteOutcome.CONFLICT
+    assert await store.delete("r_1", {"version": 1}) is WriteOutcome.CONFLICT
+    assert await store.replace("r_2", {"id": "r_2", "version": 1}) is WriteOutcome.MISSING
+    assert await store.get("r_1") == {"id": "r_1", "version": 2}
+    assert await store.delete("r_1", {"version": None}) is WriteOutcome.WRITTEN
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_writes_are_all_or_nothing(log_path: Path) -> None:
+    store = LogStore(log_path, indexed_fields=())
+    await store.put_many([("r_1", {"id": "r_1", "version": 1}), ("r_2", {"id": "r_2", "version": 1})])
+    assert await store.delete("r_2") is WriteOutcome.WRITTEN
+
+    failed = await store.replace_many([("r_1", {"id": "r_1", "version": 2}, None), ("r_2", {"id": "r_2"}, None)])
+    assert failed == ("r_2", WriteOutcome.MISSING)
+    assert await store.delete_many([("r_1", None), ("r_2", None)]) == ("r_2", WriteOutcome.MISSING)
+    assert await store.get("r_1") == {"id": "r_1", "version": 1}
+    assert await store.get("r_2") is None
+
+    assert await store.replace_many([("r_1", {"id": "r_1", "version": 2}, {"version": 1})]) is None
+    assert await store.delete_many([("r_1", {"version": 1})]) == ("r_1", WriteOutcome.CONFLICT)
+    assert await store.delete_many([("r_1", {"version": 2}), ("r_1", None)]) is None
+    assert await store.get("r_1") is None
+    await store.close()
@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import pytest
+
+from app_ui import sessions as sessions_module
+from app_ui.controllers.budget import BudgetCrudController
+from app_ui.dependencies import claim_legacy_user
+from app_ui.sessions import UserSessions
+from domain.use_cases.budget import CreateBudget, DeleteBudget, ListBudgets, UpdateBudget
+from infra.repos.file.budget import BudgetFileRepo
+
+IDLE_SECONDS = 60
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(sessions_module.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def evicted() -> list[str]:
+    return []
+
+
+@pytest.fixture
+def sessions(tmp_path: Path, evicted: list[str]) -> UserSessions:
+    repo = BudgetFileRepo(base_dir=tmp_path)
+    use_cases = CreateBudget(repo), ListBudgets(repo), UpdateBudget(repo), DeleteBudget(repo)
+
+    def build_controller(user_id: str) -> BudgetCrudController:
+        return BudgetCrudController(*use_cases, user_id=user_id)
+
+    return UserSessions(build_controller, on_evict=evicted.append, idle_seconds=IDLE_SECONDS)
+
+
+@pytest.mark.usefixtures("clock")
+def test_open_shares_a_controller_between_the_tabs_of_a_user(sessions: UserSessions) -> None:
+    first_tab, second_tab, other_user = sessions.open("u_1"), sessions.open("u_1"), sessions.open("u_2")
+
+    assert first_tab is second_tab
+    assert first_tab.user_id == "u_1"
+    assert other_user is not first_tab
+    assert other_user.user_id == "u_2"
+    assert len(sessions) == 2
+
+
+def test_close_keeps_the_controller_until_the_user_is_idle_for_long_enough(
+    sessions: UserSessions, evicted: list[str], clock: _Clock
+) -> None:
+    controller = sessions.open("u_1")
+    sessions.open("u_1")
+    sessions.close("u_1")
+    clock.now += IDLE_SECONDS * 2
+    sessions.close("u_1")
+    clock.now += IDLE_SECONDS - 1
+
+    assert sessions.open("u_1") is controller
+    assert evicted == []
+
+
+def test_idle_users_are_evicted_when_another_page_opens_or_closes(
+    sessions: UserSessions, evicted: list[str], clock: _Clock
+) -> None:
+    idle = sessions.open("u_1")
+    sessions.open("u_2")
+    sessions.close("u_1")
+    clock.now += IDLE_SECONDS
+
+    sessions.close("u_2")
+
+    assert evicted == ["u_1"]
+    assert len(sessions) == 1
+    clock.now += IDLE_SECONDS
+    reopened = sessions.open("u_1")
+    assert evicted == ["u_1", "u_2"]
+    assert reopened is not idle
+    assert len(sessions) == 1
+
+
+def test_only_the_first_claim_of_the_legacy_user_succeeds(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+
+    assert claim_legacy_user(data_dir)
+    assert not claim_legacy_user(data_dir)
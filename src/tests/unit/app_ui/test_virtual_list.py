@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+
+import pytest
+
+from app_ui.components.virtual_list import LoadedItems, visible_range
+
+
+@dataclass(slots=True)
+class _Row:
+    id: str
+    created: int
+    text: str = ""
+
+
+def _newest_first(*rows: _Row, is_complete: bool = False) -> LoadedItems[_Row]:
+    items = LoadedItems(lambda row: row.id, lambda row: (row.created, row.id), descending=True)
+    items.extend(list(rows))
+    items.is_complete = is_complete
+    return items
+
+
+def _ids(items: LoadedItems[_Row]) -> list[str]:
+    return [key for key, _ in items.window(range(len(items)))]
+
+
+@pytest.mark.parametrize(
+    ("position", "viewport_height", "total", "expected"),
+    [
+        (0, 300, 100, range(9)),
+        (1000, 300, 100, range(5, 19)),
+        (1050, 300, 100, range(5, 19)),
+        (1000, 300, 12, range(5, 12)),
+        (0, 300, 0, range(0)),
+    ],
+)
+def test_visible_range_covers_the_viewport_and_overscan(
+    position: float, viewport_height: float, total: int, expected: range
+) -> None:
+    assert visible_range(position, viewport_height, item_height=100, overscan=5, total=total) == expected
+
+
+def test_extend_skips_items_a_pushed_change_already_brought() -> None:
+    items = _newest_first(_Row("b", 3), _Row("a", 2), is_complete=True)
+    items.upsert(_Row("c", 1, "pushed"))
+
+    items.extend([_Row("c", 1), _Row("d", 0)])
+
+    assert _ids(items) == ["b", "a", "c", "d"]
+    assert items.window(range(2, 3))[0][1].text == "pushed"
+
+
+def test_upsert_replaces_inserts_in_order_and_leaves_unloaded_pages_alone() -> None:
+    items = _newest_first(_Row("c", 5), _Row("a", 3), _Row("b", 1))
+
+    items.upsert(_Row("a", 3, "renamed"))
+    items.upsert(_Row("d", 4))
+    items.upsert(_Row("e", 0))
+
+    assert _ids(items) == ["c", "d", "a", "b"]
+    assert items.window(range(2, 3))[0][1].text == "renamed"
+
+    items.is_complete = True
+    items.upsert(_Row("e", 0))
+    items.upsert(_Row("c", 2))
+
+    assert _ids(items) == ["d", "a", "c", "b", "e"]
+
+
+def test_remove_drops_only_loaded_items() -> None:
+    items = _newest_first(_Row("c", 3), _Row("b", 2), _Row("a", 1))
+
+    assert items.remove("b")
+    assert not items.remove("b")
+    assert not items.remove("z")
+    assert _ids(items) == ["c", "a"]
+
+    items.upsert(_Row("b", 2))
+    assert _ids(items) == ["c", "b", "a"]